@@ -27,6 +27,10 @@
 # :param TARGET: the name of the generation target
 # :type TARGET: string
 #
+# Files which didn't change since the previous conversion are skipped.
+# The number of processes can be set with the ``ROSIDL_GENERATOR_JOBS``
+# variable.
+#
 # @public
 #
 function(rosidl_adapt_interfaces idl_var arguments_file)
@@ -45,7 +49,12 @@ function(rosidl_adapt_interfaces idl_var arguments_file)
     --package-name ${PROJECT_NAME}
     --arguments-file "${arguments_file}"
     --output-dir "${CMAKE_CURRENT_BINARY_DIR}/rosidl_adapter/${PROJECT_NAME}"
-    --output-file "${idl_output}")
+    --output-file "${idl_output}"
+    --manifest-file "${CMAKE_CURRENT_BINARY_DIR}/rosidl_adapter/${ARG_TARGET}.manifest.json"
+    --quiet)
+  if(ROSIDL_GENERATOR_JOBS)
+    list(APPEND cmd --jobs "${ROSIDL_GENERATOR_JOBS}")
+  endif()
   execute_process(
     COMMAND ${cmd}
     OUTPUT_QUIET
@@ -12,6 +12,30 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from contextlib import contextmanager
+
+# the messages of the conversion functions are captured instead of printed if not None
+_captured_log_messages = None
+
+
+def log(message):
+    if _captured_log_messages is not None:
+        _captured_log_messages.append(message)
+    else:
+        print(message)
+
+
+@contextmanager
+def capture_log():
+    """Capture the messages of the conversion functions within the context in a list."""
+    global _captured_log_messages
+    previous_log_messages = _captured_log_messages
+    _captured_log_messages = []
+    try:
+        yield _captured_log_messages
+    finally:
+        _captured_log_messages = previous_log_messages
+
 
 def convert_to_idl(package_dir, package_name, interface_file, output_dir):
     if interface_file.suffix == '.msg':
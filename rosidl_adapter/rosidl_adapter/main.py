@@ -13,13 +13,22 @@
 # limitations under the License.
 
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import hashlib
 import json
 import os
 import pathlib
 import sys
 
 
+from rosidl_adapter import capture_log
 from rosidl_adapter import convert_to_idl
+from rosidl_adapter import resource
+
+MANIFEST_FORMAT_VERSION = 1
+
+_adapter_version = None
 
 
 def main(argv=sys.argv[1:]):
@@ -38,27 +47,189 @@ def main(argv=sys.argv[1:]):
         '--output-file', required=True,
         help='The output file containing the tuples for the generated .idl '
              'files')
+    parser.add_argument(
+        '--jobs', type=int, default=1,
+        help='The number of processes to convert the files with')
+    parser.add_argument(
+        '--quiet', action='store_true',
+        help='Suppress the messages about the read and written files')
+    parser.add_argument(
+        '--manifest-file',
+        help='A file recording the digests of the converted files, '
+             'unchanged files are not converted again')
     args = parser.parse_args(argv)
     output_dir = pathlib.Path(args.output_dir)
     output_file = pathlib.Path(args.output_file)
+    if args.jobs < 1:
+        parser.error(f"The number of jobs must be at least 1, got '{args.jobs}'")
 
     with open(args.arguments_file, 'r') as h:
         data = json.load(h)
 
-    idl_tuples = []
-    for non_idl_tuple in data['non_idl_tuples']:
-        # only take the filastrst : for separation, since the first tuple
-        # contains an absolute path which on Windows contains a colon
-        basepath, relative_path = non_idl_tuple.rsplit(':', 1)
-        abs_idl_file = convert_to_idl(
-            pathlib.Path(basepath), args.package_name,
-            pathlib.Path(relative_path), output_dir)
-        idl_tuples.append((output_dir, abs_idl_file.relative_to(output_dir)))
+    idl_files = convert_non_idl_tuples(
+        args.package_name, data['non_idl_tuples'], output_dir, jobs=args.jobs,
+        quiet=args.quiet,
+        manifest_file=pathlib.Path(args.manifest_file) if args.manifest_file else None)
 
     output_file.parent.mkdir(exist_ok=True)
     with output_file.open('w') as h:
-        for basepath, relative_path in idl_tuples:
-            line = f'{basepath}:{relative_path}\n'
+        for relative_path in idl_files:
+            line = f'{output_dir}:{relative_path}\n'
             # use CMake friendly separator
             line = line.replace(os.sep, '/')
             h.write(line)
+
+
+def convert_non_idl_tuples(
+    package_name, non_idl_tuples, output_dir, *, jobs=1, quiet=False, manifest_file=None
+):
+    """
+    Convert multiple interface files to .idl files.
+
+    :param str package_name: the name of the package
+    :param non_idl_tuples: the interface files, each a string with an absolute base
+      path and a path relative to it separated by a colon
+    :param output_dir: the base directory to create the .idl files in
+    :type output_dir: :py:class:`pathlib.Path`
+    :param int jobs: the number of processes to convert the files with
+    :param bool quiet: suppress the messages about the read and written files
+    :param manifest_file: an optional file recording the digests of the converted
+      files, unchanged files are not converted again if their .idl file still exists
+    :type manifest_file: :py:class:`pathlib.Path`
+    :returns: the paths of the .idl files relative to the output directory in the
+      same order as the interface files
+    """
+    manifest = _read_manifest(manifest_file) if manifest_file else {}
+    digests = {}
+    idl_files = {}
+    pending_tuples = []
+    for non_idl_tuple in non_idl_tuples:
+        if manifest_file:
+            digests[non_idl_tuple] = _get_non_idl_tuple_digest(package_name, non_idl_tuple)
+            entry = manifest.get(non_idl_tuple)
+            if (
+                entry is not None and entry['digest'] == digests[non_idl_tuple] and
+                (output_dir / entry['idl_file']).exists()
+            ):
+                idl_files[non_idl_tuple] = pathlib.Path(entry['idl_file'])
+                continue
+        pending_tuples.append(non_idl_tuple)
+
+    convert = partial(
+        _convert_non_idl_tuple, package_name=package_name, output_dir=output_dir,
+        quiet=quiet)
+    if jobs == 1 or len(pending_tuples) <= 1:
+        results = []
+        with resource.reusing_interpreter():
+            for non_idl_tuple in pending_tuples:
+                try:
+                    results.append(convert(non_idl_tuple))
+                except Exception as e:
+                    raise _get_conversion_error(e, non_idl_tuple) from e
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(pending_tuples)), initializer=_initialize_worker
+        ) as executor:
+            results = list(executor.map(
+                partial(_call_in_worker, convert), pending_tuples,
+                chunksize=max(1, len(pending_tuples) // (4 * jobs))))
+
+    for non_idl_tuple, (idl_file, log_messages) in zip(pending_tuples, results):
+        idl_files[non_idl_tuple] = idl_file
+        if not quiet:
+            for message in log_messages:
+                print(message)
+
+    if manifest_file:
+        _write_manifest(manifest_file, {
+            non_idl_tuple: {
+                'digest': digests[non_idl_tuple],
+                'idl_file': idl_files[non_idl_tuple].as_posix(),
+            } for non_idl_tuple in non_idl_tuples
+        })
+
+    return [idl_files[non_idl_tuple] for non_idl_tuple in non_idl_tuples]
+
+
+def _convert_non_idl_tuple(non_idl_tuple, *, package_name, output_dir, quiet=False):
+    # only take the last : for separation, since the first tuple
+    # contains an absolute path which on Windows contains a colon
+    basepath, relative_path = non_idl_tuple.rsplit(':', 1)
+    with capture_log() as log_messages:
+        try:
+            abs_idl_file = convert_to_idl(
+                pathlib.Path(basepath), package_name,
+                pathlib.Path(relative_path), output_dir)
+        except Exception:
+            # the messages of a failed conversion are printed right away
+            # since no result is returned for them
+            if not quiet:
+                for message in log_messages:
+                    print(message)
+            raise
+    return abs_idl_file.relative_to(output_dir), log_messages
+
+
+def _initialize_worker():
+    # a worker process only converts files
+    resource._keep_interpreter = True
+
+
+def _call_in_worker(function, argument):
+    try:
+        return function(argument)
+    except Exception as e:
+        # not all exceptions can be passed back to the parent process
+        raise _get_conversion_error(e, argument) from None
+
+
+def _get_conversion_error(exception, non_idl_tuple):
+    return RuntimeError(
+        f"{exception.__class__.__name__} converting '{non_idl_tuple}': {exception}")
+
+
+def _get_adapter_version():
+    # the output depends on the implementation and the templates of this package
+    global _adapter_version
+    if _adapter_version is None:
+        sha256 = hashlib.sha256()
+        package_dir = pathlib.Path(__file__).parent
+        for path in sorted(package_dir.rglob('*')):
+            if path.suffix in ('.py', '.em'):
+                sha256.update(path.relative_to(package_dir).as_posix().encode())
+                sha256.update(path.read_bytes())
+        _adapter_version = sha256.hexdigest()
+    return _adapter_version
+
+
+def _get_non_idl_tuple_digest(package_name, non_idl_tuple):
+    basepath, relative_path = non_idl_tuple.rsplit(':', 1)
+    sha256 = hashlib.sha256()
+    sha256.update(_get_adapter_version().encode())
+    sha256.update(package_name.encode())
+    sha256.update(relative_path.encode())
+    sha256.update((pathlib.Path(basepath) / relative_path).read_bytes())
+    return sha256.hexdigest()
+
+
+def _read_manifest(manifest_file):
+    try:
+        with manifest_file.open('r') as h:
+            manifest = json.load(h)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('format_version') != MANIFEST_FORMAT_VERSION:
+        return {}
+    return manifest.get('non_idl_tuples', {})
+
+
+def _write_manifest(manifest_file, entries):
+    manifest_file.parent.mkdir(parents=True, exist_ok=True)
+    # write the manifest atomically so that an interrupted run can't corrupt it
+    tmp_file = manifest_file.with_name(f'{manifest_file.name}.{os.getpid()}.tmp')
+    with tmp_file.open('w') as h:
+        json.dump({
+            'format_version': MANIFEST_FORMAT_VERSION,
+            'non_idl_tuples': entries,
+        }, h, indent=2, sort_keys=True)
+    os.replace(tmp_file, manifest_file)
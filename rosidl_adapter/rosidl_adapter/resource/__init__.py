@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from contextlib import contextmanager
 from io import StringIO
 import os
 import sys
@@ -39,64 +40,119 @@ def expand_template(template_name, data, output_file, encoding='utf-8'):
 
 
 _interpreter = None
+_interpreter_output = None
+# keep the interpreter between evaluations, only enabled within reusing_interpreter()
+_keep_interpreter = False
+# template content keyed on the template path
+_template_cache = {}
+
+
+@contextmanager
+def reusing_interpreter():
+    """
+    Reuse a single interpreter for all evaluations within the context.
+
+    The interpreter isn't kept beyond the context since it redirects the
+    standard output while it exists.
+    """
+    global _keep_interpreter
+    _keep_interpreter = True
+    try:
+        yield
+    finally:
+        _keep_interpreter = False
+        _shutdown_interpreter()
 
 
 def evaluate_template(template_name, data):
-    global _interpreter
     # create copy before manipulating
     data = dict(data)
     data['TEMPLATE'] = _evaluate_template
 
     template_path = os.path.join(os.path.dirname(__file__), template_name)
 
-    output = StringIO()
     try:
-        if em_has_configuration:
-            config = Configuration(
-                defaultRoot=template_path,
-                defaultStdout=output,
-                deleteOnError=True,
-                rawErrors=True,
-                useProxy=True)
-            _interpreter = em.Interpreter(
-                config=config,
-                dispatcher=False)
-        else:
-            _interpreter = em.Interpreter(
-                output=output,
-                options={
-                    em.BUFFERED_OPT: True,
-                    em.RAW_OPT: True,
-                })
-        with open(template_path, 'r') as h:
-            content = h.read()
+        _get_interpreter(template_path)
+        content = _read_template(template_path)
         _interpreter.invoke(
-            'beforeFile', name=template_name, file=h, locals=data)
+            'beforeFile', name=template_name, file=StringIO(content), locals=data)
         if em_has_configuration:
             _interpreter.string(content, locals=data)
         else:
             _interpreter.string(content, template_path, locals=data)
         _interpreter.invoke('afterFile')
 
-        return output.getvalue()
+        return _interpreter_output.getvalue()
     except Exception as e:  # noqa: F841
+        # don't reuse an interpreter in an unknown state
+        _shutdown_interpreter()
         print(
             f"{e.__class__.__name__} processing template '{template_name}'",
             file=sys.stderr)
         raise
     finally:
-        if _interpreter is not None:
-            _interpreter.shutdown()
-        _interpreter = None
+        if not _keep_interpreter:
+            _shutdown_interpreter()
+
+
+def _get_interpreter(template_path):
+    global _interpreter
+    global _interpreter_output
+    if _interpreter is not None:
+        # start each evaluation with an empty output
+        _interpreter_output.seek(0)
+        _interpreter_output.truncate()
+        if em_has_configuration:
+            # the root context is named after the template
+            _interpreter.root = template_path
+            _interpreter.reset(True)
+        else:
+            _interpreter.reset()
+        return _interpreter
+
+    _interpreter_output = StringIO()
+    if em_has_configuration:
+        config = Configuration(
+            defaultRoot=template_path,
+            defaultStdout=_interpreter_output,
+            deleteOnError=True,
+            rawErrors=True,
+            useProxy=True)
+        _interpreter = em.Interpreter(
+            config=config,
+            dispatcher=False)
+    else:
+        _interpreter = em.Interpreter(
+            output=_interpreter_output,
+            options={
+                em.BUFFERED_OPT: True,
+                em.RAW_OPT: True,
+            })
+    return _interpreter
+
+
+def _shutdown_interpreter():
+    global _interpreter
+    if _interpreter is not None:
+        _interpreter.shutdown()
+    _interpreter = None
+
+
+def _read_template(template_path):
+    content = _template_cache.get(template_path)
+    if content is None:
+        with open(template_path, 'r') as h:
+            content = h.read()
+        _template_cache[template_path] = content
+    return content
 
 
 def _evaluate_template(template_name, **kwargs):
     global _interpreter
     template_path = os.path.join(os.path.dirname(__file__), template_name)
-    with open(template_path, 'r') as h:
-        _interpreter.invoke(
-            'beforeInclude', name=template_path, file=h, locals=kwargs)
-        content = h.read()
+    content = _read_template(template_path)
+    _interpreter.invoke(
+        'beforeInclude', name=template_path, file=StringIO(content), locals=kwargs)
     try:
         if em_has_configuration:
             _interpreter.string(content, locals=kwargs)
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from rosidl_adapter import log
 from rosidl_adapter.parser import parse_service_string
 from rosidl_adapter.resource import expand_template
 
@@ -22,14 +23,14 @@ def convert_srv_to_idl(package_dir, package_name, input_file, output_dir):
     assert input_file.suffix == '.srv'
 
     abs_input_file = package_dir / input_file
-    print(f'Reading input file: {abs_input_file}')
+    log(f'Reading input file: {abs_input_file}')
     abs_input_file = package_dir / input_file
     content = abs_input_file.read_text(encoding='utf-8')
     srv = parse_service_string(package_name, input_file.stem, content)
 
     output_file = output_dir / input_file.with_suffix('.idl').name
     abs_output_file = output_file.absolute()
-    print(f'Writing output file: {abs_output_file}')
+    log(f'Writing output file: {abs_output_file}')
     data = {
         'pkg_name': package_name,
         'relative_input_file': input_file.as_posix(),
@@ -0,0 +1,93 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pathlib
+import shutil
+
+import pytest
+from rosidl_adapter import main
+from rosidl_adapter.main import convert_non_idl_tuples
+
+
+DATA_PATH = pathlib.Path(__file__).parent / 'data'
+
+INTERFACE_FILES = ['msg/Test.msg', 'srv/Test.srv', 'action/Test.action']
+
+
+def test_convert_non_idl_tuples(tmp_path, capsys, monkeypatch):
+    non_idl_tuples = [f'{DATA_PATH}:{path}' for path in INTERFACE_FILES]
+    manifest_file = tmp_path / 'manifest.json'
+
+    # NOTE: empy expects its proxy to stay in sys.stdout, see test_cli_extensions.py
+    with capsys.disabled():  # so do everything in one run
+        for jobs in (1, 2):
+            output_dir = tmp_path / f'jobs{jobs}'
+            idl_files = convert_non_idl_tuples(
+                'test_msgs', non_idl_tuples, output_dir, jobs=jobs, quiet=True)
+            assert idl_files == [
+                pathlib.Path(path).with_suffix('.idl') for path in INTERFACE_FILES]
+            for idl_file in idl_files:
+                expected_file = (DATA_PATH / idl_file).with_suffix('.expected.idl')
+                assert (output_dir / idl_file).read_text() == expected_file.read_text()
+
+        # unchanged files aren't converted again
+        output_dir = tmp_path / 'incremental'
+        convert_non_idl_tuples(
+            'test_msgs', non_idl_tuples, output_dir, quiet=True,
+            manifest_file=manifest_file)
+        assert manifest_file.exists()
+
+        def convert_to_idl_not_called(*args, **kwargs):
+            assert False, 'the files should not have been converted again'
+
+        monkeypatch.setattr(main, 'convert_to_idl', convert_to_idl_not_called)
+        assert convert_non_idl_tuples(
+            'test_msgs', non_idl_tuples, output_dir, quiet=True,
+            manifest_file=manifest_file) == idl_files
+        monkeypatch.undo()
+
+        # a missing output file is converted again
+        (output_dir / idl_files[1]).unlink()
+        convert_non_idl_tuples(
+            'test_msgs', non_idl_tuples, output_dir, quiet=True,
+            manifest_file=manifest_file)
+        assert (output_dir / idl_files[1]).exists()
+
+        # a changed file is converted again
+        shutil.copytree(DATA_PATH / 'msg', tmp_path / 'src' / 'msg')
+        msg_file = tmp_path / 'src' / 'msg' / 'Test.msg'
+        non_idl_tuples = [f"{tmp_path / 'src'}:msg/Test.msg"]
+        convert_non_idl_tuples(
+            'test_msgs', non_idl_tuples, output_dir, quiet=True,
+            manifest_file=manifest_file)
+        msg_file.write_text(msg_file.read_text() + 'int32 added_field\n')
+        convert_non_idl_tuples(
+            'test_msgs', non_idl_tuples, output_dir, quiet=True,
+            manifest_file=manifest_file)
+        assert 'added_field' in (output_dir / 'msg' / 'Test.idl').read_text()
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_convert_non_idl_tuples_error(tmp_path, capfd, jobs):
+    # NOTE: no file is expanded, empy expects its proxy to stay in sys.stdout
+    (tmp_path / 'msg').mkdir()
+    for name in ('Invalid', 'OtherInvalid'):
+        (tmp_path / 'msg' / f'{name}.msg').write_text('not_a_type field\n')
+    non_idl_tuples = [f'{tmp_path}:msg/Invalid.msg', f'{tmp_path}:msg/OtherInvalid.msg']
+
+    with pytest.raises(RuntimeError, match='Invalid.msg'):
+        convert_non_idl_tuples(
+            'test_msgs', non_idl_tuples, tmp_path / 'output', jobs=jobs)
+    # the file which failed to convert is named before the error
+    assert f"Reading input file: {tmp_path / 'msg' / 'Invalid.msg'}" in capfd.readouterr().out
@@ -17,6 +17,7 @@ import signal
 
 from rosidl_cli.command.generate import GenerateCommand
 from rosidl_cli.command.translate import TranslateCommand
+from rosidl_cli.command.watch import WatchCommand
 from rosidl_cli.common import get_first_line_doc
 
 
@@ -74,7 +75,7 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
 
-    commands = [GenerateCommand(), TranslateCommand()]
+    commands = [GenerateCommand(), TranslateCommand(), WatchCommand()]
 
     # add arguments for command extension(s)
     add_subparsers(
@@ -42,6 +42,10 @@ class GenerateCommand(Command):
             '-I', '--include-path', type=pathlib.Path, metavar='PATH',
             dest='include_paths', action='append', default=[],
             help='Paths to include dependency interface definition files from.')
+        parser.add_argument(
+            '-j', '--jobs', metavar='N', type=int, default=1,
+            help=('Maximum number of type representations and type supports '
+                  'to generate concurrently. Defaults to 1.'))
         parser.add_argument(
             'package_name', help='Name of the package to generate code for')
         parser.add_argument(
@@ -57,5 +61,6 @@ class GenerateCommand(Command):
             include_paths=args.include_paths,
             output_path=args.output_path,
             types=args.types,
-            typesupports=args.typesupports
+            typesupports=args.typesupports,
+            jobs=args.jobs
         )
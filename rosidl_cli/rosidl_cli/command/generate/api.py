@@ -15,6 +15,8 @@
 import os
 import pathlib
 
+from rosidl_cli.command.translate.api import translate
+
 from .extensions import load_type_extensions
 from .extensions import load_typesupport_extensions
 
@@ -26,7 +28,9 @@ def generate(
     include_paths=None,
     output_path=None,
     types=None,
-    typesupports=None
+    typesupports=None,
+    jobs=1,
+    extensions=None
 ):
     """
     Generate source code from interface definition files.
@@ -49,6 +53,14 @@ def generate(
     name of each will be appended to the given `output_path` to preclude
     name clashes upon writing source code files.
 
+    Interface definition files not in the IDL format are translated once,
+    into a 'tmp' directory under the given `output_path` shared by all
+    extensions, and only the resulting IDL files are passed on.
+
+    If more than one job is requested, extensions are invoked concurrently
+    in separate processes. Errors of all failed extensions are then collected
+    and reported together.
+
     :param package_name: name of the package to generate source code for
     :param interface_files: list of paths to interface definition files
     :param include_paths: optional list of paths to include dependency
@@ -57,25 +69,19 @@ def generate(
         source code files, defaults to the current working directory
     :param types: optional list of type representations to generate
     :param typesupports: optional list of type supports to generate
+    :param jobs: maximum number of extensions to invoke concurrently
+    :param extensions: optional list of already loaded extensions to use
+        instead of the ones for the given type representations and type
+        supports, see :py:func:`load_generate_extensions`
     :returns: list of lists of paths to generated source code files,
         one group per type or type support extension invoked
     """
-    extensions = []
+    if jobs < 1:
+        raise ValueError(f"The number of jobs must be at least 1, got '{jobs}'")
 
-    unspecific_generation = not types and not typesupports
-
-    if types or unspecific_generation:
-        extensions.extend(load_type_extensions(
-            specs=types,
-            strict=not unspecific_generation))
-
-    if typesupports or unspecific_generation:
-        extensions.extend(load_typesupport_extensions(
-            specs=typesupports,
-            strict=not unspecific_generation))
-
-    if unspecific_generation and not extensions:
-        raise RuntimeError('No type nor typesupport extensions were found')
+    if extensions is None:
+        extensions = load_generate_extensions(
+            types=types, typesupports=typesupports)
 
     if include_paths is None:
         include_paths = []
@@ -85,6 +91,14 @@ def generate(
     else:
         os.makedirs(output_path, exist_ok=True)
 
+    interface_files = _translate_to_idl(
+        package_name, interface_files, include_paths, output_path / 'tmp')
+
+    if len(extensions) > 1 and jobs > 1:
+        return _generate_concurrently(
+            extensions, package_name, interface_files, include_paths,
+            output_path, jobs=jobs)
+
     if len(extensions) > 1:
         return [
             extension.generate(
@@ -97,3 +111,94 @@ def generate(
         package_name, interface_files,
         include_paths, output_path
     )]
+
+
+def load_generate_extensions(*, types=None, typesupports=None):
+    """
+    Load type representation and type support generation extensions.
+
+    If no type representation nor type support is specified, all available
+    ones are loaded.
+
+    :param types: optional list of type representations to generate
+    :param typesupports: optional list of type supports to generate
+    :returns: list of type and type support extensions, in that order
+    """
+    extensions = []
+
+    unspecific_generation = not types and not typesupports
+
+    if types or unspecific_generation:
+        extensions.extend(load_type_extensions(
+            specs=types,
+            strict=not unspecific_generation))
+
+    if typesupports or unspecific_generation:
+        extensions.extend(load_typesupport_extensions(
+            specs=typesupports,
+            strict=not unspecific_generation))
+
+    if unspecific_generation and not extensions:
+        raise RuntimeError('No type nor typesupport extensions were found')
+
+    return extensions
+
+
+def _translate_to_idl(package_name, interface_files, include_paths, output_path):
+    # normalize the interface definition format to .idl once for all extensions
+    idl_interface_files = []
+    non_idl_interface_files = []
+    for path in interface_files:
+        if not str(path).endswith('.idl'):
+            non_idl_interface_files.append(path)
+        else:
+            idl_interface_files.append(path)
+    if non_idl_interface_files:
+        idl_interface_files.extend(translate(
+            package_name=package_name,
+            interface_files=non_idl_interface_files,
+            include_paths=include_paths,
+            output_format='idl',
+            output_path=output_path,
+        ))
+    return idl_interface_files
+
+
+def _generate_concurrently(
+    extensions, package_name, interface_files, include_paths, output_path, *, jobs
+):
+    # only import the process pool when needed to keep the startup fast
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(extensions))) as executor:
+        futures = [
+            executor.submit(
+                _generate_in_worker, extension, package_name, interface_files,
+                include_paths, output_path / extension.name)
+            for extension in extensions
+        ]
+
+    generated_files = []
+    errors = []
+    for extension, future in zip(extensions, futures):
+        try:
+            generated_files.append(future.result())
+        except Exception as e:
+            errors.append(f"- '{extension.name}': {e}")
+    if errors:
+        raise RuntimeError('\n'.join([
+            'Failed to generate source code with the following extensions:',
+            *errors
+        ]))
+    return generated_files
+
+
+def _generate_in_worker(
+    extension, package_name, interface_files, include_paths, output_path
+):
+    try:
+        return extension.generate(
+            package_name, interface_files, include_paths, output_path=output_path)
+    except Exception as e:
+        # not all exceptions can be passed back to the parent process
+        raise RuntimeError(f'{e.__class__.__name__}: {e}') from None
@@ -17,6 +17,23 @@ import json
 import os
 import pathlib
 import tempfile
+import time
+
+from rosidl_cli.common import get_cache_path
+from rosidl_cli.common import write_cache_file
+
+
+# The file to persist the index of include paths in, an empty value disables it
+INCLUDE_PATH_INDEX_ENV_VAR = 'ROSIDL_CLI_INCLUDE_PATH_INDEX'
+INCLUDE_PATH_INDEX_FORMAT_VERSION = 1
+# The maximum number of include paths in the persisted index
+MAX_INDEXED_INCLUDE_PATHS = 256
+
+# Directories modified this recently might still change within the
+# resolution of the modification time, so their listing isn't trusted later
+_RACY_MTIME_WINDOW_NS = 2 * 10 ** 9
+
+_include_path_index = None
 
 
 def package_name_from_interface_file_path(path):
@@ -35,13 +52,133 @@ def dependencies_from_include_paths(include_paths):
 
     Interface definition file paths from dependencies are absolute paths
     prefixed by the name of package they belong to followed by a colon ':'.
+
+    The interface definition files are looked up in an index of the include
+    paths, see :py:func:`find_idl_files`.
     """
-    return list({
+    return sorted({
         f'{package_name_from_interface_file_path(path)}:{path}'
-        for include_path in include_paths
-        for path in pathlib.Path(
-            os.path.abspath(include_path)
-        ).glob('**/*.idl')
+        for path in find_idl_files(include_paths)
+    })
+
+
+def get_include_path_index_file():
+    """
+    Get the file to persist the index of include paths in.
+
+    The file can be set with the ``ROSIDL_CLI_INCLUDE_PATH_INDEX`` environment
+    variable, an empty value disables persisting the index.
+    By default the file is located in the user cache directory.
+
+    :returns: the path of the index file or None if it isn't persisted
+    """
+    index_file = os.environ.get(INCLUDE_PATH_INDEX_ENV_VAR)
+    if index_file is not None:
+        return pathlib.Path(index_file) if index_file else None
+    return get_cache_path() / 'include_path_index.json'
+
+
+def find_idl_files(include_paths):
+    """
+    Find all interface definition files in include paths recursively.
+
+    The listing of every directory is indexed together with its modification
+    time, which changes whenever an entry is added, removed or renamed.
+    Subsequent lookups only list the directories which changed, all others
+    only need to be stat'ed.
+    The index is kept in the current process and persisted in the file
+    returned by :py:func:`get_include_path_index_file` to be shared between
+    invocations.
+    The persisted index only keeps the most recently used include paths which
+    still exist.
+
+    :param include_paths: paths to include interface definition files from
+    :returns: sorted list of paths to interface definition files
+    """
+    global _include_path_index
+    index_file = get_include_path_index_file()
+    if _include_path_index is None or _include_path_index[0] != index_file:
+        index = _read_include_path_index(index_file) if index_file else {}
+        _include_path_index = (index_file, index)
+    index = _include_path_index[1]
+
+    idl_files = []
+    # the include paths are ordered from the least to the most recently used
+    include_paths = list(dict.fromkeys(os.path.abspath(path) for path in include_paths))
+    index_changed = bool(include_paths) and \
+        list(index.keys())[-len(include_paths):] != include_paths
+    for include_path in include_paths:
+        old_directories = index.pop(include_path, {})
+        directories = {}
+        _index_directory(include_path, '.', old_directories, directories, idl_files)
+        index[include_path] = directories
+        if directories != old_directories:
+            index_changed = True
+    if index_changed and index_file:
+        _write_include_path_index(index_file, index)
+    return sorted({pathlib.Path(path) for path in idl_files})
+
+
+def _index_directory(include_path, relative_path, old_directories, directories, idl_files):
+    path = os.path.normpath(os.path.join(include_path, relative_path))
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return
+    entry = old_directories.get(relative_path)
+    if entry is not None and entry[0] is not None and entry[0] == mtime:
+        _, subdirectories, filenames = entry
+    else:
+        scan_time = time.time_ns()
+        subdirectories = []
+        filenames = []
+        try:
+            with os.scandir(path) as it:
+                for dir_entry in it:
+                    # like pathlib's recursive glob don't follow symlinks
+                    if dir_entry.is_dir() and not dir_entry.is_symlink():
+                        subdirectories.append(dir_entry.name)
+                    elif dir_entry.name.endswith('.idl'):
+                        filenames.append(dir_entry.name)
+        except OSError:
+            return
+        subdirectories.sort()
+        filenames.sort()
+        if scan_time - mtime < _RACY_MTIME_WINDOW_NS:
+            mtime = None
+    directories[relative_path] = [mtime, subdirectories, filenames]
+    idl_files.extend(os.path.join(path, filename) for filename in filenames)
+    for subdirectory in subdirectories:
+        _index_directory(
+            include_path, os.path.join(relative_path, subdirectory),
+            old_directories, directories, idl_files)
+
+
+def _read_include_path_index(index_file):
+    try:
+        with index_file.open('r', encoding='utf-8') as h:
+            index = json.load(h)
+    except (OSError, ValueError):
+        return {}
+    if (
+        not isinstance(index, dict) or
+        index.get('format_version') != INCLUDE_PATH_INDEX_FORMAT_VERSION
+    ):
+        return {}
+    return index['include_paths']
+
+
+def _write_include_path_index(index_file, index):
+    # don't keep include paths which have been removed, e.g. temporary
+    # directories, and only the most recently used of the remaining ones
+    for include_path in list(index.keys()):
+        if not os.path.isdir(include_path):
+            del index[include_path]
+    for include_path in list(index.keys())[:-MAX_INDEXED_INCLUDE_PATHS]:
+        del index[include_path]
+    write_cache_file(index_file, {
+        'format_version': INCLUDE_PATH_INDEX_FORMAT_VERSION,
+        'include_paths': index,
     })
 
 
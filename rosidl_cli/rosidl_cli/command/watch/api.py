@@ -0,0 +1,243 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pathlib
+import re
+import sys
+import time
+
+from rosidl_cli.command.generate.api import generate
+from rosidl_cli.command.generate.api import load_generate_extensions
+from rosidl_cli.command.helpers import find_idl_files
+from rosidl_cli.command.helpers import interface_path_as_tuple
+from rosidl_cli.command.helpers import package_name_from_interface_file_path
+from rosidl_cli.command.translate.api import translate
+
+
+# The include directives of an .idl file, each one an `Include` element
+INCLUDE_DIRECTIVE_PATTERN = re.compile(
+    r'^[ \t]*#[ \t]*include[ \t]+["<]([^">]+)[">]', re.MULTILINE)
+
+
+class InterfaceWatcher:
+    """
+    Regenerate source code for changed interface definition files.
+
+    The type representation and type support extensions are loaded once and
+    kept, along with anything they cache, for the lifetime of the watcher.
+
+    Which interface definition files are affected by a change is derived from
+    the include directives of their IDL representation: an interface is
+    affected if it is changed itself or if it includes, directly or
+    transitively, a changed interface of the package or of a dependency
+    found in the include paths.
+    """
+
+    def __init__(
+        self,
+        *,
+        package_name,
+        interface_files,
+        include_paths=None,
+        output_path=None,
+        types=None,
+        typesupports=None
+    ):
+        """
+        Construct a watcher.
+
+        See :py:func:`rosidl_cli.command.generate.api.generate` for a
+        description of the arguments.
+        """
+        self.package_name = package_name
+        self.include_paths = include_paths or []
+        self.output_path = output_path or pathlib.Path.cwd()
+        self.extensions = load_generate_extensions(
+            types=types, typesupports=typesupports)
+
+        self.interface_files = list(interface_files)
+        # the absolute path and the include locator of each interface file
+        self._paths = {}
+        self._locators = {}
+        for interface_file in self.interface_files:
+            prefix, path = interface_path_as_tuple(interface_file)
+            self._paths[interface_file] = str(prefix / path)
+            self._locators[interface_file] = \
+                f'{package_name}/{path.parent.as_posix()}/{path.stem}.idl'
+        # the locators included by each interface file
+        self._includes = {}
+        self._snapshot = {}
+
+    def generate_all(self):
+        """
+        Generate source code for all interface definition files.
+
+        :returns: list of interface definition files generated for
+        """
+        self._snapshot = self._take_snapshot()
+        interface_files = [
+            interface_file for interface_file in self.interface_files
+            if self._paths[interface_file] in self._snapshot]
+        self._generate(interface_files)
+        return interface_files
+
+    def poll(self):
+        """
+        Regenerate source code for interface definition files affected by changes.
+
+        Changes are detected by comparing the modification times and sizes of
+        the interface definition files and of the ones in the include paths
+        to those seen during the previous call.
+
+        :returns: list of interface definition files regenerated for,
+          empty if nothing changed
+        """
+        snapshot = self._take_snapshot()
+        changed_paths = {
+            path for path in snapshot.keys() | self._snapshot.keys()
+            if snapshot.get(path) != self._snapshot.get(path)}
+        self._snapshot = snapshot
+        if not changed_paths:
+            return []
+
+        changed_locators = set()
+        interface_files_by_path = {
+            path: interface_file for interface_file, path in self._paths.items()}
+        for path in changed_paths:
+            interface_file = interface_files_by_path.get(path)
+            if interface_file is not None:
+                changed_locators.add(self._locators[interface_file])
+                continue
+            path = pathlib.Path(path)
+            changed_locators.add(
+                f'{package_name_from_interface_file_path(path)}/'
+                f'{path.parent.name}/{path.name}')
+
+        affected_interface_files = self._get_affected_interface_files(changed_locators)
+        interface_files = [
+            interface_file for interface_file in self.interface_files
+            if interface_file in affected_interface_files and
+            self._paths[interface_file] in snapshot]
+        for interface_file in affected_interface_files:
+            if self._paths[interface_file] not in snapshot:
+                self._includes.pop(interface_file, None)
+        if interface_files:
+            self._generate(interface_files)
+        return interface_files
+
+    def _take_snapshot(self):
+        paths = list(self._paths.values())
+        paths += [str(path) for path in find_idl_files(self.include_paths)]
+        snapshot = {}
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _get_affected_interface_files(self, changed_locators):
+        affected_interface_files = {
+            interface_file for interface_file, locator in self._locators.items()
+            if locator in changed_locators}
+        pending_locators = set(changed_locators)
+        while pending_locators:
+            locator = pending_locators.pop()
+            for interface_file, includes in self._includes.items():
+                if locator in includes and interface_file not in affected_interface_files:
+                    affected_interface_files.add(interface_file)
+                    pending_locators.add(self._locators[interface_file])
+        return affected_interface_files
+
+    def _generate(self, interface_files):
+        idl_interface_files = []
+        for interface_file in interface_files:
+            if str(interface_file).endswith('.idl'):
+                idl_interface_file = interface_file
+            else:
+                # translate each file separately to know which .idl file is which
+                idl_interface_file, = translate(
+                    package_name=self.package_name,
+                    interface_files=[interface_file],
+                    include_paths=self.include_paths,
+                    output_format='idl',
+                    output_path=self.output_path / 'tmp')
+            prefix, path = interface_path_as_tuple(idl_interface_file)
+            with (prefix / path).open('r', encoding='utf-8') as h:
+                self._includes[interface_file] = set(
+                    INCLUDE_DIRECTIVE_PATTERN.findall(h.read()))
+            idl_interface_files.append(idl_interface_file)
+
+        return generate(
+            package_name=self.package_name,
+            interface_files=idl_interface_files,
+            include_paths=self.include_paths,
+            output_path=self.output_path,
+            extensions=self.extensions)
+
+
+def watch(
+    *,
+    package_name,
+    interface_files,
+    include_paths=None,
+    output_path=None,
+    types=None,
+    typesupports=None,
+    interval=0.5
+):
+    """
+    Generate source code and regenerate it whenever interface files change.
+
+    After generating source code for all interface definition files, the
+    interface definition files and the include paths are polled for changes
+    until interrupted.
+    Only source code for the affected interface definition files is
+    regenerated, see :py:class:`InterfaceWatcher`.
+    Failures to regenerate are reported without stopping to watch.
+
+    See :py:func:`rosidl_cli.command.generate.api.generate` for a
+    description of the common arguments.
+
+    :param interval: the time in seconds between polling for changes
+    """
+    if output_path is not None:
+        os.makedirs(output_path, exist_ok=True)
+    watcher = InterfaceWatcher(
+        package_name=package_name,
+        interface_files=interface_files,
+        include_paths=include_paths,
+        output_path=output_path,
+        types=types,
+        typesupports=typesupports)
+
+    start_time = time.monotonic()
+    interface_files = watcher.generate_all()
+    print(f'Generated source code for {len(interface_files)} interface files '
+          f'in {time.monotonic() - start_time:.2f}s, watching for changes')
+
+    while True:
+        time.sleep(interval)
+        start_time = time.monotonic()
+        try:
+            interface_files = watcher.poll()
+        except Exception as e:
+            print(f'Failed to regenerate source code: {e}', file=sys.stderr)
+            continue
+        if interface_files:
+            print(f'Regenerated source code in {time.monotonic() - start_time:.2f}s for:')
+            for interface_file in interface_files:
+                print(f'- {interface_file}')
@@ -13,6 +13,56 @@
 # limitations under the License.
 
 
+import json
+import logging
+import os
+import pathlib
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_cache_path():
+    """
+    Get the directory for files cached between invocations.
+
+    :returns: the ``rosidl_cli`` directory in the user cache directory
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or \
+        os.path.join(os.path.expanduser('~'), '.cache')
+    return pathlib.Path(cache_home) / 'rosidl_cli'
+
+
+def write_cache_file(cache_file, content):
+    """
+    Write a JSON cache file without exposing partial content to concurrent readers.
+
+    The content is written to a temporary file in the same directory first
+    which is then renamed to the cache file.
+    Failures are only logged since a cache is only an optimization, e.g. the
+    directory might be read-only.
+
+    :param cache_file: the path of the cache file
+    :type cache_file: :py:class:`pathlib.Path`
+    :param content: the JSON serializable content
+    :returns: True if the file has been written, False otherwise
+    """
+    tmp_file = cache_file.with_name(f'{cache_file.name}.{os.getpid()}.tmp')
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_file.open('w', encoding='utf-8') as h:
+            json.dump(content, h)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        logger.debug(f"Failed to write cache file '{cache_file}': {e}")
+        try:
+            tmp_file.unlink()
+        except OSError:
+            pass
+        return False
+    return True
+
+
 def get_first_line_doc(any_type):
     if any_type.__doc__:
         for line in any_type.__doc__.splitlines():
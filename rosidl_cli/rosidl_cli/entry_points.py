@@ -12,16 +12,142 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+import json
 import logging
+import os
+import pathlib
+import sys
 
-try:
-    import importlib.metadata as importlib_metadata
-except ModuleNotFoundError:
-    import importlib_metadata
+from rosidl_cli.common import get_cache_path
+from rosidl_cli.common import write_cache_file
 
 
 logger = logging.getLogger(__name__)
 
+# The file to cache discovered entry points in, an empty value disables the cache
+ENTRY_POINTS_CACHE_ENV_VAR = 'ROSIDL_CLI_ENTRY_POINTS_CACHE'
+ENTRY_POINTS_CACHE_FORMAT_VERSION = 1
+
+_entry_point_groups = None
+
+
+def _get_importlib_metadata():
+    # importing the module is deferred until entry points are actually needed
+    try:
+        import importlib.metadata as importlib_metadata
+    except ModuleNotFoundError:
+        import importlib_metadata
+    return importlib_metadata
+
+
+def get_entry_points_cache_file():
+    """
+    Get the file to cache discovered entry points in.
+
+    The file can be set with the ``ROSIDL_CLI_ENTRY_POINTS_CACHE`` environment
+    variable, an empty value disables the cache.
+    By default the file is located in the user cache directory.
+
+    :returns: the path of the cache file or None if caching is disabled
+    """
+    cache_file = os.environ.get(ENTRY_POINTS_CACHE_ENV_VAR)
+    if cache_file is not None:
+        return pathlib.Path(cache_file) if cache_file else None
+    return get_cache_path() / 'entry_points.json'
+
+
+def _get_distributions_stamp():
+    # the entry points only change if sys.path or the installed distributions change
+    sha256 = hashlib.sha256()
+    for path in sys.path:
+        sha256.update(f'{path}\0'.encode('utf-8', 'surrogateescape'))
+        try:
+            entries = sorted(os.scandir(path or '.'), key=lambda entry: entry.name)
+        except OSError:
+            # e.g. a zip file or a non-existing directory
+            try:
+                sha256.update(f'{os.stat(path).st_mtime_ns}\n'.encode())
+            except OSError:
+                pass
+            continue
+        for entry in entries:
+            if not entry.name.endswith(('.dist-info', '.egg-info')):
+                continue
+            stamps = []
+            for metadata_path in (entry.path, os.path.join(entry.path, 'entry_points.txt')):
+                try:
+                    stamps.append(os.stat(metadata_path).st_mtime_ns)
+                except OSError:
+                    stamps.append(None)
+            sha256.update(f'{entry.name}:{stamps}\n'.encode('utf-8', 'surrogateescape'))
+    return sha256.hexdigest()
+
+
+def _discover_entry_point_groups():
+    entry_points_impl = _get_importlib_metadata().entry_points()
+    if hasattr(entry_points_impl, 'select'):
+        entry_points_by_group = {
+            group_name: entry_points_impl.select(group=group_name)
+            for group_name in sorted(entry_points_impl.groups)}
+    else:
+        entry_points_by_group = entry_points_impl
+    return {
+        group_name: [[entry_point.name, entry_point.value] for entry_point in entry_points]
+        for group_name, entry_points in entry_points_by_group.items()}
+
+
+def _read_entry_points_cache(cache_file, stamp):
+    try:
+        with cache_file.open('r', encoding='utf-8') as h:
+            cache = json.load(h)
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(cache, dict) or
+        cache.get('format_version') != ENTRY_POINTS_CACHE_FORMAT_VERSION or
+        cache.get('stamp') != stamp
+    ):
+        return None
+    return cache['groups']
+
+
+def get_entry_point_groups():
+    """
+    Get the names and values of all entry points by group.
+
+    Discovering entry points requires scanning the metadata of all
+    distributions on ``sys.path``.
+    The result is therefore cached in the current process as well as in the
+    file returned by :py:func:`get_entry_points_cache_file`, which is reused
+    as long as ``sys.path`` and the modification times of the distribution
+    metadata don't change.
+
+    :returns: mapping from group names to lists of entry point name and
+      value pairs
+    :rtype: dict
+    """
+    global _entry_point_groups
+    key = tuple(sys.path)
+    if _entry_point_groups is not None and _entry_point_groups[0] == key:
+        return _entry_point_groups[1]
+
+    cache_file = get_entry_points_cache_file()
+    groups = None
+    if cache_file is not None:
+        stamp = _get_distributions_stamp()
+        groups = _read_entry_points_cache(cache_file, stamp)
+    if groups is None:
+        groups = _discover_entry_point_groups()
+        if cache_file is not None:
+            write_cache_file(cache_file, {
+                'format_version': ENTRY_POINTS_CACHE_FORMAT_VERSION,
+                'stamp': stamp,
+                'groups': groups,
+            })
+    _entry_point_groups = (key, groups)
+    return groups
+
 
 def get_entry_points(group_name, *, specs=None, strict=False):
     """
@@ -35,14 +161,10 @@ def get_entry_points(group_name, *, specs=None, strict=False):
     """
     if specs is not None:
         specs = set(specs)
-    entry_points_impl = importlib_metadata.entry_points()
-    if hasattr(entry_points_impl, 'select'):
-        groups = entry_points_impl.select(group=group_name)
-    else:
-        groups = entry_points_impl.get(group_name, [])
+    entry_point_class = _get_importlib_metadata().EntryPoint
     entry_points = {}
-    for entry_point in groups:
-        name = entry_point.name
+    for name, value in get_entry_point_groups().get(group_name, []):
+        entry_point = entry_point_class(name=name, value=value, group=group_name)
         if specs and name not in specs:
             continue
         if name in entry_points:
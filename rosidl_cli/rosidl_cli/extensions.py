@@ -17,8 +17,6 @@ import re
 
 from rosidl_cli.entry_points import load_entry_points
 
-import yaml
-
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +51,8 @@ def parse_extension_specification(spec):
     name = match.group(1)
     kwargs = match.group(2)
     if kwargs is not None:
+        # only import the YAML parser when needed to keep the startup fast
+        import yaml
         try:
             kwargs = yaml.safe_load('{' + kwargs + '}')
         except Exception as e:
@@ -12,7 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
+
 from rosidl_cli.common import get_first_line_doc
+from rosidl_cli.common import write_cache_file
 
 
 def test_getting_first_line_from_no_docstring():
@@ -37,3 +40,14 @@ def test_getting_first_line_from_multiline_docstring():
     func = test_getting_first_line_from_multiline_docstring
     line = get_first_line_doc(func)
     assert line == 'Check it really gets the first non-empty line'
+
+
+def test_write_cache_file(tmp_path):
+    cache_file = tmp_path / 'cache' / 'cache.json'
+    assert write_cache_file(cache_file, {'key': ['value']})
+    assert json.loads(cache_file.read_text()) == {'key': ['value']}
+    assert [p.name for p in cache_file.parent.iterdir()] == ['cache.json']
+
+    # failures are not raised since a cache is only an optimization
+    (tmp_path / 'file').write_text('')
+    assert not write_cache_file(tmp_path / 'file' / 'cache.json', {})
@@ -0,0 +1,74 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import pytest
+
+from rosidl_cli import entry_points
+from rosidl_cli.entry_points import ENTRY_POINTS_CACHE_ENV_VAR
+from rosidl_cli.entry_points import get_entry_points
+from rosidl_cli.entry_points import load_entry_points
+
+GROUP_NAME = 'rosidl_cli.test.extensions'
+
+
+@pytest.fixture
+def distribution(tmp_path, monkeypatch):
+    site_path = tmp_path / 'site'
+    dist_info_path = site_path / 'rosidl_cli_test_dist-1.0.dist-info'
+    dist_info_path.mkdir(parents=True)
+    (dist_info_path / 'METADATA').write_text(
+        'Metadata-Version: 2.1\nName: rosidl_cli_test_dist\nVersion: 1.0\n')
+    (dist_info_path / 'entry_points.txt').write_text(
+        f'[{GROUP_NAME}]\nfoo = rosidl_cli_test_module:foo\n')
+    (site_path / 'rosidl_cli_test_module.py').write_text(
+        "def foo():\n    return 'foo'\n\n\ndef bar():\n    return 'bar'\n")
+    monkeypatch.syspath_prepend(str(site_path))
+    monkeypatch.setenv(ENTRY_POINTS_CACHE_ENV_VAR, str(tmp_path / 'cache.json'))
+    monkeypatch.setattr(entry_points, '_entry_point_groups', None)
+    return dist_info_path
+
+
+def _discovery_fails():
+    raise AssertionError('entry points should have been read from the cache')
+
+
+def test_entry_points_cache(distribution, tmp_path, monkeypatch):
+    assert list(get_entry_points(GROUP_NAME)) == ['foo']
+    assert (tmp_path / 'cache.json').exists()
+    assert load_entry_points(GROUP_NAME, specs=['foo'])['foo']() == 'foo'
+
+    # unchanged distributions are read from the cache
+    monkeypatch.setattr(entry_points, '_entry_point_groups', None)
+    with monkeypatch.context() as m:
+        m.setattr(entry_points, '_discover_entry_point_groups', _discovery_fails)
+        assert list(get_entry_points(GROUP_NAME)) == ['foo']
+
+    # changed metadata invalidates the cache
+    monkeypatch.setattr(entry_points, '_entry_point_groups', None)
+    entry_points_file = distribution / 'entry_points.txt'
+    entry_points_file.write_text(
+        f'[{GROUP_NAME}]\nfoo = rosidl_cli_test_module:foo\n'
+        'bar = rosidl_cli_test_module:bar\n')
+    stat = entry_points_file.stat()
+    os.utime(entry_points_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert load_entry_points(GROUP_NAME, specs=['bar'])['bar']() == 'bar'
+    assert list(get_entry_points(GROUP_NAME)) == ['foo', 'bar']
+
+
+def test_entry_points_cache_disabled(distribution, tmp_path, monkeypatch):
+    monkeypatch.setenv(ENTRY_POINTS_CACHE_ENV_VAR, '')
+    assert list(get_entry_points(GROUP_NAME)) == ['foo']
+    assert not (tmp_path / 'cache.json').exists()
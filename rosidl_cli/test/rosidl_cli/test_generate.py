@@ -0,0 +1,101 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from rosidl_cli.command.generate import api
+from rosidl_cli.command.generate.extensions import GenerateCommandExtension
+
+
+class GenerateFiles(GenerateCommandExtension):
+
+    def generate(self, package_name, interface_files, include_paths, output_path):
+        output_path.mkdir(parents=True, exist_ok=True)
+        generated_files = []
+        for interface_file in interface_files:
+            name = interface_file.rpartition(':')[2]
+            generated_file = output_path / f'{self.name}_{name}.txt'
+            generated_file.write_text(package_name)
+            generated_files.append(generated_file)
+        return generated_files
+
+
+class FailToGenerate(GenerateCommandExtension):
+
+    def generate(self, package_name, interface_files, include_paths, output_path):
+        raise KeyError(self.name)
+
+
+def _load_extensions(extensions):
+    def load_extensions(*, specs, strict):
+        return extensions
+    return load_extensions
+
+
+@pytest.mark.parametrize('jobs', [1, 3])
+def test_generate(tmp_path, monkeypatch, jobs):
+    monkeypatch.setattr(api, 'load_type_extensions', _load_extensions(
+        [GenerateFiles('foo'), GenerateFiles('bar')]))
+    monkeypatch.setattr(api, 'load_typesupport_extensions', _load_extensions(
+        [GenerateFiles('baz')]))
+
+    generated_files = api.generate(
+        package_name='pkg', interface_files=['a.idl', 'b.idl'], output_path=tmp_path, jobs=jobs)
+
+    assert generated_files == [
+        [tmp_path / name / f'{name}_a.idl.txt', tmp_path / name / f'{name}_b.idl.txt']
+        for name in ('foo', 'bar', 'baz')
+    ]
+    for group in generated_files:
+        for generated_file in group:
+            assert generated_file.read_text() == 'pkg'
+
+
+def test_generate_concurrently_aggregates_errors(tmp_path, monkeypatch):
+    monkeypatch.setattr(api, 'load_type_extensions', _load_extensions(
+        [FailToGenerate('foo'), GenerateFiles('bar'), FailToGenerate('baz')]))
+    monkeypatch.setattr(api, 'load_typesupport_extensions', _load_extensions([]))
+
+    with pytest.raises(RuntimeError) as e:
+        api.generate(
+            package_name='pkg', interface_files=['a.idl'], output_path=tmp_path, jobs=2)
+    message = str(e.value)
+    assert "'foo': KeyError" in message
+    assert "'baz': KeyError" in message
+    assert "'bar'" not in message
+    assert (tmp_path / 'bar' / 'bar_a.idl.txt').exists()
+
+    with pytest.raises(ValueError):
+        api.generate(package_name='pkg', interface_files=['a.idl'], jobs=0)
+
+
+def test_generate_translates_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(api, 'load_type_extensions', _load_extensions(
+        [GenerateFiles('foo'), GenerateFiles('bar')]))
+    monkeypatch.setattr(api, 'load_typesupport_extensions', _load_extensions([]))
+    translate_calls = []
+
+    def translate(*, package_name, interface_files, include_paths, output_format, output_path):
+        translate_calls.append((interface_files, output_format, output_path))
+        return [f'{output_path}:{path[:-4]}.idl' for path in interface_files]
+    monkeypatch.setattr(api, 'translate', translate)
+
+    generated_files = api.generate(
+        package_name='pkg', interface_files=['a.idl', 'b.msg', 'c.srv'],
+        output_path=tmp_path)
+
+    assert translate_calls == [(['b.msg', 'c.srv'], 'idl', tmp_path / 'tmp')]
+    for name, group in zip(('foo', 'bar'), generated_files):
+        assert [path.name for path in group] == [
+            f'{name}_a.idl.txt', f'{name}_b.idl.txt', f'{name}_c.idl.txt']
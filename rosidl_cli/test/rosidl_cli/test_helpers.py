@@ -18,6 +18,9 @@ import pathlib
 
 import pytest
 
+from rosidl_cli.command import helpers
+from rosidl_cli.command.helpers import find_idl_files
+from rosidl_cli.command.helpers import INCLUDE_PATH_INDEX_ENV_VAR
 from rosidl_cli.command.helpers import interface_path_as_tuple
 from rosidl_cli.command.helpers import legacy_generator_arguments_file
 
@@ -68,3 +71,84 @@ def test_legacy_generator_arguments_file(current_path):
             'bar:' + str(current_path / path_to_dep)
         ]
     assert not pathlib.Path(path).exists()
+
+
+def _touch_in_the_past(*paths):
+    # make modification times old enough for the index to trust them
+    for path in paths:
+        os.utime(path, ns=(0, 10 ** 18))
+
+
+def test_find_idl_files(tmp_path, monkeypatch):
+    monkeypatch.setenv(INCLUDE_PATH_INDEX_ENV_VAR, str(tmp_path / 'index.json'))
+    monkeypatch.setattr(helpers, '_include_path_index', None)
+    include_path = tmp_path / 'include'
+    (include_path / 'foo' / 'msg').mkdir(parents=True)
+    (include_path / 'foo' / 'msg' / 'Foo.idl').write_text('')
+    (include_path / 'foo' / 'msg' / 'Foo.msg').write_text('')
+    (include_path / 'bar' / 'srv').mkdir(parents=True)
+    (include_path / 'bar' / 'srv' / 'Bar.idl').write_text('')
+    _touch_in_the_past(
+        include_path, include_path / 'foo', include_path / 'foo' / 'msg',
+        include_path / 'bar', include_path / 'bar' / 'srv')
+
+    expected_idl_files = [
+        include_path / 'bar' / 'srv' / 'Bar.idl',
+        include_path / 'foo' / 'msg' / 'Foo.idl',
+    ]
+    assert find_idl_files([include_path]) == expected_idl_files
+    assert (tmp_path / 'index.json').exists()
+
+    # the persisted index is reused without listing unchanged directories
+    monkeypatch.setattr(helpers, '_include_path_index', None)
+    scanned_paths = []
+    scandir = os.scandir
+
+    def scandir_spy(path):
+        scanned_paths.append(path)
+        return scandir(path)
+    monkeypatch.setattr(helpers.os, 'scandir', scandir_spy)
+    assert find_idl_files([include_path]) == expected_idl_files
+    assert scanned_paths == []
+
+    # only changed directories are listed again
+    (include_path / 'foo' / 'msg' / 'Baz.idl').write_text('')
+    os.utime(include_path / 'foo' / 'msg', ns=(0, 10 ** 18 + 10 ** 9))
+    assert find_idl_files([include_path]) == [
+        include_path / 'bar' / 'srv' / 'Bar.idl',
+        include_path / 'foo' / 'msg' / 'Baz.idl',
+        include_path / 'foo' / 'msg' / 'Foo.idl',
+    ]
+    assert scanned_paths == [str(include_path / 'foo' / 'msg')]
+
+
+def test_include_path_index_is_bounded(tmp_path, monkeypatch):
+    index_file = tmp_path / 'index.json'
+    monkeypatch.setenv(INCLUDE_PATH_INDEX_ENV_VAR, str(index_file))
+    monkeypatch.setattr(helpers, '_include_path_index', None)
+    monkeypatch.setattr(helpers, 'MAX_INDEXED_INCLUDE_PATHS', 2)
+    include_paths = [tmp_path / name for name in ('a', 'b', 'c')]
+    for include_path in include_paths:
+        (include_path / 'msg').mkdir(parents=True)
+        (include_path / 'msg' / 'Foo.idl').write_text('')
+
+    def get_indexed_include_paths():
+        with index_file.open('r') as h:
+            return list(json.load(h)['include_paths'].keys())
+
+    for include_path in include_paths:
+        assert find_idl_files([include_path]) == [include_path / 'msg' / 'Foo.idl']
+    # only the most recently used include paths are kept
+    assert get_indexed_include_paths() == [str(include_paths[1]), str(include_paths[2])]
+
+    find_idl_files([include_paths[1]])
+    assert get_indexed_include_paths() == [str(include_paths[2]), str(include_paths[1])]
+
+    # include paths which don't exist anymore are removed
+    (include_paths[2] / 'msg' / 'Foo.idl').unlink()
+    (include_paths[2] / 'msg').rmdir()
+    include_paths[2].rmdir()
+    find_idl_files([include_paths[0]])
+    assert get_indexed_include_paths() == [str(include_paths[1]), str(include_paths[0])]
+    find_idl_files([include_paths[1]])
+    assert get_indexed_include_paths() == [str(include_paths[0]), str(include_paths[1])]
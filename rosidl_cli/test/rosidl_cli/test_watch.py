@@ -0,0 +1,81 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+from rosidl_cli.command.generate.extensions import GenerateCommandExtension
+from rosidl_cli.command.helpers import INCLUDE_PATH_INDEX_ENV_VAR
+from rosidl_cli.command.watch import api
+from rosidl_cli.command.watch.api import InterfaceWatcher
+
+
+class RecordInterfaceFiles(GenerateCommandExtension):
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.generated_interface_files = []
+
+    def generate(self, package_name, interface_files, include_paths, output_path):
+        self.generated_interface_files.append(list(interface_files))
+        return []
+
+
+def _write_idl(path, *includes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(''.join(f'#include "{include}"\n' for include in includes))
+    # make sure the change is noticed within the resolution of the mtime
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def test_interface_watcher(tmp_path, monkeypatch):
+    monkeypatch.setenv(INCLUDE_PATH_INDEX_ENV_VAR, '')
+    extension = RecordInterfaceFiles('record')
+    monkeypatch.setattr(
+        api, 'load_generate_extensions', lambda *, types, typesupports: [extension])
+
+    package_path = tmp_path / 'pkg'
+    include_path = tmp_path / 'include'
+    _write_idl(package_path / 'msg' / 'A.idl', 'pkg/msg/B.idl')
+    _write_idl(package_path / 'msg' / 'B.idl')
+    _write_idl(package_path / 'msg' / 'C.idl', 'dep/msg/D.idl')
+    _write_idl(include_path / 'dep' / 'msg' / 'D.idl')
+    interface_files = [f'{package_path}:msg/{name}.idl' for name in 'ABC']
+    a, b, c = interface_files
+
+    watcher = InterfaceWatcher(
+        package_name='pkg', interface_files=interface_files,
+        include_paths=[include_path], output_path=tmp_path / 'out')
+    assert watcher.generate_all() == interface_files
+    assert extension.generated_interface_files == [interface_files]
+    assert watcher.poll() == []
+
+    # dependents within the package are regenerated
+    _write_idl(package_path / 'msg' / 'B.idl', 'pkg/msg/E.idl')
+    assert watcher.poll() == [a, b]
+
+    # dependents of interfaces in include paths are regenerated
+    _write_idl(include_path / 'dep' / 'msg' / 'D.idl')
+    assert watcher.poll() == [c]
+
+    # new dependencies are taken into account transitively
+    _write_idl(package_path / 'msg' / 'C.idl', 'pkg/msg/A.idl')
+    assert watcher.poll() == [c]
+    _write_idl(package_path / 'msg' / 'B.idl')
+    assert watcher.poll() == [a, b, c]
+    _write_idl(include_path / 'dep' / 'msg' / 'D.idl')
+    assert watcher.poll() == []
+
+    assert extension.generated_interface_files == [
+        interface_files, [a, b], [c], [c], [a, b, c]]
@@ -0,0 +1,179 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# Add the custom command running a generator for rosidl_generate_interfaces().
+#
+# If the ``ROSIDL_GENERATOR_FAN_OUT`` variable is set the command isn't added.
+# Instead all generators registered for the same target are run by a single
+# command added at the end of rosidl_generate_interfaces(), which parses each
+# interface file only once for all of them, see ``rosidl_pycommon.fan_out``.
+#
+# :param target: the target passed to rosidl_generate_interfaces()
+# :type target: string
+# :param FUNCTION: the Python function of the generator as module:function
+# :type FUNCTION: string
+# :param GENERATOR_ARGUMENTS_FILE: the generator arguments file
+# :type GENERATOR_ARGUMENTS_FILE: string
+# :param KEYWORD_ARGUMENTS: additional keyword arguments for the function as
+#   key=value pairs with JSON values
+# :type KEYWORD_ARGUMENTS: list of strings
+# :param COMMAND: the command running the generator on its own
+# :type COMMAND: list of strings
+# :param OUTPUT: the generated files
+# :type OUTPUT: list of strings
+# :param DEPENDS: the files the generated files depend on
+# :type DEPENDS: list of strings
+# :param DEPFILE: the dependency file written by the generator which lists
+#   the files each generated file has actually been generated from, it must
+#   also be passed as DEPFILE to rosidl_write_generator_arguments()
+# :type DEPFILE: string
+# :param DEPENDS_WITHOUT_DEPFILE: the files the generated files may depend
+#   on, they are only added to DEPENDS if the DEPFILE can't be used
+# :type DEPENDS_WITHOUT_DEPFILE: list of strings
+# :param COMMENT: the comment of the command
+# :type COMMENT: string
+#
+# @public
+#
+function(rosidl_add_generator_command target)
+  cmake_parse_arguments(ARG
+    ""
+    "FUNCTION;GENERATOR_ARGUMENTS_FILE;DEPFILE;COMMENT"
+    "KEYWORD_ARGUMENTS;COMMAND;OUTPUT;DEPENDS;DEPENDS_WITHOUT_DEPFILE"
+    ${ARGN})
+  if(ARG_UNPARSED_ARGUMENTS)
+    message(FATAL_ERROR "rosidl_add_generator_command() called with unused "
+      "arguments: ${ARG_UNPARSED_ARGUMENTS}")
+  endif()
+  foreach(required_argument FUNCTION GENERATOR_ARGUMENTS_FILE COMMAND OUTPUT)
+    if(NOT ARG_${required_argument})
+      message(FATAL_ERROR
+        "rosidl_add_generator_command() must be invoked with the "
+        "${required_argument} argument")
+    endif()
+  endforeach()
+
+  rosidl_generator_supports_depfile(_supports_depfile)
+  if(NOT ARG_DEPFILE OR NOT _supports_depfile)
+    set(ARG_DEPFILE "")
+    list(APPEND ARG_DEPENDS ${ARG_DEPENDS_WITHOUT_DEPFILE})
+  endif()
+
+  if(NOT ROSIDL_GENERATOR_FAN_OUT)
+    _rosidl_add_generator_custom_command(
+      OUTPUT ${ARG_OUTPUT}
+      COMMAND ${ARG_COMMAND}
+      DEPENDS ${ARG_DEPENDS}
+      DEPFILE "${ARG_DEPFILE}"
+      COMMENT "${ARG_COMMENT}"
+    )
+    return()
+  endif()
+
+  set(_prefix "_ROSIDL_GENERATOR_FAN_OUT_${target}")
+  set_property(GLOBAL APPEND PROPERTY "${_prefix}_ARGUMENTS"
+    --generator "${ARG_FUNCTION}" "${ARG_GENERATOR_ARGUMENTS_FILE}"
+    ${ARG_KEYWORD_ARGUMENTS})
+  set_property(GLOBAL APPEND PROPERTY "${_prefix}_OUTPUT" ${ARG_OUTPUT})
+  set_property(GLOBAL APPEND PROPERTY "${_prefix}_DEPENDS" ${ARG_DEPENDS})
+  set_property(GLOBAL APPEND PROPERTY "${_prefix}_FUNCTIONS" "${ARG_FUNCTION}")
+  if(ARG_DEPFILE)
+    set_property(GLOBAL PROPERTY "${_prefix}_DEPFILE" TRUE)
+  endif()
+endfunction()
+
+#
+# Check if the generator can use a dependency file for its custom command.
+#
+# The DEPFILE option of add_custom_command() is only supported by the Ninja
+# and Makefile generators.
+#
+# :param var: the output variable name, set to TRUE or FALSE
+# :type var: string
+#
+# @public
+#
+function(rosidl_generator_supports_depfile var)
+  if(CMAKE_GENERATOR MATCHES "Ninja|Makefiles" AND
+      NOT CMAKE_VERSION VERSION_LESS 3.20)
+    set(${var} TRUE PARENT_SCOPE)
+  else()
+    set(${var} FALSE PARENT_SCOPE)
+  endif()
+endfunction()
+
+#
+# Add a custom command with an optional dependency file.
+#
+# :param DEPFILE: the dependency file, may be empty
+# :type DEPFILE: string
+#
+function(_rosidl_add_generator_custom_command)
+  cmake_parse_arguments(ARG "" "DEPFILE;COMMENT" "OUTPUT;COMMAND;DEPENDS" ${ARGN})
+  set(_depfile_arguments "")
+  if(ARG_DEPFILE)
+    set(_depfile_arguments DEPFILE "${ARG_DEPFILE}")
+  endif()
+  cmake_policy(PUSH)
+  if(POLICY CMP0116)
+    # paths in the dependency file are absolute or relative to the build directory
+    cmake_policy(SET CMP0116 NEW)
+  endif()
+  add_custom_command(
+    OUTPUT ${ARG_OUTPUT}
+    COMMAND ${ARG_COMMAND}
+    DEPENDS ${ARG_DEPENDS}
+    ${_depfile_arguments}
+    COMMENT "${ARG_COMMENT}"
+    VERBATIM
+  )
+  cmake_policy(POP)
+endfunction()
+
+#
+# Add the single command running all generators registered for a target.
+#
+# :param target: the target passed to rosidl_generate_interfaces()
+# :type target: string
+#
+function(_rosidl_add_generator_fan_out_command target)
+  set(_prefix "_ROSIDL_GENERATOR_FAN_OUT_${target}")
+  get_property(_functions GLOBAL PROPERTY "${_prefix}_FUNCTIONS")
+  if(NOT _functions)
+    return()
+  endif()
+  get_property(_arguments GLOBAL PROPERTY "${_prefix}_ARGUMENTS")
+  get_property(_output GLOBAL PROPERTY "${_prefix}_OUTPUT")
+  get_property(_depends GLOBAL PROPERTY "${_prefix}_DEPENDS")
+  list(REMOVE_DUPLICATES _depends)
+  list(JOIN _functions ", " _functions_string)
+
+  # combine the dependency files written by the generators
+  get_property(_has_depfile GLOBAL PROPERTY "${_prefix}_DEPFILE")
+  set(_depfile "")
+  if(_has_depfile)
+    set(_depfile "${CMAKE_CURRENT_BINARY_DIR}/${target}__rosidl_generator_fan_out.d")
+    list(APPEND _arguments --depfile "${_depfile}")
+  endif()
+
+  # the generators have found the Python interpreter already
+  _rosidl_add_generator_custom_command(
+    OUTPUT ${_output}
+    COMMAND Python3::Interpreter -m rosidl_pycommon.fan_out ${_arguments}
+    DEPENDS ${_depends}
+    DEPFILE "${_depfile}"
+    COMMENT "Generating code for ROS interfaces with ${_functions_string}"
+  )
+endfunction()
@@ -48,6 +48,17 @@
 #   the ``ament_lint`` package
 # :type ADD_LINTER_TESTS: option
 #
+# The number of processes each generator uses can be set with the
+# ``ROSIDL_GENERATOR_JOBS`` variable, it defaults to a single process.
+# If the ``ROSIDL_GENERATOR_INCREMENTAL`` variable is set the generators skip
+# interface files whose inputs didn't change since the previous run.
+# If the ``ROSIDL_GENERATOR_FAN_OUT`` variable is set the generators using
+# ``rosidl_add_generator_command()`` are run by a single process which parses
+# each interface file only once.
+# With the Ninja and Makefile generators the generators write dependency files
+# listing the files each generated file has actually been generated from, so
+# only the generators affected by a change run again.
+#
 # @public
 #
 macro(rosidl_generate_interfaces target)
@@ -278,6 +289,9 @@ macro(rosidl_generate_interfaces target)
   endforeach()
 
   ament_execute_extensions("rosidl_generate_idl_interfaces")
+  if(ROSIDL_GENERATOR_FAN_OUT)
+    _rosidl_add_generator_fan_out_command(${target})
+  endif()
 
   # check for extensions registered with the previous extension point
   set(obsolete_extension_point "rosidl_generate_interfaces")
@@ -70,9 +70,8 @@ set(target_dependencies
   "${rosidl_generator_c_TEMPLATE_DIR}/msg__type_support.h.em"
   "${rosidl_generator_c_TEMPLATE_DIR}/srv__type_support.c.em"
   "${rosidl_generator_c_TEMPLATE_DIR}/srv__type_support.h.em"
-  ${rosidl_generate_interfaces_ABS_IDL_FILES}
-  ${_dependency_files})
-foreach(dep ${target_dependencies})
+  ${rosidl_generate_interfaces_ABS_IDL_FILES})
+foreach(dep ${target_dependencies} ${_dependency_files})
   if(NOT EXISTS "${dep}")
     message(FATAL_ERROR "Target dependency '${dep}' does not exist")
   endif()
@@ -80,6 +79,7 @@ endforeach()
 
 get_target_property(_target_sources ${rosidl_generate_interfaces_TARGET} SOURCES)
 set(generator_arguments_file "${CMAKE_CURRENT_BINARY_DIR}/rosidl_generator_c__arguments.json")
+set(generator_depfile "${CMAKE_CURRENT_BINARY_DIR}/rosidl_generator_c.d")
 rosidl_write_generator_arguments(
   "${generator_arguments_file}"
   PACKAGE_NAME "${PROJECT_NAME}"
@@ -87,9 +87,12 @@ rosidl_write_generator_arguments(
   ROS_INTERFACE_DEPENDENCIES "${_dependencies}"
   OUTPUT_DIR "${_output_path}"
   TEMPLATE_DIR "${rosidl_generator_c_TEMPLATE_DIR}"
-  TARGET_DEPENDENCIES ${target_dependencies}
+  TARGET_DEPENDENCIES ${target_dependencies} ${_dependency_files}
   TYPE_DESCRIPTION_TUPLES "${${rosidl_generate_interfaces_TARGET}__DESCRIPTION_TUPLES}"
   ROS_INTERFACE_FILES "${_target_sources}"
+  JOBS "${ROSIDL_GENERATOR_JOBS}"
+  INCREMENTAL "${ROSIDL_GENERATOR_INCREMENTAL}"
+  DEPFILE "${generator_depfile}"
 )
 
 # By default, without the settings below, find_package(Python3) will attempt
@@ -111,19 +114,26 @@ set(Python3_FIND_UNVERSIONED_NAMES FIRST)
 find_package(Python3 REQUIRED COMPONENTS Interpreter)
 
 set(disable_description_codegen_arg)
+set(disable_description_codegen_keyword_arg)
 if(ROSIDL_GENERATOR_C_DISABLE_TYPE_DESCRIPTION_CODEGEN)
   set(disable_description_codegen_arg "--disable-description-codegen")
+  set(disable_description_codegen_keyword_arg "disable_description_codegen=true")
 endif()
 
-add_custom_command(
-  OUTPUT ${_generated_headers} ${_generated_sources}
-  COMMAND Python3::Interpreter
-  ARGS ${rosidl_generator_c_BIN}
+rosidl_add_generator_command(${rosidl_generate_interfaces_TARGET}
+  FUNCTION "rosidl_generator_c:generate_c"
+  GENERATOR_ARGUMENTS_FILE "${generator_arguments_file}"
+  KEYWORD_ARGUMENTS ${disable_description_codegen_keyword_arg}
+  COMMAND Python3::Interpreter ${rosidl_generator_c_BIN}
   --generator-arguments-file "${generator_arguments_file}"
   ${disable_description_codegen_arg}
+  OUTPUT ${_generated_headers} ${_generated_sources}
   DEPENDS ${target_dependencies}
+  # the .idl files of other packages aren't read, the dependency file lists
+  # the files which have actually been read instead
+  DEPENDS_WITHOUT_DEPFILE ${_dependency_files}
+  DEPFILE "${generator_depfile}"
   COMMENT "Generating C code for ROS interfaces"
-  VERBATIM
 )
 
 # generate header to switch between export and import for a specific package
@@ -17,6 +17,7 @@
 from rosidl_generator_c import type_hash_to_c_definition
 from rosidl_generator_type_description import extract_subinterface
 from rosidl_generator_type_description import GET_HASH_FUNC
+from rosidl_generator_type_description import TypeReferenceIndex
 from rosidl_parser.definition import Action
 from rosidl_parser.definition import Service
 from rosidl_pycommon import convert_camel_case_to_lower_case_underscore
@@ -31,35 +32,40 @@ include_parts = [package_name] + list(interface_path.parents[0].parts) + [
     'detail', convert_camel_case_to_lower_case_underscore(interface_path.stem)]
 include_base = '/'.join(include_parts)
 
+# all implicit type descriptions are covered by the references of the toplevel one
+reference_index = TypeReferenceIndex.from_type_description_msg(type_description_msg)
+
 implicit_type_descriptions = []
 toplevel_type_description = (type_description_msg, 'message')
 for service in content.get_elements_of_type(Service):
   toplevel_type_description = (type_description_msg, 'service')
   implicit_type_descriptions.extend([
-    (extract_subinterface(type_description_msg, 'request_message'), 'message'),
-    (extract_subinterface(type_description_msg, 'response_message'), 'message'),
-    (extract_subinterface(type_description_msg, 'event_message'), 'message'),
+    (extract_subinterface(type_description_msg, 'request_message', reference_index), 'message'),
+    (extract_subinterface(type_description_msg, 'response_message', reference_index), 'message'),
+    (extract_subinterface(type_description_msg, 'event_message', reference_index), 'message'),
   ])
 for action in content.get_elements_of_type(Action):
   toplevel_type_description = (type_description_msg, 'action')
-  send_goal_service = extract_subinterface(type_description_msg, 'send_goal_service')
-  get_result_service = extract_subinterface(type_description_msg, 'get_result_service')
+  send_goal_service = extract_subinterface(
+    type_description_msg, 'send_goal_service', reference_index)
+  get_result_service = extract_subinterface(
+    type_description_msg, 'get_result_service', reference_index)
   implicit_type_descriptions.extend([
-    (extract_subinterface(type_description_msg, 'goal'), 'message'),
-    (extract_subinterface(type_description_msg, 'result'), 'message'),
-    (extract_subinterface(type_description_msg, 'feedback'), 'message'),
+    (extract_subinterface(type_description_msg, 'goal', reference_index), 'message'),
+    (extract_subinterface(type_description_msg, 'result', reference_index), 'message'),
+    (extract_subinterface(type_description_msg, 'feedback', reference_index), 'message'),
 
     (send_goal_service, 'service'),
-    (extract_subinterface(send_goal_service, 'request_message'), 'message'),
-    (extract_subinterface(send_goal_service, 'response_message'), 'message'),
-    (extract_subinterface(send_goal_service, 'event_message'), 'message'),
+    (extract_subinterface(send_goal_service, 'request_message', reference_index), 'message'),
+    (extract_subinterface(send_goal_service, 'response_message', reference_index), 'message'),
+    (extract_subinterface(send_goal_service, 'event_message', reference_index), 'message'),
 
     (get_result_service, 'service'),
-    (extract_subinterface(get_result_service, 'request_message'), 'message'),
-    (extract_subinterface(get_result_service, 'response_message'), 'message'),
-    (extract_subinterface(get_result_service, 'event_message'), 'message'),
+    (extract_subinterface(get_result_service, 'request_message', reference_index), 'message'),
+    (extract_subinterface(get_result_service, 'response_message', reference_index), 'message'),
+    (extract_subinterface(get_result_service, 'event_message', reference_index), 'message'),
 
-    (extract_subinterface(type_description_msg, 'feedback_message'), 'message'),
+    (extract_subinterface(type_description_msg, 'feedback_message', reference_index), 'message'),
   ])
 }@
 
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List
+from typing import List, Optional
 
 from rosidl_generator_type_description import parse_rihs_string
 from rosidl_generator_type_description import RIHS01_HASH_VALUE_SIZE
@@ -30,7 +30,10 @@ from rosidl_pycommon import convert_camel_case_to_lower_case_underscore
 from rosidl_pycommon import generate_files
 
 
-def generate_c(generator_arguments_file, disable_description_codegen: bool = False) -> List[str]:
+def generate_c(
+    generator_arguments_file, disable_description_codegen: bool = False,
+    jobs: Optional[int] = None
+) -> List[str]:
     mapping = {
         'idl.h.em': '%s.h',
         'idl__description.c.em': 'detail/%s__description.c',
@@ -45,7 +48,8 @@ def generate_c(generator_arguments_file, disable_description_codegen: bool = Fal
         post_process_callback=prefix_with_bom_if_necessary,
         additional_context={
             'disable_description_codegen': disable_description_codegen
-        })
+        },
+        jobs=jobs)
 
 
 def prefix_with_bom_if_necessary(content: str) -> str:
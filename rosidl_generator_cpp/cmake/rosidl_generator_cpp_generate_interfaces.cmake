@@ -74,15 +74,15 @@ set(target_dependencies
   "${rosidl_generator_cpp_TEMPLATE_DIR}/srv__struct.hpp.em"
   "${rosidl_generator_cpp_TEMPLATE_DIR}/srv__traits.hpp.em"
   "${rosidl_generator_cpp_TEMPLATE_DIR}/srv__type_support.hpp.em"
-  ${rosidl_generate_interfaces_ABS_IDL_FILES}
-  ${_dependency_files})
-foreach(dep ${target_dependencies})
+  ${rosidl_generate_interfaces_ABS_IDL_FILES})
+foreach(dep ${target_dependencies} ${_dependency_files})
   if(NOT EXISTS "${dep}")
     message(FATAL_ERROR "Target dependency '${dep}' does not exist")
   endif()
 endforeach()
 
 set(generator_arguments_file "${CMAKE_CURRENT_BINARY_DIR}/rosidl_generator_cpp__arguments.json")
+set(generator_depfile "${CMAKE_CURRENT_BINARY_DIR}/rosidl_generator_cpp.d")
 rosidl_write_generator_arguments(
   "${generator_arguments_file}"
   PACKAGE_NAME "${PROJECT_NAME}"
@@ -90,8 +90,11 @@ rosidl_write_generator_arguments(
   ROS_INTERFACE_DEPENDENCIES "${_dependencies}"
   OUTPUT_DIR "${_output_path}"
   TEMPLATE_DIR "${rosidl_generator_cpp_TEMPLATE_DIR}"
-  TARGET_DEPENDENCIES ${target_dependencies}
+  TARGET_DEPENDENCIES ${target_dependencies} ${_dependency_files}
   TYPE_DESCRIPTION_TUPLES "${${rosidl_generate_interfaces_TARGET}__DESCRIPTION_TUPLES}"
+  JOBS "${ROSIDL_GENERATOR_JOBS}"
+  INCREMENTAL "${ROSIDL_GENERATOR_INCREMENTAL}"
+  DEPFILE "${generator_depfile}"
 )
 
 # By default, without the settings below, find_package(Python3) will attempt
@@ -112,14 +115,18 @@ set(Python3_FIND_UNVERSIONED_NAMES FIRST)
 
 find_package(Python3 REQUIRED COMPONENTS Interpreter)
 
-add_custom_command(
-  OUTPUT ${_generated_headers}
-  COMMAND Python3::Interpreter
-  ARGS ${rosidl_generator_cpp_BIN}
+rosidl_add_generator_command(${rosidl_generate_interfaces_TARGET}
+  FUNCTION "rosidl_generator_cpp:generate_cpp"
+  GENERATOR_ARGUMENTS_FILE "${generator_arguments_file}"
+  COMMAND Python3::Interpreter ${rosidl_generator_cpp_BIN}
   --generator-arguments-file "${generator_arguments_file}"
+  OUTPUT ${_generated_headers}
   DEPENDS ${target_dependencies}
+  # the .idl files of other packages aren't read, the dependency file lists
+  # the files which have actually been read instead
+  DEPENDS_WITHOUT_DEPFILE ${_dependency_files}
+  DEPFILE "${generator_depfile}"
   COMMENT "Generating C++ code for ROS interfaces"
-  VERBATIM
 )
 
 # INTERFACE libraries can't have file-level dependencies in CMake,
@@ -13,7 +13,7 @@
 # limitations under the License.
 
 from ast import literal_eval
-from typing import List
+from typing import List, Optional
 
 from rosidl_parser.definition import AbstractGenericString
 from rosidl_parser.definition import AbstractNestedType
@@ -29,7 +29,7 @@ from rosidl_parser.definition import UnboundedSequence
 from rosidl_pycommon import generate_files
 
 
-def generate_cpp(generator_arguments_file) -> List[str]:
+def generate_cpp(generator_arguments_file, jobs: Optional[int] = None) -> List[str]:
     mapping = {
         'idl.hpp.em': '%s.hpp',
         'idl__builder.hpp.em': 'detail/%s__builder.hpp',
@@ -39,7 +39,7 @@ def generate_cpp(generator_arguments_file) -> List[str]:
     }
     return generate_files(
         generator_arguments_file, mapping,
-        post_process_callback=prefix_with_bom_if_necessary)
+        post_process_callback=prefix_with_bom_if_necessary, jobs=jobs)
 
 
 def prefix_with_bom_if_necessary(content: str) -> str:
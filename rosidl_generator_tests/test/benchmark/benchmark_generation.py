@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the code generation of synthetic interface packages end-to-end.
+
+For each corpus size the packages are generated by :py:mod:`synthetic_corpus`
+and processed in dependency order like a build would: the interface files
+are converted to .idl files, which are parsed, the type descriptions are
+generated and finally the C and C++ code as well as the introspection type
+supports.
+The duration of each stage is summed over all packages and the fastest of
+the repeated runs is reported.
+
+The results can be written as JSON to track them over time, and compared
+against the results of a previous run::
+
+  benchmark_generation.py --messages 100 1000 --output results.json
+  benchmark_generation.py --messages 100 1000 --compare results.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import pathlib
+import platform
+import sys
+import tempfile
+import time
+
+from rosidl_adapter.main import convert_non_idl_tuples
+from rosidl_generator_c import generate_c
+from rosidl_generator_cpp import generate_cpp
+from rosidl_generator_type_description import generate_type_hash
+from rosidl_parser.cache import CONTENT_CACHE_DIR_ENV_VAR
+from rosidl_parser.definition import IdlLocator
+from rosidl_parser.parser import parse_idl_file
+from rosidl_typesupport_introspection_c import generate_c as generate_introspection_c
+from rosidl_typesupport_introspection_cpp import generate_cpp as generate_introspection_cpp
+from synthetic_corpus import generate_corpus
+
+RESULTS_FORMAT_VERSION = 1
+
+# the code generators run after the type descriptions have been generated
+GENERATORS = {
+    'rosidl_generator_c': generate_c,
+    'rosidl_generator_cpp': generate_cpp,
+    'rosidl_typesupport_introspection_c': generate_introspection_c,
+    'rosidl_typesupport_introspection_cpp': generate_introspection_cpp,
+}
+STAGES = (
+    'rosidl_adapter',
+    'parse_idl_file',
+    'rosidl_generator_type_description',
+) + tuple(GENERATORS.keys())
+
+
+def run_pipeline(packages, output_dir, *, jobs=1):
+    """
+    Run all stages of the code generation for the packages of a corpus.
+
+    :param packages: the :class:`synthetic_corpus.SyntheticPackage` in
+      dependency order
+    :param output_dir: the directory to generate the files in
+    :type output_dir: :py:class:`pathlib.Path`
+    :param int jobs: the number of processes each stage may use
+    :returns: a dict with the duration in seconds by stage
+    """
+    durations = dict.fromkeys(STAGES, 0.0)
+    type_description_dirs = {}
+    all_dependencies = {}
+    for package in packages:
+        package_dir = output_dir / package.name
+        interface_files = [package.base_path / f for f in package.interface_files]
+
+        start = time.perf_counter()
+        idl_dir = package_dir / 'rosidl_adapter'
+        idl_files = convert_non_idl_tuples(
+            package.name, [f'{package.base_path}:{f.as_posix()}' for f in package.interface_files],
+            idl_dir, jobs=jobs, quiet=True)
+        durations['rosidl_adapter'] += time.perf_counter() - start
+        idl_tuples = [f'{idl_dir}:{f.as_posix()}' for f in idl_files]
+
+        start = time.perf_counter()
+        for idl_file in idl_files:
+            parse_idl_file(IdlLocator(idl_dir, idl_file))
+        durations['parse_idl_file'] += time.perf_counter() - start
+
+        # nested messages may refer to types of indirect dependencies
+        dependencies = set(package.dependencies)
+        for dependency in package.dependencies:
+            dependencies |= all_dependencies[dependency]
+        all_dependencies[package.name] = dependencies
+
+        type_description_dir = package_dir / 'rosidl_generator_type_description'
+        type_description_dirs[package.name] = type_description_dir
+        arguments_file = _write_arguments_file(package_dir, 'rosidl_generator_type_description', {
+            'package_name': package.name,
+            'output_dir': str(type_description_dir),
+            'idl_tuples': idl_tuples,
+            'include_paths': [
+                f'{dependency}:{type_description_dirs[dependency]}'
+                for dependency in sorted(dependencies)],
+        })
+        start = time.perf_counter()
+        generate_type_hash(arguments_file, jobs=jobs)
+        durations['rosidl_generator_type_description'] += time.perf_counter() - start
+
+        for generator_name, generate in GENERATORS.items():
+            arguments_file = _write_arguments_file(package_dir, generator_name, {
+                'package_name': package.name,
+                'output_dir': str(package_dir / generator_name),
+                'template_dir': str(_get_template_dir(generator_name)),
+                'idl_tuples': idl_tuples,
+                'target_dependencies': [],
+                'type_description_tuples': [
+                    f"{f.as_posix()}:{type_description_dir / f.with_suffix('.json')}"
+                    for f in idl_files],
+                'ros_interface_files': [str(f) for f in interface_files],
+            })
+            start = time.perf_counter()
+            generate(arguments_file, jobs=jobs)
+            durations[generator_name] += time.perf_counter() - start
+    return durations
+
+
+def _write_arguments_file(package_dir, generator_name, arguments):
+    arguments_file = package_dir / f'{generator_name}__arguments.json'
+    arguments_file.parent.mkdir(parents=True, exist_ok=True)
+    with arguments_file.open('w', encoding='utf-8') as h:
+        json.dump(arguments, h, indent=2)
+    return str(arguments_file)
+
+
+def _get_template_dir(generator_name):
+    module = sys.modules[GENERATORS[generator_name].__module__]
+    package_dir = pathlib.Path(module.__file__).parent
+    # the templates are installed into the share directory of the package
+    for template_dir in (
+        package_dir.parent / 'resource',
+        package_dir.parents[3] / 'share' / generator_name / 'resource',
+    ):
+        if template_dir.is_dir():
+            return template_dir
+    raise RuntimeError(f"Could not find the templates of '{generator_name}'")
+
+
+def benchmark_corpus(message_count, *, package_count, max_depth, seed, repeat, jobs):
+    """
+    Benchmark the code generation of one synthetic corpus.
+
+    :param int message_count: the number of messages in the corpus
+    :param int package_count: the number of packages, or None for the default
+    :param int max_depth: the maximum nesting depth of the messages
+    :param int seed: the seed of the corpus
+    :param int repeat: the number of runs, the fastest one is reported
+    :param int jobs: the number of processes each stage may use
+    :returns: the result of the corpus
+    """
+    with tempfile.TemporaryDirectory(prefix='rosidl_benchmark_') as tmp_dir:
+        tmp_dir = pathlib.Path(tmp_dir)
+        packages = generate_corpus(
+            tmp_dir / 'src', message_count, package_count=package_count,
+            max_depth=max_depth, seed=seed)
+        samples = {stage: [] for stage in STAGES}
+        for run in range(repeat):
+            durations = run_pipeline(packages, tmp_dir / f'build{run}', jobs=jobs)
+            for stage, duration in durations.items():
+                samples[stage].append(duration)
+
+    interface_count = sum(len(package.interface_files) for package in packages)
+    stages = {}
+    for stage, durations in samples.items():
+        stages[stage] = {
+            'seconds': min(durations),
+            'ms_per_interface': min(durations) / interface_count * 1e3,
+            'samples': durations,
+        }
+    return {
+        'corpus': {
+            'seed': seed,
+            'max_depth': max_depth,
+            'packages': len(packages),
+            'messages': sum(package.get_interface_count('.msg') for package in packages),
+            'services': sum(package.get_interface_count('.srv') for package in packages),
+            'actions': sum(package.get_interface_count('.action') for package in packages),
+        },
+        'requested_messages': message_count,
+        'stages': stages,
+    }
+
+
+def compare_results(results, baseline, threshold):
+    """
+    Compare the durations of the stages with the results of a previous run.
+
+    :param results: the results of this run
+    :param baseline: the results of the previous run
+    :param float threshold: the relative slowdown which is reported as a
+      regression, e.g. 0.1 for ten percent
+    :returns: the list of lines describing the comparison and a flag if any
+      stage regressed
+    """
+    baseline_runs = {
+        run['requested_messages']: run for run in baseline.get('runs', [])}
+    lines = []
+    regressed = False
+    for run in results['runs']:
+        baseline_run = baseline_runs.get(run['requested_messages'])
+        if baseline_run is None:
+            continue
+        if baseline_run['corpus'] != run['corpus']:
+            lines.append(
+                f"{run['requested_messages']:>8} skipped, the corpus differs from the baseline")
+            continue
+        for stage, result in run['stages'].items():
+            baseline_seconds = baseline_run['stages'].get(stage, {}).get('seconds')
+            if not baseline_seconds:
+                continue
+            ratio = result['seconds'] / baseline_seconds
+            marker = ''
+            if ratio > 1 + threshold:
+                marker = '  REGRESSION'
+                regressed = True
+            lines.append(
+                f"{run['requested_messages']:>8} {stage:<38} "
+                f"{baseline_seconds:>9.3f} {result['seconds']:>9.3f} {ratio:>7.2f}{marker}")
+    return lines, regressed
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(
+        description='Benchmark the code generation of synthetic interface packages.',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '--messages', nargs='+', type=int, default=[10, 100, 1000],
+        help='The numbers of messages of the synthetic corpora, e.g. up to 5000')
+    parser.add_argument(
+        '--packages', type=int,
+        help='The number of packages per corpus, defaults to one per hundred messages')
+    parser.add_argument(
+        '--max-depth', type=int, default=4,
+        help='The maximum nesting depth of the messages')
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help='The seed of the synthetic corpora')
+    parser.add_argument(
+        '--repeat', type=int, default=3,
+        help='The number of runs per corpus, the fastest one is reported')
+    parser.add_argument(
+        '--jobs', type=int, default=1,
+        help='The number of processes each stage may use')
+    parser.add_argument(
+        '--output',
+        help='The JSON file to write the results to')
+    parser.add_argument(
+        '--compare', metavar='BASELINE',
+        help='A JSON file with the results of a previous run to compare with')
+    parser.add_argument(
+        '--threshold', type=float, default=0.1,
+        help='The relative slowdown compared to the baseline reported as a regression')
+    args = parser.parse_args(argv)
+
+    # measure parsing the .idl files rather than reading cached content
+    os.environ.pop(CONTENT_CACHE_DIR_ENV_VAR, None)
+
+    results = {
+        'format_version': RESULTS_FORMAT_VERSION,
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'jobs': args.jobs,
+        'repeat': args.repeat,
+        'runs': [],
+    }
+    print(f"{'messages':>8} {'interfaces':>10} {'stage':<38} {'time [s]':>9} "
+          f"{'per interface [ms]':>19}")
+    for message_count in args.messages:
+        run = benchmark_corpus(
+            message_count, package_count=args.packages, max_depth=args.max_depth,
+            seed=args.seed, repeat=args.repeat, jobs=args.jobs)
+        results['runs'].append(run)
+        interface_count = sum(
+            run['corpus'][kind] for kind in ('messages', 'services', 'actions'))
+        for stage, result in run['stages'].items():
+            print(f'{message_count:>8} {interface_count:>10} {stage:<38} '
+                  f"{result['seconds']:>9.3f} {result['ms_per_interface']:>19.2f}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as h:
+            json.dump(results, h, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as h:
+            baseline = json.load(h)
+        lines, regressed = compare_results(results, baseline, args.threshold)
+        print()
+        print(f"{'messages':>8} {'stage':<38} {'baseline':>9} {'time [s]':>9} {'ratio':>7}")
+        print('\n'.join(lines))
+        if regressed:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,229 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Generate a corpus of synthetic interface packages.
+
+The packages contain .msg, .srv and .action files resembling real world
+interfaces: the messages have a varying number of members and constants,
+use arrays and bounded strings, and nest messages of the same and of other
+packages up to a maximum depth.
+The corpus is deterministic for a given seed.
+
+The packages which the services and actions implicitly depend on are
+generated as well, with the same definitions as the ROS 2 packages, so the
+corpus is self-contained.
+"""
+
+import pathlib
+import random
+
+# the interfaces the services and actions implicitly depend on
+SUPPORT_PACKAGES = {
+    'builtin_interfaces': {
+        'msg/Time.msg': 'int32 sec\nuint32 nanosec\n',
+    },
+    'unique_identifier_msgs': {
+        'msg/UUID.msg': 'uint8[16] uuid\n',
+    },
+    'service_msgs': {
+        'msg/ServiceEventInfo.msg':
+            'uint8 REQUEST_SENT = 0\n'
+            'uint8 REQUEST_RECEIVED = 1\n'
+            'uint8 RESPONSE_SENT = 2\n'
+            'uint8 RESPONSE_RECEIVED = 3\n'
+            'uint8 event_type\n'
+            'builtin_interfaces/Time stamp\n'
+            'char[16] client_gid\n'
+            'int64 sequence_number\n',
+    },
+}
+SUPPORT_PACKAGE_DEPENDENCIES = {
+    'builtin_interfaces': [],
+    'unique_identifier_msgs': [],
+    'service_msgs': ['builtin_interfaces'],
+}
+
+# the type of the constants and a function returning a value for them
+_CONSTANT_TYPES = {
+    'int8': lambda rng: str(rng.randint(-128, 127)),
+    'uint16': lambda rng: str(rng.randint(0, 65535)),
+    'int32': lambda rng: str(rng.randint(-2 ** 31, 2 ** 31 - 1)),
+    'uint64': lambda rng: str(rng.randint(0, 2 ** 64 - 1)),
+    'float64': lambda rng: repr(round(rng.uniform(-1e6, 1e6), 3)),
+    'bool': lambda rng: rng.choice(['true', 'false']),
+    'string': lambda rng: f"'value {rng.randint(0, 999)}'",
+}
+_PRIMITIVE_TYPES = (
+    'bool', 'byte', 'char', 'float32', 'float64',
+    'int8', 'uint8', 'int16', 'uint16', 'int32', 'uint32', 'int64', 'uint64',
+    'string', 'wstring',
+)
+
+
+class SyntheticPackage:
+    """A generated interface package."""
+
+    def __init__(self, name, base_path, interface_files, dependencies):
+        """
+        Create a SyntheticPackage.
+
+        :param str name: the name of the package
+        :param base_path: the directory containing the interface files
+        :type base_path: :py:class:`pathlib.Path`
+        :param interface_files: the interface files relative to the base path
+        :param dependencies: the names of the packages the interfaces refer to
+        """
+        self.name = name
+        self.base_path = base_path
+        self.interface_files = interface_files
+        self.dependencies = dependencies
+
+    def get_interface_count(self, suffix):
+        """
+        Get the number of interface files of one kind.
+
+        :param str suffix: the file extension, e.g. ``.msg``
+        :returns: the number of interface files
+        """
+        return sum(1 for f in self.interface_files if f.suffix == suffix)
+
+
+def generate_corpus(
+    output_dir, message_count, *, package_count=None, max_depth=4,
+    max_member_count=24, seed=0
+):
+    """
+    Generate a corpus of synthetic interface packages.
+
+    Additional to the messages every package contains one service per ten
+    and one action per twenty messages.
+
+    :param output_dir: the directory to create the packages in
+    :type output_dir: :py:class:`pathlib.Path`
+    :param int message_count: the number of messages in all packages
+    :param int package_count: the number of packages, defaults to one per
+      hundred messages
+    :param int max_depth: the maximum nesting depth of the messages
+    :param int max_member_count: the maximum number of members per message
+    :param int seed: the seed of the random generator
+    :returns: the list of :class:`SyntheticPackage` ordered so that each
+      package comes after the packages it depends on
+    """
+    assert message_count > 0
+    if package_count is None:
+        package_count = max(1, message_count // 100)
+    package_count = min(package_count, message_count)
+    rng = random.Random(seed)
+
+    packages = []
+    for name, interfaces in SUPPORT_PACKAGES.items():
+        packages.append(_write_package(
+            output_dir, name, interfaces, SUPPORT_PACKAGE_DEPENDENCIES[name]))
+
+    # the depth of the messages which can be nested by type name
+    nestable_messages = {'builtin_interfaces/Time': 1}
+    for package_index in range(package_count):
+        name = f'benchmark_msgs_{package_index}'
+        # refer to up to two of the previously generated packages
+        dependency_names = sorted(rng.sample(
+            [f'benchmark_msgs_{i}' for i in range(package_index)],
+            min(2, package_index)))
+        referable_messages = {
+            type_name: depth for type_name, depth in nestable_messages.items()
+            if type_name.split('/')[0] in dependency_names or
+            type_name.startswith('builtin_interfaces/')}
+
+        # distribute the messages evenly over the packages
+        own_message_count = message_count // package_count + (
+            1 if package_index < message_count % package_count else 0)
+        interfaces = {}
+        for message_index in range(own_message_count):
+            message_name = f'Message{message_index}'
+            content, depth = _get_message_content(
+                rng, referable_messages, name, max_depth, max_member_count,
+                constant_count=rng.choice((0, 0, 0, 1, 2, 5)))
+            interfaces[f'msg/{message_name}.msg'] = content
+            referable_messages[f'{name}/{message_name}'] = depth
+            nestable_messages[f'{name}/{message_name}'] = depth
+
+        for service_index in range(max(1, own_message_count // 10)):
+            parts = [
+                _get_message_content(
+                    rng, referable_messages, name, max_depth, max_member_count // 2)[0]
+                for _ in range(2)]
+            interfaces[f'srv/Service{service_index}.srv'] = '---\n'.join(parts)
+
+        for action_index in range(max(1, own_message_count // 20)):
+            parts = [
+                _get_message_content(
+                    rng, referable_messages, name, max_depth, max_member_count // 2)[0]
+                for _ in range(3)]
+            interfaces[f'action/Action{action_index}.action'] = '---\n'.join(parts)
+
+        dependencies = sorted(
+            dependency_names + ['builtin_interfaces', 'service_msgs', 'unique_identifier_msgs'])
+        packages.append(_write_package(output_dir, name, interfaces, dependencies))
+    return packages
+
+
+def _get_message_content(
+    rng, referable_messages, package_name, max_depth, max_member_count, constant_count=0
+):
+    # the messages which can be nested without exceeding the maximum depth
+    nestable = [
+        type_name for type_name, depth in referable_messages.items() if depth < max_depth]
+    lines = []
+    for i in range(constant_count):
+        type_, get_value = rng.choice(list(_CONSTANT_TYPES.items()))
+        lines.append(f'{type_} CONSTANT_{i} = {get_value(rng)}')
+
+    depth = 1
+    for i in range(rng.randint(1, max(1, max_member_count))):
+        kind = rng.random()
+        if nestable and kind < 0.25:
+            type_name = rng.choice(nestable)
+            depth = max(depth, referable_messages[type_name] + 1)
+            if type_name.startswith(package_name + '/'):
+                type_name = type_name.split('/')[1]
+            type_ = type_name
+        elif kind < 0.35:
+            type_ = f'string<={rng.choice((8, 32, 256))}'
+        else:
+            type_ = rng.choice(_PRIMITIVE_TYPES)
+
+        array = rng.random()
+        if array < 0.1:
+            type_ += f'[{rng.randint(1, 16)}]'
+        elif array < 0.2:
+            type_ += f'[<={rng.randint(1, 64)}]'
+        elif array < 0.3:
+            type_ += '[]'
+
+        default_value = ''
+        if '[' not in type_ and type_ in _CONSTANT_TYPES and rng.random() < 0.1:
+            default_value = ' ' + _CONSTANT_TYPES[type_](rng)
+        lines.append(f'{type_} member_{i}{default_value}')
+    return '\n'.join(lines) + '\n', depth
+
+
+def _write_package(output_dir, name, interfaces, dependencies):
+    base_path = pathlib.Path(output_dir) / name
+    interface_files = []
+    for relative_path, content in interfaces.items():
+        path = base_path / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+        interface_files.append(pathlib.Path(relative_path))
+    return SyntheticPackage(name, base_path, interface_files, dependencies)
@@ -44,6 +44,8 @@ foreach(_abs_idl_file ${rosidl_generate_interfaces_ABS_IDL_FILES})
   list(APPEND _generated_files "${_json_file}")
   list(APPEND _generated_tuples "${_parent_folder}/${_idl_name}:${_json_file}")
 endforeach()
+# The aggregated index of all type descriptions, preferred by dependent packages
+set(_index_file "${_output_path}/type_description_index.json")
 
 # Find dependency packages' generated files
 set(_dependency_files "")
@@ -70,28 +72,40 @@ foreach(dep ${target_dependencies})
 endforeach()
 
 set(_generator_arguments_file "${CMAKE_CURRENT_BINARY_DIR}/rosidl_generator_type_description__arguments.json")
+set(_generator_depfile "${CMAKE_CURRENT_BINARY_DIR}/rosidl_generator_type_description.d")
 rosidl_write_generator_arguments(
   "${_generator_arguments_file}"
   PACKAGE_NAME "${PROJECT_NAME}"
   IDL_TUPLES "${rosidl_generate_interfaces_IDL_TUPLES}"
   OUTPUT_DIR "${_output_path}"
   INCLUDE_PATHS "${_dependency_paths}"
+  JOBS "${ROSIDL_GENERATOR_JOBS}"
+  DEPFILE "${_generator_depfile}"
 )
 
+# The dependency file lists the type descriptions of other packages which have
+# been read, so changing them triggers generating the hashes again
+rosidl_generator_supports_depfile(_supports_depfile)
+set(_depfile_arguments "")
+if(_supports_depfile)
+  set(_depfile_arguments DEPFILE "${_generator_depfile}")
+endif()
+
 # Create custom command and target to generate the hash output
 add_custom_command(
   COMMAND Python3::Interpreter
   ARGS
   ${rosidl_generator_type_description_BIN}
   --generator-arguments-file "${_generator_arguments_file}"
-  OUTPUT ${_generated_files}
+  OUTPUT ${_generated_files} ${_index_file}
   DEPENDS ${target_dependencies}
+  ${_depfile_arguments}
   COMMENT "Generating type hashes for ROS interfaces"
   VERBATIM
 )
 
 set(_target "${rosidl_generate_interfaces_TARGET}__rosidl_generator_type_description")
-add_custom_target(${_target} DEPENDS ${_generated_files})
+add_custom_target(${_target} DEPENDS ${_generated_files} ${_index_file})
 
 # Make top level generation target depend on this generated library
 add_dependencies(${rosidl_generate_interfaces_TARGET} ${_target})
@@ -104,4 +118,7 @@ if(NOT rosidl_generate_interfaces_SKIP_INSTALL)
       FILES ${_generated_file}
       DESTINATION "share/${PROJECT_NAME}/${_parent_folder}")
   endforeach()
+  install(
+    FILES ${_index_file}
+    DESTINATION "share/${PROJECT_NAME}")
 endif()
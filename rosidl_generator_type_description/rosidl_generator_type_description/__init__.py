@@ -12,16 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from copy import deepcopy
 import hashlib
 import json
+from json.encoder import encode_basestring_ascii
 from pathlib import Path
 import re
 import sys
-from typing import List, Tuple
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 
 from rosidl_parser import definition
-from rosidl_parser.parser import parse_idl_file
+from rosidl_parser import profiling
+from rosidl_parser.files import write_depfile
+from rosidl_parser.parser import IdlParseError
+from rosidl_parser.parser import parse_idl_files
 
 # RIHS: ROS Interface Hashing Standard, per REP-2011
 # NOTE: These values and implementations must be updated if
@@ -38,6 +41,11 @@ GET_HASH_FUNC = 'get_type_hash'
 GET_INDIVIDUAL_SOURCE_FUNC = 'get_individual_type_description_source'
 GET_SOURCES_FUNC = 'get_type_description_sources'
 
+# The aggregated index of all type descriptions and hashes of a package,
+# generated next to the individual .json files
+TYPE_DESCRIPTION_INDEX_FILENAME = 'type_description_index.json'
+TYPE_DESCRIPTION_INDEX_FORMAT_VERSION = 1
+
 
 def to_type_name(namespaced_type):
     return '/'.join(namespaced_type.namespaced_name())
@@ -88,9 +96,14 @@ def add_action(action, to_dict):
     add_msg(action.feedback_message, to_dict)
 
 
-def generate_type_hash(generator_arguments_file: str) -> List[str]:
-    with open(generator_arguments_file, 'r') as f:
-        args = json.load(f)
+def generate_type_hash(
+    generator_arguments_file: str, jobs: Optional[int] = None
+) -> List[str]:
+    with profiling.phase('read_generator_arguments', generator_arguments_file):
+        with open(generator_arguments_file, 'r') as f:
+            args = json.load(f)
+    if jobs is None:
+        jobs = int(args.get('jobs', 1))
     package_name = args['package_name']
     output_dir = Path(args['output_dir'])
     idl_tuples = args['idl_tuples']
@@ -108,18 +121,20 @@ def generate_type_hash(generator_arguments_file: str) -> List[str]:
 
     # Define all local IndividualTypeDescriptions
     individual_types = {}
+    locators = []
     for idl_tuple in idl_tuples:
         idl_parts = idl_tuple.rsplit(':', 1)
         assert len(idl_parts) == 2
-        locator = definition.IdlLocator(*idl_parts)
-        try:
-            idl_file = parse_idl_file(locator)
-        except Exception as e:
+        locators.append(definition.IdlLocator(*idl_parts))
+    with profiling.phase('parse_idl_files'):
+        idl_files = parse_idl_files(locators, jobs=jobs)
+    for idl_file in idl_files:
+        if isinstance(idl_file, IdlParseError):
             print('Error processing idl file: ' +
-                  str(locator.get_absolute_path()), file=sys.stderr)
-            raise e
+                  str(idl_file.locator.get_absolute_path()), file=sys.stderr)
+            raise idl_file
 
-        idl_rel_path = Path(idl_parts[1])
+        idl_rel_path = idl_file.locator.relative_path
         generate_to_dir = (output_dir / idl_rel_path).parent
         generate_to_dir.mkdir(parents=True, exist_ok=True)
         for el in idl_file.content.elements:
@@ -153,14 +168,28 @@ def generate_type_hash(generator_arguments_file: str) -> List[str]:
         for key, val in individual_types.items()
     }
     hash_lookup = {}
+    loaded_indices = {}
+    include_files = set()
     while pending_includes:
         process_include = pending_includes.pop()
         p_path = process_include.with_suffix('.json')
         pkg = p_path.parts[0]
         pkg_dir = include_map[pkg]
+
+        # Prefer the aggregated index of the package over the individual file
+        index = _get_type_description_index(pkg_dir, loaded_indices)
+        type_name = '/'.join(process_include.parts)
+        if index is not None and type_name in index['references']:
+            for name in [type_name] + index['references'][type_name]:
+                serialized_type_lookup[name] = index['type_descriptions'][name]
+                hash_lookup[name] = index['type_hashes'][name]
+            continue
+
         include_path = pkg_dir / p_path.relative_to(pkg)
-        with include_path.open('r') as include_file:
-            include_json = json.load(include_file)
+        include_files.add(include_path)
+        with profiling.phase('load_type_description', include_path):
+            with include_path.open('r') as include_file:
+                include_json = json.load(include_file)
 
         type_description_msg = include_json['type_description_msg']
         try:
@@ -177,10 +206,14 @@ def generate_type_hash(generator_arguments_file: str) -> List[str]:
 
     # Create fully-unrolled TypeDescription instances for local full types, and calculate hashes
     full_types = []
-    for type_name, individual_type in individual_types.items():
-        full_type_description = extract_full_type_description(type_name, serialized_type_lookup)
-        full_types.append(full_type_description)
-        hash_lookup[type_name] = calculate_type_hash(full_type_description)
+    encoded_type_cache = {}
+    reference_index = TypeReferenceIndex(serialized_type_lookup)
+    with profiling.phase('calculate_type_hashes'):
+        for type_name, individual_type in individual_types.items():
+            full_type_description = reference_index.extract_full_type_description(type_name)
+            full_types.append(full_type_description)
+            hash_lookup[type_name] = calculate_type_hash(
+                full_type_description, encoded_type_cache=encoded_type_cache)
 
     # Write JSON output for each full TypeDescription
     generated_files = []
@@ -201,13 +234,75 @@ def generate_type_hash(generator_arguments_file: str) -> List[str]:
         }
         rel_path = Path(*top_type_name.split('/')[1:])
         json_path = output_dir / rel_path.with_suffix('.json')
-        with json_path.open('w', encoding='utf-8') as json_file:
-            json_file.write(json.dumps(json_content, indent=2))
+        with profiling.phase('write_type_description', json_path):
+            with json_path.open('w', encoding='utf-8') as json_file:
+                json_file.write(json.dumps(json_content, indent=2))
         generated_files.append(json_path)
 
+    # Write the aggregated index of all full TypeDescriptions of the package
+    index_path = output_dir / TYPE_DESCRIPTION_INDEX_FILENAME
+    index_content = {
+        'format_version': TYPE_DESCRIPTION_INDEX_FORMAT_VERSION,
+        'type_descriptions': {},
+        'type_hashes': {},
+        'references': {},
+    }
+    for full_type_description in full_types:
+        top_type_name = full_type_description['type_description']['type_name']
+        index_content['references'][top_type_name] = [
+            referenced_type['type_name']
+            for referenced_type in full_type_description['referenced_type_descriptions']
+        ]
+        for individual_type in [full_type_description['type_description']] + \
+                full_type_description['referenced_type_descriptions']:
+            index_content['type_descriptions'][individual_type['type_name']] = individual_type
+            index_content['type_hashes'][individual_type['type_name']] = \
+                hash_lookup[individual_type['type_name']]
+    with profiling.phase('write_type_description', index_path):
+        with index_path.open('w', encoding='utf-8') as index_file:
+            index_file.write(json.dumps(index_content, separators=(',', ':')))
+    generated_files.append(index_path)
+
+    if args.get('depfile'):
+        # the type descriptions of other packages which have actually been read
+        for pkg_dir in loaded_indices.keys():
+            include_index_path = pkg_dir / TYPE_DESCRIPTION_INDEX_FILENAME
+            if include_index_path.exists():
+                include_files.add(include_index_path)
+        dependencies = [str(locator.get_absolute_path()) for locator in locators]
+        dependencies += sorted(str(include_file.absolute()) for include_file in include_files)
+        write_depfile(Path(args['depfile']), [(generated_files, dependencies)])
+
     return generated_files
 
 
+def _get_type_description_index(pkg_dir: Path, loaded_indices: dict) -> Optional[dict]:
+    """
+    Get the aggregated type description index of a package, loading it on first use.
+
+    :param pkg_dir: the directory containing the type descriptions of the package
+    :param loaded_indices: the already loaded indices by directory
+    :returns: the index, or None if the package doesn't provide a usable index
+    """
+    if pkg_dir not in loaded_indices:
+        index = None
+        index_path = pkg_dir / TYPE_DESCRIPTION_INDEX_FILENAME
+        try:
+            with profiling.phase('load_type_description', index_path), \
+                    index_path.open('r', encoding='utf-8') as index_file:
+                index = json.load(index_file)
+        except FileNotFoundError:
+            pass
+        except ValueError as e:
+            print(f"Ignoring invalid type description index '{index_path}': {e}",
+                  file=sys.stderr)
+        if index is not None and \
+                index.get('format_version') != TYPE_DESCRIPTION_INDEX_FORMAT_VERSION:
+            index = None
+        loaded_indices[pkg_dir] = index
+    return loaded_indices[pkg_dir]
+
+
 def parse_rihs_string(rihs_str: str) -> Tuple[int, str]:
     """Parse RIHS string, return (version, value) tuple."""
     match = RIHS01_PATTERN.match(rihs_str)
@@ -464,65 +559,177 @@ def serialize_individual_type_description(
     }
 
 
-def calculate_type_hash(serialized_type_description):
-    # Create a copy of the description, removing all default values
-    hashable_dict = deepcopy(serialized_type_description)
-    for field in hashable_dict['type_description']['fields']:
-        del field['default_value']
-    for referenced_td in hashable_dict['referenced_type_descriptions']:
-        for field in referenced_td['fields']:
-            del field['default_value']
-
-    hashable_repr = json.dumps(
-        hashable_dict,
-        skipkeys=False,
-        ensure_ascii=True,
-        check_circular=True,
-        allow_nan=False,
-        indent=None,
-        # note: libyaml in C doesn't allow for tweaking these separators, this is its builtin
-        separators=(', ', ': '),
-        sort_keys=False
-    )
+def calculate_type_hash(serialized_type_description, encoded_type_cache=None):
+    """
+    Calculate the RIHS01 hash of a full type description.
+
+    The canonical representation of the description without the default values is encoded
+    incrementally rather than serializing a modified copy, the result is identical to
+    json.dumps(..., ensure_ascii=True, separators=(', ', ': ')).
+
+    :param serialized_type_description: the full type description, it isn't modified
+    :param encoded_type_cache: an optional dict to reuse the encoded individual type
+      descriptions by type name, it must only be shared between full type descriptions
+      built from the same individual type descriptions
+    :returns: the type hash string
+    """
+    # note: libyaml in C doesn't allow for tweaking these separators, this is its builtin
     sha = hashlib.sha256()
-    sha.update(hashable_repr.encode('utf-8'))
+    for chunk in _iter_hashable_chunks(serialized_type_description, encoded_type_cache):
+        sha.update(chunk.encode('ascii'))
     type_hash = RIHS01_PREFIX + sha.hexdigest()
     return type_hash
 
 
-def extract_full_type_description(output_type_name, type_map):
-    # Traverse reference graph to narrow down the references for the output type
-    output_type = type_map[output_type_name]
-    output_references = set()
-    process_queue = [
-        field['type']['nested_type_name']
-        for field in output_type['fields']
-        if field['type']['nested_type_name']
-    ]
-    while process_queue:
-        process_type = process_queue.pop()
-        if process_type not in output_references:
-            output_references.add(process_type)
-            process_queue.extend([
-                field['type']['nested_type_name']
-                for field in type_map[process_type]['fields']
-                if field['type']['nested_type_name']
-            ])
+def _iter_hashable_chunks(serialized_type_description, encoded_type_cache):
+    yield '{'
+    for i, (key, value) in enumerate(serialized_type_description.items()):
+        if i:
+            yield ', '
+        yield encode_basestring_ascii(key) + ': '
+        if key == 'type_description':
+            yield _encode_hashable_individual_type_description(value, encoded_type_cache)
+        elif key == 'referenced_type_descriptions':
+            yield '['
+            for j, referenced_td in enumerate(value):
+                if j:
+                    yield ', '
+                yield _encode_hashable_individual_type_description(
+                    referenced_td, encoded_type_cache)
+            yield ']'
+        else:
+            yield _encode_json(value)
+    yield '}'
+
+
+def _encode_hashable_individual_type_description(individual_type_description, encoded_type_cache):
+    if encoded_type_cache is not None:
+        type_name = individual_type_description['type_name']
+        encoded = encoded_type_cache.get(type_name)
+        if encoded is None:
+            encoded = _encode_hashable_individual_type_description(
+                individual_type_description, None)
+            encoded_type_cache[type_name] = encoded
+        return encoded
+
+    parts = []
+    for key, value in individual_type_description.items():
+        if key == 'fields':
+            encoded_value = '[' + ', '.join(
+                _encode_json(field, excluded_key='default_value') for field in value) + ']'
+        else:
+            encoded_value = _encode_json(value)
+        parts.append(encode_basestring_ascii(key) + ': ' + encoded_value)
+    return '{' + ', '.join(parts) + '}'
+
+
+def _encode_json(value, excluded_key=None):
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+    if value is None:
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if isinstance(value, int):
+        return int.__repr__(value)
+    if isinstance(value, dict):
+        return '{' + ', '.join(
+            encode_basestring_ascii(key) + ': ' + _encode_json(val)
+            for key, val in value.items() if key != excluded_key) + '}'
+    if isinstance(value, (list, tuple)):
+        return '[' + ', '.join(_encode_json(val) for val in value) + ']'
+    # only floats remain, defer to the json module for their representation
+    return json.dumps(value, allow_nan=False)
+
+
+class TypeReferenceIndex:
+    """
+    Index of the references between individual type descriptions.
 
-    return {
-        'type_description': output_type,
-        'referenced_type_descriptions': [
-            type_map[type_name] for type_name in sorted(output_references)
-        ],
-    }
+    The transitive closure of the referenced types is memoized per type, so that types
+    sharing most of their references, e.g. the parts of services and actions, reuse them.
+    """
+
+    def __init__(self, type_map: dict):
+        self.type_map = type_map
+        self._references: Dict[str, FrozenSet[str]] = {}
+        self._pending: Set[str] = set()
+
+    @classmethod
+    def from_type_description_msg(cls, type_description_msg: dict) -> 'TypeReferenceIndex':
+        toplevel_type = type_description_msg['type_description']
+        referenced_types = type_description_msg['referenced_type_descriptions']
+        return cls({
+            individual_type['type_name']: individual_type
+            for individual_type
+            in [toplevel_type] + referenced_types
+        })
+
+    def get_direct_references(self, type_name: str) -> List[str]:
+        return [
+            field['type']['nested_type_name']
+            for field in self.type_map[type_name]['fields']
+            if field['type']['nested_type_name']
+        ]
+
+    def get_references(self, type_name: str) -> FrozenSet[str]:
+        references = self._references.get(type_name)
+        if references is not None:
+            return references
+        if type_name in self._pending:
+            # a reference cycle, the types on it aren't memoized
+            return self._traverse_references(type_name)
+
+        self._pending.add(type_name)
+        try:
+            all_references = set()
+            for referenced_type in self.get_direct_references(type_name):
+                if referenced_type not in all_references:
+                    all_references.add(referenced_type)
+                    all_references.update(self.get_references(referenced_type))
+        finally:
+            self._pending.remove(type_name)
+        references = frozenset(all_references)
+        self._references[type_name] = references
+        return references
+
+    def _traverse_references(self, type_name: str) -> FrozenSet[str]:
+        references: Set[str] = set()
+        process_queue = self.get_direct_references(type_name)
+        while process_queue:
+            process_type = process_queue.pop()
+            if process_type not in references:
+                references.add(process_type)
+                process_queue.extend(self.get_direct_references(process_type))
+        return frozenset(references)
+
+    def extract_full_type_description(self, output_type_name: str) -> dict:
+        return {
+            'type_description': self.type_map[output_type_name],
+            'referenced_type_descriptions': [
+                self.type_map[type_name]
+                for type_name in sorted(self.get_references(output_type_name))
+            ],
+        }
 
 
-def extract_subinterface(type_description_msg: dict, field_name: str):
+def extract_full_type_description(output_type_name, type_map, reference_index=None):
+    # Traverse reference graph to narrow down the references for the output type
+    if reference_index is None:
+        reference_index = TypeReferenceIndex(type_map)
+    return reference_index.extract_full_type_description(output_type_name)
+
+
+def extract_subinterface(type_description_msg: dict, field_name: str, reference_index=None):
     """
     Filter full TypeDescription to produce a TypeDescription for one of its fields' types.
 
     Given the name of a field, finds its type, and finds all its referenced type descriptions
     by doing a DAG traversal on the referenced type descriptions of the input type.
+    A reference index covering the referenced type descriptions can be passed to reuse the
+    traversals across multiple calls.
     """
     output_type_name = next(
         field['type']['nested_type_name']
@@ -530,12 +737,7 @@ def extract_subinterface(type_description_msg: dict, field_name: str):
         if field['name'] == field_name)
     assert output_type_name, 'Given field is not a nested type'
 
-    # Create a lookup map for matching names to type descriptions
-    toplevel_type = type_description_msg['type_description']
-    referenced_types = type_description_msg['referenced_type_descriptions']
-    type_map = {
-        individual_type['type_name']: individual_type
-        for individual_type
-        in [toplevel_type] + referenced_types
-    }
-    return extract_full_type_description(output_type_name, type_map)
+    if reference_index is None:
+        # Create a lookup map for matching names to type descriptions
+        reference_index = TypeReferenceIndex.from_type_description_msg(type_description_msg)
+    return reference_index.extract_full_type_description(output_type_name)
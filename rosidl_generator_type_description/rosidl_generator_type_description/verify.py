@@ -0,0 +1,290 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Verify the type hashes of installed type descriptions and generated code.
+
+The hashes stored in the type description .json files (including the aggregated
+index files) and embedded in generated __description.c files are compared to the
+hashes calculated from the type descriptions with the current implementation.
+Hashes of types without a type description in the searched paths, e.g. when only
+searching the output directory of a single generator, can't be verified and are
+reported separately without failing the verification.
+
+Usage: python3 -m rosidl_generator_type_description.verify <path> [<path> ...]
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import re
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from rosidl_generator_type_description import calculate_type_hash
+from rosidl_generator_type_description import TYPE_DESCRIPTION_INDEX_FILENAME
+from rosidl_generator_type_description import TypeReferenceIndex
+
+DESCRIPTION_C_FILE_SUFFIX = '__description.c'
+
+# Matches the rosidl_type_hash_t definitions generated by type_hash_to_c_definition()
+C_TYPE_HASH_PATTERN = re.compile(
+    r'(?:(\w+)__get_type_hash\([^)]*\)\s*\{\s*\(void\)\s*type_support;\s*'
+    r'static rosidl_type_hash_t hash|'
+    r'static const rosidl_type_hash_t (\w+)__EXPECTED_HASH)'
+    r'\s*=\s*\{\s*(\d+),\s*\{([^}]*)\}\s*\}')
+
+
+def find_files(paths: List[str]) -> List[str]:
+    """
+    Find the type description and generated description files.
+
+    :param paths: the files or directories to search recursively, e.g. install prefixes
+    :returns: the sorted list of found files
+    """
+    files = set()
+    for path in paths:
+        if os.path.isfile(path):
+            files.add(os.path.abspath(path))
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in filenames:
+                if filename.endswith('.json') or filename.endswith(DESCRIPTION_C_FILE_SUFFIX):
+                    files.add(os.path.abspath(os.path.join(dirpath, filename)))
+    return sorted(files)
+
+
+def process_file(path: str) -> Optional[dict]:
+    """
+    Calculate and extract the type hashes of a single file.
+
+    :param path: the path of a type description .json file, an index file or a
+      __description.c file
+    :returns: a dict with the ``calculated`` hashes by type name, the ``stored`` list of
+      type names and hashes found in the file and an ``error`` message if the file couldn't
+      be processed, or None if the file doesn't contain any type hashes
+    """
+    try:
+        if path.endswith(DESCRIPTION_C_FILE_SUFFIX):
+            with open(path, 'r', encoding='utf-8') as h:
+                return {'calculated': {}, 'stored': _extract_c_type_hashes(h.read())}
+
+        with open(path, 'r', encoding='utf-8') as h:
+            content = json.load(h)
+        if not isinstance(content, dict):
+            return None
+        if os.path.basename(path) == TYPE_DESCRIPTION_INDEX_FILENAME:
+            return _process_type_description_index(content)
+        if 'type_description_msg' not in content or 'type_hashes' not in content:
+            return None
+        return _process_type_description(content)
+    except Exception as e:
+        return {'calculated': {}, 'stored': [], 'error': f'{type(e).__name__}: {e}'}
+
+
+def _process_type_description(content: dict) -> dict:
+    type_description_msg = content['type_description_msg']
+    top_type_name = type_description_msg['type_description']['type_name']
+    calculated = {top_type_name: calculate_type_hash(type_description_msg)}
+    # the hashes of the referenced types are calculated from the included descriptions
+    reference_index = TypeReferenceIndex.from_type_description_msg(type_description_msg)
+    encoded_type_cache: Dict[str, str] = {}
+    for type_hash in content['type_hashes']:
+        type_name = type_hash['type_name']
+        if type_name not in calculated:
+            calculated[type_name] = calculate_type_hash(
+                reference_index.extract_full_type_description(type_name),
+                encoded_type_cache=encoded_type_cache)
+    stored = [
+        (type_hash['type_name'], type_hash['hash_string'])
+        for type_hash in content['type_hashes']]
+    return {'calculated': calculated, 'stored': stored}
+
+
+def _process_type_description_index(content: dict) -> dict:
+    type_descriptions = content['type_descriptions']
+    encoded_type_cache: Dict[str, str] = {}
+    calculated = {}
+    for type_name, references in content['references'].items():
+        full_type_description = {
+            'type_description': type_descriptions[type_name],
+            'referenced_type_descriptions': [type_descriptions[name] for name in references],
+        }
+        calculated[type_name] = calculate_type_hash(
+            full_type_description, encoded_type_cache=encoded_type_cache)
+    stored = [
+        (type_name, content['type_hashes'][type_name])
+        for type_name in content['references'].keys()]
+    return {'calculated': calculated, 'stored': stored}
+
+
+def _extract_c_type_hashes(source: str) -> List[Tuple[str, str]]:
+    stored = []
+    for match in C_TYPE_HASH_PATTERN.finditer(source):
+        c_type_name = match.group(1) or match.group(2)
+        version = int(match.group(3))
+        value = ''.join(
+            byte.strip()[2:] for byte in match.group(4).split(',') if byte.strip())
+        stored.append((c_type_name.replace('__', '/'), f'RIHS{version:02d}_{value}'))
+    return stored
+
+
+def _get_file_stamp(path: str) -> List[int]:
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _read_checkpoint(checkpoint_file: str) -> Dict[str, dict]:
+    entries = {}
+    try:
+        with open(checkpoint_file, 'r', encoding='utf-8') as h:
+            for line in h:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # e.g. the last line of an interrupted run
+                    continue
+                entries[entry['path']] = entry
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def verify_type_hashes(
+    paths: List[str], *, jobs: Optional[int] = None, checkpoint_file: Optional[str] = None
+) -> Tuple[
+    int, List[Tuple[str, str, str, str]], List[Tuple[str, str, str]], List[Tuple[str, str]]
+]:
+    """
+    Verify the type hashes stored in all files found in the given paths.
+
+    The hashes embedded in __description.c files are compared to the hashes calculated
+    from the type description .json files which are found in the same paths.
+
+    :param paths: the files or directories to search recursively, e.g. install prefixes
+    :param jobs: the number of processes to use, defaults to the number of CPUs
+    :param checkpoint_file: an optional file recording the results of processed files,
+      unchanged files recorded by a previous, possibly interrupted, run are skipped
+    :returns: a tuple of the number of verified hashes, the list of mismatches as tuples
+      of path, type name, stored hash and calculated hash, the list of unverifiable hashes
+      as tuples of path, type name and stored hash, whose type has no description in the
+      searched paths, and the list of files which couldn't be processed with the error
+    """
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs < 1:
+        raise ValueError(f"The number of jobs must be at least 1, got '{jobs}'")
+
+    files = find_files(paths)
+    results: Dict[str, Optional[dict]] = {}
+    pending_files = []
+    checkpoint_entries = _read_checkpoint(checkpoint_file) if checkpoint_file else {}
+    for path in files:
+        entry = checkpoint_entries.get(path)
+        if entry is not None and entry['stamp'] == _get_file_stamp(path):
+            results[path] = entry['result']
+        else:
+            pending_files.append(path)
+
+    checkpoint = open(checkpoint_file, 'a', encoding='utf-8') if checkpoint_file else None
+    try:
+        if jobs == 1 or len(pending_files) <= 1:
+            pending_results = map(process_file, pending_files)
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(max_workers=min(jobs, len(pending_files)))
+            pending_results = executor.map(
+                process_file, pending_files,
+                chunksize=max(1, len(pending_files) // (4 * jobs)))
+        try:
+            for path, result in zip(pending_files, pending_results):
+                results[path] = result
+                if checkpoint:
+                    checkpoint.write(json.dumps({
+                        'path': path, 'stamp': _get_file_stamp(path), 'result': result,
+                    }) + '\n')
+                    checkpoint.flush()
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+    finally:
+        if checkpoint:
+            checkpoint.close()
+
+    # the hashes calculated from the type descriptions are the reference for other files
+    calculated_hashes = {}
+    for result in results.values():
+        if result:
+            calculated_hashes.update(result['calculated'])
+
+    verified_count = 0
+    mismatches = []
+    unverifiable = []
+    errors = []
+    for path in files:
+        result = results[path]
+        if not result:
+            continue
+        if 'error' in result:
+            errors.append((path, result['error']))
+            continue
+        for type_name, stored_hash in result['stored']:
+            calculated_hash = result['calculated'].get(
+                type_name, calculated_hashes.get(type_name))
+            if calculated_hash is None:
+                unverifiable.append((path, type_name, stored_hash))
+            elif calculated_hash != stored_hash:
+                mismatches.append((path, type_name, stored_hash, calculated_hash))
+            else:
+                verified_count += 1
+    return verified_count, mismatches, unverifiable, errors
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(
+        description='Verify the type hashes of type descriptions and generated code.',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        'paths', nargs='+',
+        help='The files or directories to search, e.g. install prefixes or build '
+             'directories containing generated __description.c files')
+    parser.add_argument(
+        '--jobs', type=int,
+        help='The number of processes to use, defaults to the number of CPUs')
+    parser.add_argument(
+        '--checkpoint',
+        help='A file recording the progress, unchanged files recorded by a '
+             'previous run are skipped')
+    args = parser.parse_args(argv)
+
+    verified_count, mismatches, unverifiable, errors = verify_type_hashes(
+        args.paths, jobs=args.jobs, checkpoint_file=args.checkpoint)
+    for path, error in errors:
+        print(f"Failed to process '{path}': {error}", file=sys.stderr)
+    for path, type_name, stored_hash in unverifiable:
+        print(f"'{path}': unverifiable, no type description found for '{type_name}'")
+    for path, type_name, stored_hash, calculated_hash in mismatches:
+        print(f"'{path}': hash mismatch for '{type_name}', stored {stored_hash}, "
+              f'calculated {calculated_hash}')
+    print(f'Verified {verified_count} type hashes, '
+          f'{len(mismatches)} mismatches, {len(unverifiable)} unverifiable '
+          f'(no type description found), {len(errors)} errors')
+    # hashes which can't be verified aren't known to be wrong
+    return 1 if mismatches or errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
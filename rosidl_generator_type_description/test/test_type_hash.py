@@ -0,0 +1,227 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import shutil
+
+from rosidl_generator_type_description import calculate_type_hash
+from rosidl_generator_type_description import generate_type_hash
+from rosidl_generator_type_description import TYPE_DESCRIPTION_INDEX_FILENAME
+
+IDL_FILES = {
+    'msg/Inner.idl': """
+module test_pkg {
+  module msg {
+    struct Inner {
+      @default (value=1.5)
+      double value;
+      string<12> label;
+    };
+  };
+};
+""",
+    'msg/Middle.idl': """
+#include "test_pkg/msg/Inner.idl"
+module test_pkg {
+  module msg {
+    struct Middle {
+      test_pkg::msg::Inner inner;
+      sequence<test_pkg::msg::Inner, 3> bounded_inners;
+      @default (value="caf\\u00e9 \\"quoted\\"")
+      string text;
+    };
+  };
+};
+""",
+    'msg/Outer.idl': """
+#include "test_pkg/msg/Inner.idl"
+#include "test_pkg/msg/Middle.idl"
+module test_pkg {
+  module msg {
+    struct Outer {
+      test_pkg::msg::Middle middle[2];
+      sequence<test_pkg::msg::Inner> inners;
+      @default (value="(1, 2, 3)")
+      int32 numbers[3];
+      @default (value=TRUE)
+      boolean flag;
+      wstring<5> wide;
+    };
+  };
+};
+""",
+}
+
+# These hashes were calculated with the original implementation which removed
+# the default values from a deep copy and serialized it with json.dumps()
+# and must never change
+EXPECTED_TYPE_HASHES = {
+    'test_pkg/msg/Inner':
+        'RIHS01_fe533037b8dcd67027c163affb35090e776d9bcf7a410cf34b8dddac49ebcaf7',
+    'test_pkg/msg/Middle':
+        'RIHS01_deeb59c5cdd3fbb0872d37b45f53e709fa98efd4ac9a4bad57604b0ade64cec2',
+    'test_pkg/msg/Outer':
+        'RIHS01_1174a4f0b88288d61c602c1abd42b2f49a8acb38af30770f9b5d185618846817',
+}
+
+
+DOWNSTREAM_IDL_FILES = {
+    'msg/Downstream.idl': """
+#include "test_pkg/msg/Outer.idl"
+module downstream_pkg {
+  module msg {
+    struct Downstream {
+      test_pkg::msg::Outer outer;
+      test_pkg::msg::Inner inner;
+    };
+  };
+};
+""",
+}
+
+
+def _generate_type_descriptions(
+    tmp_path, package_name='test_pkg', idl_files=IDL_FILES, include_paths=(), depfile=None
+):
+    idl_dir = tmp_path / 'idl'
+    output_dir = tmp_path / 'output'
+    idl_tuples = []
+    for rel_path, idl_string in idl_files.items():
+        idl_path = idl_dir / rel_path
+        idl_path.parent.mkdir(parents=True, exist_ok=True)
+        idl_path.write_text(idl_string, encoding='utf-8')
+        idl_tuples.append(f'{idl_dir}:{rel_path}')
+
+    generator_arguments = {
+        'package_name': package_name,
+        'output_dir': str(output_dir),
+        'idl_tuples': idl_tuples,
+        'include_paths': list(include_paths),
+    }
+    if depfile is not None:
+        generator_arguments['depfile'] = str(depfile)
+    generator_arguments_file = tmp_path / 'args.json'
+    generator_arguments_file.write_text(json.dumps(generator_arguments), encoding='utf-8')
+
+    type_descriptions = {}
+    for json_path in generate_type_hash(str(generator_arguments_file)):
+        if json_path.name == TYPE_DESCRIPTION_INDEX_FILENAME:
+            continue
+        with json_path.open('r', encoding='utf-8') as h:
+            json_content = json.load(h)
+        type_name = json_content['type_hashes'][0]['type_name']
+        type_descriptions[type_name] = json_content
+    return type_descriptions
+
+
+def test_type_hashes_unchanged(tmp_path):
+    type_descriptions = _generate_type_descriptions(tmp_path)
+    assert set(type_descriptions.keys()) == set(EXPECTED_TYPE_HASHES.keys())
+    for type_name, json_content in type_descriptions.items():
+        assert json_content['type_hashes'][0]['hash_string'] == \
+            EXPECTED_TYPE_HASHES[type_name]
+        # hashing the loaded description gives the same result
+        assert calculate_type_hash(json_content['type_description_msg']) == \
+            EXPECTED_TYPE_HASHES[type_name]
+        # the hashes of the referenced types are consistent as well
+        for type_hash in json_content['type_hashes'][1:]:
+            assert type_hash['hash_string'] == \
+                EXPECTED_TYPE_HASHES[type_hash['type_name']]
+
+
+def test_type_hash_ignores_default_values(tmp_path):
+    type_description_msg = _generate_type_descriptions(tmp_path)[
+        'test_pkg/msg/Outer']['type_description_msg']
+    serialized = json.dumps(type_description_msg)
+
+    type_hash = calculate_type_hash(type_description_msg)
+    for individual_type in [type_description_msg['type_description']] + \
+            type_description_msg['referenced_type_descriptions']:
+        for field in individual_type['fields']:
+            field['default_value'] = 'other'
+    assert calculate_type_hash(type_description_msg) == type_hash
+
+    # the description is not modified by calculating the hash
+    type_description_msg = json.loads(serialized)
+    calculate_type_hash(type_description_msg)
+    assert json.dumps(type_description_msg) == serialized
+
+
+def test_type_description_index(tmp_path):
+    type_descriptions = _generate_type_descriptions(tmp_path / 'test_pkg')
+    dependency_dir = tmp_path / 'test_pkg' / 'output'
+    with (dependency_dir / TYPE_DESCRIPTION_INDEX_FILENAME).open('r') as h:
+        index = json.load(h)
+    assert index['type_hashes'] == EXPECTED_TYPE_HASHES
+    for type_name, json_content in type_descriptions.items():
+        type_description_msg = json_content['type_description_msg']
+        assert index['type_descriptions'][type_name] == \
+            type_description_msg['type_description']
+        assert index['references'][type_name] == [
+            referenced_type['type_name']
+            for referenced_type in type_description_msg['referenced_type_descriptions']]
+
+    # without the index the individual files of the dependency are used
+    shutil.copytree(dependency_dir, tmp_path / 'without_index')
+    (tmp_path / 'without_index' / TYPE_DESCRIPTION_INDEX_FILENAME).unlink()
+    # with the index the individual files of the dependency aren't needed
+    (tmp_path / 'with_index').mkdir()
+    shutil.copy(
+        dependency_dir / TYPE_DESCRIPTION_INDEX_FILENAME, tmp_path / 'with_index')
+
+    results = []
+    for name in ('without_index', 'with_index'):
+        downstream_type_descriptions = _generate_type_descriptions(
+            tmp_path / f'downstream_{name}', package_name='downstream_pkg',
+            idl_files=DOWNSTREAM_IDL_FILES,
+            include_paths=[f'test_pkg:{tmp_path / name}'])
+        results.append(downstream_type_descriptions['downstream_pkg/msg/Downstream'])
+    assert results[0] == results[1]
+    type_hashes = {
+        type_hash['type_name']: type_hash['hash_string']
+        for type_hash in results[0]['type_hashes']}
+    assert type_hashes.pop('downstream_pkg/msg/Downstream').startswith('RIHS01_')
+    assert type_hashes == EXPECTED_TYPE_HASHES
+
+
+def test_type_description_depfile(tmp_path):
+    _generate_type_descriptions(tmp_path / 'test_pkg')
+    dependency_dir = tmp_path / 'test_pkg' / 'output'
+    shutil.copytree(dependency_dir, tmp_path / 'without_index')
+    (tmp_path / 'without_index' / TYPE_DESCRIPTION_INDEX_FILENAME).unlink()
+
+    # only the type descriptions which have actually been read are listed
+    expected_dependencies = {
+        'with_index': [dependency_dir / TYPE_DESCRIPTION_INDEX_FILENAME],
+        'without_index': [
+            tmp_path / 'without_index' / 'msg' / 'Inner.json',
+            tmp_path / 'without_index' / 'msg' / 'Outer.json',
+        ],
+    }
+    for name, include_dir in (
+        ('with_index', dependency_dir), ('without_index', tmp_path / 'without_index')
+    ):
+        depfile = tmp_path / f'{name}.d'
+        _generate_type_descriptions(
+            tmp_path / f'downstream_{name}', package_name='downstream_pkg',
+            idl_files=DOWNSTREAM_IDL_FILES, include_paths=[f'test_pkg:{include_dir}'],
+            depfile=depfile)
+        output_dir = tmp_path / f'downstream_{name}' / 'output'
+        outputs = [
+            output_dir / 'msg' / 'Downstream.json',
+            output_dir / TYPE_DESCRIPTION_INDEX_FILENAME]
+        dependencies = [tmp_path / f'downstream_{name}' / 'idl' / 'msg' / 'Downstream.idl']
+        dependencies += expected_dependencies[name]
+        assert depfile.read_text() == ' '.join(map(str, outputs)) + ':' + ''.join(
+            f' \\\n  {dependency}' for dependency in dependencies) + '\n'
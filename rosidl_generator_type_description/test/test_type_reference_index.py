@@ -0,0 +1,90 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from rosidl_generator_type_description import extract_full_type_description
+from rosidl_generator_type_description import extract_subinterface
+from rosidl_generator_type_description import TypeReferenceIndex
+
+
+def _individual_type(type_name, *nested_type_names):
+    return {
+        'type_name': type_name,
+        'fields': [
+            {
+                'name': f'field{i}',
+                'type': {
+                    'type_id': 1 if nested_type_name else 2,
+                    'capacity': 0,
+                    'string_capacity': 0,
+                    'nested_type_name': nested_type_name,
+                },
+                'default_value': '',
+            }
+            for i, nested_type_name in enumerate(nested_type_names)
+        ],
+    }
+
+
+TYPE_MAP = {
+    td['type_name']: td for td in [
+        _individual_type('pkg/action/Do', 'pkg/action/Do_SendGoal', 'pkg/action/Do_Goal'),
+        _individual_type(
+            'pkg/action/Do_SendGoal', 'pkg/action/Do_Goal', 'other/msg/Stamp', ''),
+        _individual_type('pkg/action/Do_Goal', 'other/msg/Point', 'other/msg/Stamp'),
+        _individual_type('other/msg/Point', ''),
+        _individual_type('other/msg/Stamp', 'other/msg/Time'),
+        _individual_type('other/msg/Time', '', ''),
+        _individual_type('cycle/msg/A', 'cycle/msg/B'),
+        _individual_type('cycle/msg/B', 'cycle/msg/A', 'other/msg/Time'),
+    ]
+}
+
+
+def test_references():
+    reference_index = TypeReferenceIndex(TYPE_MAP)
+    assert reference_index.get_references('other/msg/Time') == set()
+    assert reference_index.get_references('pkg/action/Do') == {
+        'pkg/action/Do_SendGoal', 'pkg/action/Do_Goal',
+        'other/msg/Point', 'other/msg/Stamp', 'other/msg/Time'}
+    assert reference_index.get_references('pkg/action/Do_Goal') == {
+        'other/msg/Point', 'other/msg/Stamp', 'other/msg/Time'}
+    # a reference cycle results in the same references as a plain traversal
+    assert reference_index.get_references('cycle/msg/A') == {
+        'cycle/msg/A', 'cycle/msg/B', 'other/msg/Time'}
+    assert reference_index.get_references('cycle/msg/B') == {
+        'cycle/msg/A', 'cycle/msg/B', 'other/msg/Time'}
+
+
+def test_extract_full_type_description():
+    full_type_description = extract_full_type_description('pkg/action/Do', TYPE_MAP)
+    assert full_type_description['type_description'] is TYPE_MAP['pkg/action/Do']
+    assert [td['type_name'] for td in full_type_description['referenced_type_descriptions']] == [
+        'other/msg/Point', 'other/msg/Stamp', 'other/msg/Time',
+        'pkg/action/Do_Goal', 'pkg/action/Do_SendGoal']
+
+
+def test_extract_subinterface():
+    type_description_msg = extract_full_type_description('pkg/action/Do', TYPE_MAP)
+    reference_index = TypeReferenceIndex.from_type_description_msg(type_description_msg)
+    for field_name in ('field0', 'field1'):
+        expected = extract_subinterface(type_description_msg, field_name)
+        assert extract_subinterface(
+            type_description_msg, field_name, reference_index) == expected
+    send_goal = extract_subinterface(type_description_msg, 'field0', reference_index)
+    assert send_goal['type_description']['type_name'] == 'pkg/action/Do_SendGoal'
+    assert [td['type_name'] for td in send_goal['referenced_type_descriptions']] == [
+        'other/msg/Point', 'other/msg/Stamp', 'other/msg/Time', 'pkg/action/Do_Goal']
+    # the index of the toplevel type also serves the nested subinterfaces
+    goal = extract_subinterface(send_goal, 'field0', reference_index)
+    assert goal == extract_subinterface(send_goal, 'field0')
@@ -0,0 +1,127 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+from rosidl_generator_type_description import generate_type_hash
+from rosidl_generator_type_description import verify
+from rosidl_generator_type_description.verify import verify_type_hashes
+
+IDL_STRINGS = {
+    'Inner': 'module test_pkg { module msg { struct Inner { double value; }; }; };',
+    'Outer': '#include "test_pkg/msg/Inner.idl"\n'
+             'module test_pkg { module msg { struct Outer { '
+             'test_pkg::msg::Inner inner; string name; }; }; };',
+}
+
+DESCRIPTION_C_TEMPLATE = """
+const rosidl_type_hash_t *
+test_pkg__msg__Outer__get_type_hash(
+  const rosidl_message_type_support_t * type_support)
+{{
+  (void)type_support;
+  static rosidl_type_hash_t hash = {outer_hash};
+  return &hash;
+}}
+
+#ifndef NDEBUG
+static const rosidl_type_hash_t test_pkg__msg__Inner__EXPECTED_HASH = {inner_hash};
+#endif
+"""
+
+
+def _to_c_definition(hash_string):
+    value = hash_string[len('RIHS01_'):]
+    return '{1, {\n' + ''.join(
+        f' 0x{value[i:i + 2]},' for i in range(0, len(value), 2)) + '\n}}'
+
+
+@pytest.fixture
+def install_prefix(tmp_path):
+    idl_dir = tmp_path / 'idl'
+    (idl_dir / 'msg').mkdir(parents=True)
+    for name, idl_string in IDL_STRINGS.items():
+        (idl_dir / 'msg' / f'{name}.idl').write_text(idl_string)
+    prefix = tmp_path / 'install'
+    output_dir = prefix / 'share' / 'test_pkg'
+    arguments_file = tmp_path / 'args.json'
+    arguments_file.write_text(json.dumps({
+        'package_name': 'test_pkg',
+        'output_dir': str(output_dir),
+        'idl_tuples': [f'{idl_dir}:msg/{name}.idl' for name in IDL_STRINGS.keys()],
+    }))
+    generate_type_hash(str(arguments_file))
+
+    with (output_dir / 'msg' / 'Outer.json').open('r') as h:
+        type_hashes = {
+            val['type_name']: val['hash_string'] for val in json.load(h)['type_hashes']}
+    (prefix / 'src').mkdir()
+    (prefix / 'src' / 'outer__description.c').write_text(DESCRIPTION_C_TEMPLATE.format(
+        outer_hash=_to_c_definition(type_hashes['test_pkg/msg/Outer']),
+        inner_hash=_to_c_definition(type_hashes['test_pkg/msg/Inner'])))
+    return prefix
+
+
+def test_verify_type_hashes(install_prefix):
+    # two .json files, the index and the .c file
+    verified_count, mismatches, unverifiable, errors = verify_type_hashes(
+        [str(install_prefix)], jobs=2)
+    assert (verified_count, mismatches, unverifiable, errors) == (1 + 2 + 2 + 2, [], [], [])
+
+
+def test_verify_type_hashes_without_type_descriptions(install_prefix, capsys):
+    # only the generated code, e.g. the output directory of a single generator
+    src_dir = str(install_prefix / 'src')
+    verified_count, mismatches, unverifiable, errors = verify_type_hashes([src_dir], jobs=1)
+    assert (verified_count, mismatches, errors) == (0, [], [])
+    assert sorted(type_name for _, type_name, _ in unverifiable) == [
+        'test_pkg/msg/Inner', 'test_pkg/msg/Outer']
+
+    # hashes which can't be verified don't fail the verification
+    assert verify.main([src_dir]) == 0
+    assert '0 mismatches, 2 unverifiable (no type description found)' in \
+        capsys.readouterr().out
+
+
+def test_verify_type_hashes_mismatch(install_prefix):
+    json_path = install_prefix / 'share' / 'test_pkg' / 'msg' / 'Inner.json'
+    json_path.write_text(json_path.read_text().replace('"value"', '"other"'))
+
+    verified_count, mismatches, unverifiable, errors = verify_type_hashes(
+        [str(install_prefix)], jobs=1)
+    assert (unverifiable, errors) == ([], [])
+    # Outer.json embeds its own, unmodified description of Inner
+    assert [(path.split('/')[-1], type_name) for path, type_name, _, _ in mismatches] == [
+        ('Inner.json', 'test_pkg/msg/Inner')]
+
+
+def test_verify_type_hashes_checkpoint(install_prefix, tmp_path, monkeypatch):
+    checkpoint_file = str(tmp_path / 'checkpoint')
+    expected = verify_type_hashes([str(install_prefix)], checkpoint_file=checkpoint_file)
+
+    def process_file_not_called(path):
+        assert False, f"'{path}' should have been skipped"
+
+    monkeypatch.setattr(verify, 'process_file', process_file_not_called)
+    assert verify_type_hashes(
+        [str(install_prefix)], jobs=1, checkpoint_file=checkpoint_file) == expected
+
+    # changed files are processed again
+    c_path = install_prefix / 'src' / 'outer__description.c'
+    c_path.write_text(c_path.read_text().replace('{1, {\n 0x', '{1, {\n 0xff', 1))
+    monkeypatch.undo()
+    verified_count, mismatches, unverifiable, errors = verify_type_hashes(
+        [str(install_prefix)], jobs=1, checkpoint_file=checkpoint_file)
+    assert [type_name for _, type_name, _, _ in mismatches] == ['test_pkg/msg/Outer']
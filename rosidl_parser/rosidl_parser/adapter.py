@@ -0,0 +1,240 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Build definitions directly from the specifications of rosidl_adapter.
+
+The result is the same as converting .msg, .srv and .action files to .idl
+files with rosidl_adapter and parsing those, without the round trip through
+the text and the IDL grammar.
+"""
+
+from rosidl_adapter.msg import get_include_file
+from rosidl_adapter.msg import get_idl_type
+from rosidl_adapter.msg import MSG_TYPE_TO_IDL
+from rosidl_adapter.msg import string_to_idl_string_literal
+from rosidl_adapter.msg import to_idl_literal
+from rosidl_adapter.parser import parse_action_string
+from rosidl_adapter.parser import parse_message_string
+from rosidl_adapter.parser import parse_service_string
+from rosidl_parser.definition import Action
+from rosidl_parser.definition import Annotation
+from rosidl_parser.definition import Array
+from rosidl_parser.definition import BasicType
+from rosidl_parser.definition import BoundedSequence
+from rosidl_parser.definition import BoundedString
+from rosidl_parser.definition import BoundedWString
+from rosidl_parser.definition import Constant
+from rosidl_parser.definition import IdlContent
+from rosidl_parser.definition import Include
+from rosidl_parser.definition import Member
+from rosidl_parser.definition import Message
+from rosidl_parser.definition import NamespacedType
+from rosidl_parser.definition import Service
+from rosidl_parser.definition import Structure
+from rosidl_parser.definition import UnboundedSequence
+from rosidl_parser.definition import UnboundedString
+from rosidl_parser.definition import UnboundedWString
+from rosidl_parser.parser import decode_string_literal_content
+
+# the encoding of the .idl files written by rosidl_adapter
+ADAPTER_IDL_FILE_ENCODING = 'iso-8859-1'
+
+
+def parse_interface_file(package_dir, package_name, interface_file):
+    """
+    Parse a .msg, .srv or .action file into the content of the equivalent .idl file.
+
+    :param package_dir: the absolute path of the package directory
+    :type package_dir: :py:class:`pathlib.Path`
+    :param str package_name: the name of the package
+    :param interface_file: the path of the interface file relative to the
+      package directory
+    :type interface_file: :py:class:`pathlib.Path`
+    :returns: the :py:class:`IdlContent`
+    """
+    content = (package_dir / interface_file).read_text(encoding='utf-8')
+    if interface_file.suffix == '.msg':
+        msg = parse_message_string(package_name, interface_file.stem, content)
+        return get_idl_content(message_from_specification(msg), [msg])
+
+    if interface_file.suffix == '.srv':
+        srv = parse_service_string(package_name, interface_file.stem, content)
+        return get_idl_content(
+            service_from_specification(srv), [srv.request, srv.response])
+
+    if interface_file.suffix == '.action':
+        action = parse_action_string(package_name, interface_file.stem, content)
+        return get_idl_content(
+            action_from_specification(action),
+            [action.goal, action.result, action.feedback])
+
+    assert False, f"Unsupported interface type '{interface_file.suffix}'"
+
+
+def get_idl_content(element, msg_specs):
+    """
+    Get the content of the .idl file of a message, service or action.
+
+    :param element: the :py:class:`Message`, :py:class:`Service` or
+      :py:class:`Action`
+    :param msg_specs: the message specifications of the element
+    :returns: the :py:class:`IdlContent`
+    """
+    content = IdlContent()
+    include_files = set()
+    for msg_spec in msg_specs:
+        for field in msg_spec.fields:
+            include_file = get_include_file(field.type)
+            if include_file is not None:
+                include_files.add(include_file)
+    content.elements += [
+        Include(include_file) for include_file in sorted(include_files)]
+    if isinstance(element, Action):
+        content.elements += [
+            include for include in element.implicit_includes
+            if include.locator not in include_files]
+    content.elements.append(element)
+    return content
+
+
+def message_from_specification(msg_spec, *, namespace='msg'):
+    """
+    Create a message from a message specification.
+
+    :param msg_spec: the :py:class:`rosidl_adapter.parser.MessageSpecification`
+    :param str namespace: the namespace within the package, e.g. ``srv`` for
+      the request message of a service
+    :returns: the :py:class:`Message`
+    """
+    msg = Message(Structure(NamespacedType(
+        namespaces=[msg_spec.base_type.pkg_name, namespace],
+        name=msg_spec.msg_name)))
+    # like the parser only keep the structure annotations of plain messages
+    if namespace == 'msg':
+        msg.structure.annotations += _get_comment_annotations(msg_spec.annotations)
+
+    for field in msg_spec.fields:
+        member = Member(_get_member_type(field.type), field.name)
+        member.annotations += _get_comment_annotations(field.annotations)
+        if field.default_value is not None:
+            member.annotations.append(Annotation('default', {
+                'value': _get_literal_value(field.type, field.default_value)}))
+        if 'unit' in field.annotations:
+            member.annotations.append(Annotation('unit', {
+                'value': _get_string_literal_value(field.annotations['unit'])}))
+        msg.structure.members.append(member)
+    if not msg_spec.fields:
+        msg.structure.members.append(
+            Member(BasicType('uint8'), 'structure_needs_at_least_one_member'))
+
+    for constant_spec in msg_spec.constants:
+        value = _get_literal_value(constant_spec.type, constant_spec.value)
+        constant = Constant(
+            constant_spec.name, _get_constant_type(constant_spec.type, value), value)
+        constant.annotations += _get_comment_annotations(constant_spec.annotations)
+        msg.constants.append(constant)
+    return msg
+
+
+def service_from_specification(srv_spec):
+    """
+    Create a service from a service specification.
+
+    :param srv_spec: the :py:class:`rosidl_adapter.parser.ServiceSpecification`
+    :returns: the :py:class:`Service`
+    """
+    return Service(
+        NamespacedType(namespaces=[srv_spec.pkg_name, 'srv'], name=srv_spec.srv_name),
+        message_from_specification(srv_spec.request, namespace='srv'),
+        message_from_specification(srv_spec.response, namespace='srv'))
+
+
+def action_from_specification(action_spec):
+    """
+    Create an action from an action specification.
+
+    :param action_spec: the :py:class:`rosidl_adapter.parser.ActionSpecification`
+    :returns: the :py:class:`Action`
+    """
+    return Action(
+        NamespacedType(
+            namespaces=[action_spec.pkg_name, 'action'], name=action_spec.action_name),
+        message_from_specification(action_spec.goal, namespace='action'),
+        message_from_specification(action_spec.result, namespace='action'),
+        message_from_specification(action_spec.feedback, namespace='action'))
+
+
+def _get_member_type(type_):
+    if type_.is_primitive_type():
+        if type_.type in ('string', 'wstring'):
+            if type_.string_upper_bound is None:
+                value_type = \
+                    UnboundedString() if type_.type == 'string' else UnboundedWString()
+            elif type_.type == 'string':
+                assert type_.string_upper_bound > 0
+                value_type = BoundedString(type_.string_upper_bound)
+            else:
+                value_type = BoundedWString(type_.string_upper_bound)
+        else:
+            value_type = BasicType(MSG_TYPE_TO_IDL[type_.type])
+    else:
+        value_type = NamespacedType([type_.pkg_name, 'msg'], type_.type)
+
+    if not type_.is_array:
+        return value_type
+    if type_.is_fixed_size_array():
+        return Array(value_type, type_.array_size)
+    if not type_.is_upper_bound:
+        return UnboundedSequence(value_type)
+    return BoundedSequence(value_type, type_.array_size)
+
+
+def _get_constant_type(type_name, value):
+    # the parser bounds string constants to the length of their value
+    if type_name == 'string':
+        return BoundedString(len(value))
+    if type_name == 'wstring':
+        return BoundedWString(len(value))
+    return BasicType(MSG_TYPE_TO_IDL[type_name])
+
+
+def _get_literal_value(type_, value):
+    literal = to_idl_literal(get_idl_type(type_), value)
+    if not isinstance(literal, str):
+        return literal
+    if literal in ('TRUE', 'FALSE'):
+        return literal == 'TRUE'
+    assert literal.startswith('"') and literal.endswith('"')
+    return _decode_string_literal(literal)
+
+
+def _get_string_literal_value(string):
+    return _decode_string_literal(string_to_idl_string_literal(string))
+
+
+def _decode_string_literal(literal):
+    # the .idl files are written with a different encoding than they are read
+    content = literal[1:-1].encode(ADAPTER_IDL_FILE_ENCODING).decode('utf-8')
+    return decode_string_literal_content(content, allow_unicode=False)
+
+
+def _get_comment_annotations(annotations):
+    lines = annotations.get('comment', [])
+    if not lines:
+        return []
+    return [Annotation('verbatim', {
+        'language': 'comment',
+        'text': '\n'.join(_get_string_literal_value(line) for line in lines),
+    })]
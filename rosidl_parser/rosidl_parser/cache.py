@@ -0,0 +1,197 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import os
+import pathlib
+import pickle
+import sys
+from typing import Dict
+from typing import Tuple
+import zlib
+
+from rosidl_parser.definition import IdlContent
+from rosidl_parser.files import write_file_atomically
+
+# the parsed content of .idl files is cached in this directory if set
+CONTENT_CACHE_DIR_ENV_VAR = 'ROSIDL_PARSER_CONTENT_CACHE_DIR'
+# the maximum size of the content cache in bytes
+CONTENT_CACHE_MAX_SIZE_ENV_VAR = 'ROSIDL_PARSER_CONTENT_CACHE_MAX_SIZE'
+DEFAULT_CONTENT_CACHE_MAX_SIZE = 128 * 1024 * 1024
+
+CONTENT_CACHE_FILE_SUFFIX = '.idlcontent'
+
+# all files which affect the content extracted from an .idl file
+_PARSER_SOURCE_FILES = (
+    'definition.py',
+    'grammar.lark',
+    'grammar_lalr.lark',
+    'parser.py',
+)
+
+_parser_version = None
+_content_caches: Dict[Tuple[str, int], 'IdlContentCache'] = {}
+
+
+def get_parser_version():
+    """
+    Get a digest identifying the parser implementation.
+
+    :returns: a hex digest over the grammars and the parser sources
+    """
+    global _parser_version
+    if _parser_version is None:
+        digest = hashlib.sha256()
+        for filename in _PARSER_SOURCE_FILES:
+            path = pathlib.Path(__file__).parent / filename
+            digest.update(path.read_bytes())
+        digest.update(str(sys.version_info[:2]).encode('utf-8'))
+        _parser_version = digest.hexdigest()
+    return _parser_version
+
+
+class IdlContentCache:
+    """
+    A persistent, size bounded cache of parsed .idl file content.
+
+    Entries are addressed by the digest of the .idl file content and the
+    parser version, so the same cache directory can be shared by all
+    generators and packages of a build.
+    When the cache exceeds its maximum size the least recently used entries
+    are evicted.
+    """
+
+    def __init__(self, cache_dir, max_size=DEFAULT_CONTENT_CACHE_MAX_SIZE):
+        """
+        Create an IdlContentCache.
+
+        :param cache_dir: the directory to store the cache entries in
+        :param int max_size: the maximum size of all entries in bytes
+        """
+        self.cache_dir = pathlib.Path(cache_dir)
+        self.max_size = max_size
+        # lazily initialized estimate of the size of all entries
+        self._size = None
+
+    def get_entry_path(self, idl_string):
+        digest = hashlib.sha256(get_parser_version().encode('utf-8'))
+        digest.update(idl_string.encode('utf-8'))
+        return self.cache_dir / (digest.hexdigest() + CONTENT_CACHE_FILE_SUFFIX)
+
+    def get(self, idl_string):
+        """
+        Get the cached content of an .idl file.
+
+        :param str idl_string: the content of the .idl file
+        :returns: the :class:`IdlContent`, or None if it isn't cached
+        """
+        path = self.get_entry_path(idl_string)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            content = pickle.loads(zlib.decompress(data))
+        except Exception:
+            # remove corrupt entries, they will be recreated
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return None
+        if not isinstance(content, IdlContent):
+            return None
+        # update the modification time to track recently used entries
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return content
+
+    def put(self, idl_string, content):
+        """
+        Cache the content of an .idl file.
+
+        :param str idl_string: the content of the .idl file
+        :param IdlContent content: the parsed content
+        """
+        assert isinstance(content, IdlContent)
+        data = zlib.compress(
+            pickle.dumps(content, protocol=pickle.HIGHEST_PROTOCOL))
+        try:
+            write_file_atomically(self.get_entry_path(idl_string), data)
+        except OSError:
+            # the cache is an optimization only, e.g. the disk might be full
+            return
+        if self._size is None:
+            self._size = self._get_entries_size()
+        else:
+            self._size += len(data)
+        if self._size > self.max_size:
+            self.evict()
+
+    def evict(self, target_size=None):
+        """
+        Remove the least recently used entries.
+
+        :param int target_size: the size in bytes to shrink the cache to,
+          defaults to three quarters of the maximum size
+        """
+        if target_size is None:
+            target_size = self.max_size * 3 // 4
+        entries = []
+        for path in self.cache_dir.glob('*' + CONTENT_CACHE_FILE_SUFFIX):
+            try:
+                stat = path.stat()
+            except OSError:
+                # removed by a concurrent process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= target_size:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            size -= entry_size
+        self._size = size
+
+    def _get_entries_size(self):
+        size = 0
+        for path in self.cache_dir.glob('*' + CONTENT_CACHE_FILE_SUFFIX):
+            try:
+                size += path.stat().st_size
+            except OSError:
+                pass
+        return size
+
+
+def get_content_cache():
+    """
+    Get the content cache configured by the environment.
+
+    :returns: an :class:`IdlContentCache`, or None if no cache directory is
+      configured
+    """
+    cache_dir = os.environ.get(CONTENT_CACHE_DIR_ENV_VAR)
+    if not cache_dir:
+        return None
+    max_size = int(os.environ.get(
+        CONTENT_CACHE_MAX_SIZE_ENV_VAR, DEFAULT_CONTENT_CACHE_MAX_SIZE))
+    key = (cache_dir, max_size)
+    if key not in _content_caches:
+        _content_caches[key] = IdlContentCache(cache_dir, max_size=max_size)
+    return _content_caches[key]
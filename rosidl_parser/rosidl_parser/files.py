@@ -0,0 +1,74 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Write cache files and the dependency files of the generators safely."""
+
+import os
+import pathlib
+
+
+def write_file_atomically(path, data):
+    """
+    Write a file without ever exposing partial content to concurrent readers.
+
+    The data is written to a temporary file in the same directory first
+    which is then renamed to the destination path.
+    Unlike a file created by :py:func:`tempfile.mkstemp` the written file
+    has the permissions given by the umask, like any other generated file.
+
+    :param path: the destination path
+    :type path: str or :py:class:`pathlib.Path`
+    :param bytes data: the content to write
+    :raises OSError: if the file couldn't be written, the destination is
+      left unchanged then
+    """
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.{os.urandom(4).hex()}.tmp')
+    try:
+        with tmp_path.open('xb') as h:
+            h.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_depfile(path, rules):
+    """
+    Write a Makefile style dependency file as read by Make and Ninja.
+
+    The build system uses it to learn which files the outputs of a generator
+    have been generated from.
+
+    :param pathlib.Path path: the path of the dependency file
+    :param rules: tuples of the output files and the files they depend on
+    :raises OSError: if the file couldn't be written
+    """
+    content = ''
+    for outputs, dependencies in rules:
+        content += ' '.join(map(_escape_depfile_path, outputs)) + ':'
+        for dependency in dependencies:
+            content += ' \\\n  ' + _escape_depfile_path(dependency)
+        content += '\n'
+    write_file_atomically(path, content.encode('utf-8'))
+
+
+def _escape_depfile_path(path):
+    # use the same separator on all platforms like CMake does
+    path = str(path).replace(os.sep, '/')
+    return path.replace('$', '$$').replace('#', '\\#').replace(' ', '\\ ')
@@ -13,15 +13,23 @@
 # limitations under the License.
 
 import codecs
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import io
 import os
+import pathlib
 import re
 import sys
 
+from lark import __version__ as lark_version
 from lark import Lark
+from lark.exceptions import LarkError
 from lark.lexer import Token
 from lark.tree import pydot__tree_to_png
 from lark.tree import Tree
 
+from rosidl_parser import profiling
+from rosidl_parser.cache import get_content_cache
 from rosidl_parser.definition import AbstractNestedType
 from rosidl_parser.definition import AbstractType
 from rosidl_parser.definition import Action
@@ -50,27 +58,114 @@ from rosidl_parser.definition import Structure
 from rosidl_parser.definition import UnboundedSequence
 from rosidl_parser.definition import UnboundedString
 from rosidl_parser.definition import UnboundedWString
+from rosidl_parser.files import write_file_atomically
 
 grammar_file = os.path.join(os.path.dirname(__file__), 'grammar.lark')
 with open(grammar_file, mode='r', encoding='utf-8') as h:
     grammar = h.read()
 
+# LALR(1) variant of the grammar, see the header of the file for differences
+lalr_grammar_file = os.path.join(os.path.dirname(__file__), 'grammar_lalr.lark')
+with open(lalr_grammar_file, mode='r', encoding='utf-8') as h:
+    lalr_grammar = h.read()
+
+# 'auto' tries the LALR parser first and falls back to the Earley parser
+PARSER_MODES = ('auto', 'lalr', 'earley')
+
+# the constructed LALR parser is persisted in this directory, an empty value
+# disables the cache
+PARSER_CACHE_DIR_ENV_VAR = 'ROSIDL_PARSER_CACHE_DIR'
+
+_lalr_parser_options = {
+    'start': 'specification',
+    'parser': 'lalr',
+    'maybe_placeholders': False,
+}
+
 _parser = None
+_lalr_parser = None
 
 
 def parse_idl_file(locator, png_file=None):
-    string = locator.get_absolute_path().read_text(encoding='utf-8')
+    path = locator.get_absolute_path()
+    with profiling.phase('parse_idl_file', path):
+        with profiling.phase('read_idl_file', path):
+            string = path.read_text(encoding='utf-8')
+        # the content cache is shared across processes, see rosidl_parser.cache
+        content_cache = get_content_cache() if not png_file else None
+        content = content_cache.get(string) if content_cache is not None else None
+        if content is None:
+            try:
+                content = parse_idl_string(string, png_file=png_file)
+            except Exception as e:
+                print(str(e), str(path), file=sys.stderr)
+                raise
+            if content_cache is not None:
+                content_cache.put(string, content)
+    return IdlFile(locator, content)
+
+
+class IdlParseError(Exception):
+    """The failure to parse a specific .idl file."""
+
+    def __init__(self, locator, message):
+        """
+        Create an IdlParseError.
+
+        :param IdlLocator locator: the locator of the .idl file
+        :param str message: the description of the failure
+        """
+        # pass all arguments to support pickling across processes
+        super().__init__(locator, message)
+        self.locator = locator
+        self.message = message
+
+    def __str__(self):
+        return f"Failed to parse '{self.locator.get_absolute_path()}': {self.message}"
+
+
+def parse_idl_files(locators, jobs=None):
+    """
+    Parse multiple .idl files, optionally in parallel.
+
+    A failure to parse one file doesn't affect the other files.
+
+    :param locators: the :class:`IdlLocator` instances of the files to parse
+    :param int jobs: the number of worker processes, defaults to the number
+      of CPUs, with 1 the files are parsed in the current process
+    :returns: a list containing an :class:`IdlFile` for each parsed file or
+      an :class:`IdlParseError` for each failed file, in the order of the
+      locators
+    """
+    locators = list(locators)
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs < 1:
+        raise ValueError(f'The number of jobs must be positive, not {jobs}')
+    jobs = min(jobs, len(locators))
+    if jobs <= 1:
+        return [_parse_idl_file_or_error(locator) for locator in locators]
+    # a few chunks per worker balance the load with little overhead
+    chunksize = max(1, len(locators) // (4 * jobs))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(
+            _parse_idl_file_or_error, locators, chunksize=chunksize))
+
+
+def _parse_idl_file_or_error(locator):
     try:
-        content = parse_idl_string(string, png_file=png_file)
+        return parse_idl_file(locator)
     except Exception as e:
-        print(str(e), str(locator.get_absolute_path()), file=sys.stderr)
-        raise
-    return IdlFile(locator, content)
+        # not all exceptions can be passed between processes, e.g. the ones
+        # from lark require additional arguments
+        return IdlParseError(locator, f'{type(e).__name__}: {e}')
 
 
 def parse_idl_string(idl_string, png_file=None):
-    tree = get_ast_from_idl_string(idl_string)
-    content = extract_content_from_ast(tree)
+    with profiling.phase('lark_parse'):
+        tree = get_ast_from_idl_string(idl_string)
+    with profiling.phase('extract_content'):
+        content = extract_content_from_ast(tree)
 
     if png_file:
         os.makedirs(os.path.dirname(png_file), exist_ok=True)
@@ -82,18 +177,94 @@ def parse_idl_string(idl_string, png_file=None):
     return content
 
 
-def get_ast_from_idl_string(idl_string):
+def get_ast_from_idl_string(idl_string, mode='auto'):
+    if mode not in PARSER_MODES:
+        raise ValueError(
+            f"Unknown parser mode '{mode}', expected one of: " +
+            ', '.join(PARSER_MODES))
+    if mode != 'earley':
+        try:
+            return _get_lalr_parser().parse(idl_string)
+        except LarkError:
+            if mode == 'lalr':
+                raise
+    return _get_earley_parser().parse(idl_string)
+
+
+def _get_earley_parser():
     global _parser
     if _parser is None:
         _parser = Lark(grammar, start='specification', maybe_placeholders=False)
-    return _parser.parse(idl_string)
+    return _parser
+
+
+def _get_lalr_parser():
+    global _lalr_parser
+    if _lalr_parser is None:
+        cache_file = get_lalr_parser_cache_file()
+        if cache_file is not None:
+            _lalr_parser = _load_lalr_parser(cache_file)
+        if _lalr_parser is None:
+            _lalr_parser = Lark(lalr_grammar, **_lalr_parser_options)
+            if cache_file is not None:
+                _save_lalr_parser(_lalr_parser, cache_file)
+    return _lalr_parser
+
+
+def get_lalr_parser_cache_file():
+    """
+    Get the path of the file caching the constructed LALR parser.
+
+    The file name is derived from the grammar, the parser options, the Lark
+    version and the Python version, so a change to any of them never loads a
+    stale parser.
+
+    :returns: the path, or None if caching is disabled
+    """
+    cache_dir = os.environ.get(PARSER_CACHE_DIR_ENV_VAR)
+    if cache_dir is None:
+        cache_home = os.environ.get('XDG_CACHE_HOME')
+        if not cache_home:
+            cache_home = os.path.join(os.path.expanduser('~'), '.cache')
+        cache_dir = os.path.join(cache_home, 'rosidl_parser')
+    if not cache_dir:
+        return None
+    key = hashlib.sha256()
+    key.update(lalr_grammar.encode('utf-8'))
+    key.update(repr(sorted(_lalr_parser_options.items())).encode('utf-8'))
+    key.update(lark_version.encode('utf-8'))
+    key.update(str(sys.version_info[:2]).encode('utf-8'))
+    return pathlib.Path(cache_dir) / f'grammar_lalr_{key.hexdigest()[:32]}.pickle'
+
+
+def _load_lalr_parser(cache_file):
+    try:
+        with cache_file.open('rb') as h:
+            return Lark.load(h)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        # a corrupt cache is no reason to fail, it will be overwritten
+        print(f"Ignoring invalid parser cache '{cache_file}': {e}", file=sys.stderr)
+    return None
+
+
+def _save_lalr_parser(parser, cache_file):
+    # the cache is an optimization only, e.g. the directory might be read-only
+    buffer = io.BytesIO()
+    parser.save(buffer)
+    try:
+        write_file_atomically(cache_file, buffer.getvalue())
+    except OSError:
+        pass
 
 
 def extract_content_from_ast(tree):
     content = IdlContent()
 
-    include_directives = tree.find_data('include_directive')
-    for include_directive in include_directives:
+    definitions = collect_definitions(tree)
+
+    for include_directive, _ in definitions['include_directive']:
         assert len(include_directive.children) == 1
         child = include_directive.children[0]
         assert child.data in ('h_char_sequence', 'q_char_sequence')
@@ -101,11 +272,9 @@ def extract_content_from_ast(tree):
         content.elements.append(Include(include_token.value))
 
     constants = {}
-    const_dcls = tree.find_data('const_dcl')
-    for const_dcl in const_dcls:
+    for const_dcl, module_identifiers in definitions['const_dcl']:
         annotations = get_annotations(const_dcl)
         const_type = next(const_dcl.find_data('const_type'))
-        module_identifiers = get_module_identifier_values(tree, const_dcl)
         module_comments = constants.setdefault(
             module_identifiers[-1], [])
         value = get_const_expr_value(const_dcl.children[-1])
@@ -117,8 +286,7 @@ def extract_content_from_ast(tree):
         module_comments.append(constant)
 
     typedefs = {}
-    typedef_dcls = tree.find_data('typedef_dcl')
-    for typedef_dcl in typedef_dcls:
+    for typedef_dcl, _ in definitions['typedef_dcl']:
         assert len(typedef_dcl.children) == 1
         child = typedef_dcl.children[0]
         assert 'type_declarator' == child.data
@@ -136,10 +304,13 @@ def extract_content_from_ast(tree):
         else:
             typedefs[identifier] = abstract_type
 
-    struct_defs = list(tree.find_data('struct_def'))
+    struct_defs = [
+        struct_def for struct_def, _ in definitions['struct_def']]
+    struct_namespaces = [
+        module_identifiers for _, module_identifiers in definitions['struct_def']]
     if len(struct_defs) == 1:
         msg = Message(Structure(NamespacedType(
-            namespaces=get_module_identifier_values(tree, struct_defs[0]),
+            namespaces=struct_namespaces[0],
             name=get_child_identifier_value(struct_defs[0]))))
         annotations = get_annotations(struct_defs[0])
         msg.structure.annotations += annotations
@@ -153,7 +324,7 @@ def extract_content_from_ast(tree):
 
     elif len(struct_defs) == 2:
         request = Message(Structure(NamespacedType(
-            namespaces=get_module_identifier_values(tree, struct_defs[0]),
+            namespaces=struct_namespaces[0],
             name=get_child_identifier_value(struct_defs[0]))))
         assert request.structure.namespaced_type.name.endswith(
             SERVICE_REQUEST_MESSAGE_SUFFIX)
@@ -165,7 +336,7 @@ def extract_content_from_ast(tree):
             request.constants += constants[constant_module_name]
 
         response = Message(Structure(NamespacedType(
-            namespaces=get_module_identifier_values(tree, struct_defs[1]),
+            namespaces=struct_namespaces[1],
             name=get_child_identifier_value(struct_defs[1]))))
         assert response.structure.namespaced_type.name.endswith(
             SERVICE_RESPONSE_MESSAGE_SUFFIX)
@@ -193,7 +364,7 @@ def extract_content_from_ast(tree):
 
     elif len(struct_defs) == 3:
         goal = Message(Structure(NamespacedType(
-            namespaces=get_module_identifier_values(tree, struct_defs[0]),
+            namespaces=struct_namespaces[0],
             name=get_child_identifier_value(struct_defs[0]))))
         assert goal.structure.namespaced_type.name.endswith(ACTION_GOAL_SUFFIX)
         add_message_members(goal, struct_defs[0])
@@ -204,7 +375,7 @@ def extract_content_from_ast(tree):
             goal.constants += constants[constant_module_name]
 
         result = Message(Structure(NamespacedType(
-            namespaces=get_module_identifier_values(tree, struct_defs[1]),
+            namespaces=struct_namespaces[1],
             name=get_child_identifier_value(struct_defs[1]))))
         assert result.structure.namespaced_type.name.endswith(
             ACTION_RESULT_SUFFIX)
@@ -224,7 +395,7 @@ def extract_content_from_ast(tree):
         assert goal_basename == result_basename
 
         feedback_message = Message(Structure(NamespacedType(
-            namespaces=get_module_identifier_values(tree, struct_defs[2]),
+            namespaces=struct_namespaces[2],
             name=get_child_identifier_value(struct_defs[2]))))
         assert feedback_message.structure.namespaced_type.name.endswith(
             ACTION_FEEDBACK_SUFFIX)
@@ -299,6 +470,11 @@ def get_child_identifier_value(tree):
     return None
 
 
+def _get_children(tree, data):
+    return [
+        c for c in tree.children if isinstance(c, Tree) and c.data == data]
+
+
 def _find_tokens(token_type):
     def find(t):
         if isinstance(t, Token):
@@ -307,6 +483,39 @@ def _find_tokens(token_type):
     return find
 
 
+# the declarations extracted from the tree, none of them contains another one
+COLLECTED_DEFINITIONS = (
+    'include_directive', 'const_dcl', 'typedef_dcl', 'struct_def')
+
+
+def collect_definitions(tree):
+    """
+    Collect all declarations of interest in a single pass over the tree.
+
+    The tree is traversed in document order while tracking the enclosing
+    modules, the subtrees of collected declarations aren't traversed.
+
+    :param tree: the tree of the whole specification
+    :returns: a dictionary mapping each rule name in `COLLECTED_DEFINITIONS`
+      to a list of tuples containing the node and a list of the names of the
+      enclosing modules
+    """
+    definitions = {data: [] for data in COLLECTED_DEFINITIONS}
+    # explicit stack of nodes to visit and their enclosing modules
+    stack = [(tree, ())]
+    while stack:
+        node, module_identifiers = stack.pop()
+        if node.data in definitions:
+            definitions[node.data].append((node, list(module_identifiers)))
+            continue
+        if node.data == 'module_dcl':
+            module_identifiers += (get_child_identifier_value(node), )
+        stack.extend(
+            (c, module_identifiers) for c in reversed(node.children)
+            if isinstance(c, Tree))
+    return definitions
+
+
 def get_module_identifier_values(tree, target):
     """Get all module names between a tree node and a specific target node."""
     path = _find_path(tree, target)
@@ -358,16 +567,12 @@ def get_abstract_type_optionally_as_array(abstract_type, declarator):
 
 
 def add_message_members(msg, tree):
-    members = tree.find_data('member')
-    for member in members:
-        # the find_data methods seems to traverse the tree in post order
-        # the highest type_spec in the subtree is therefore the last item
-        type_specs = list(member.find_data('type_spec'))
-        type_spec = type_specs[-1]
+    for member in _get_children(tree, 'member'):
+        type_spec, = _get_children(member, 'type_spec')
         abstract_type = get_abstract_type_from_type_spec(type_spec)
-        declarators = member.find_data('declarator')
+        declarators, = _get_children(member, 'declarators')
         annotations = get_annotations(member)
-        for declarator in declarators:
+        for declarator in _get_children(declarators, 'declarator'):
             assert len(declarator.children) == 1
             child = declarator.children[0]
             if child.data == 'array_declarator':
@@ -434,16 +639,9 @@ def get_abstract_type(tree):
         child = tree.children[0]
 
         if 'sequence_type' == child.data:
-            # the find_data methods seems to traverse the tree in post order
-            # the highest type_spec in the subtree is therefore the last item
-            type_specs = list(child.find_data('type_spec'))
-            type_spec = type_specs[-1]
+            type_spec, = _get_children(child, 'type_spec')
             basetype = get_abstract_type_from_type_spec(type_spec)
-            positive_int_consts = list(child.find_data('positive_int_const'))
-            if positive_int_consts:
-                path = _find_path(child, positive_int_consts[0])
-                if len(path) > 2 and path[-2].data == 'string_type':
-                    positive_int_consts.pop(0)
+            positive_int_consts = _get_children(child, 'positive_int_const')
             if positive_int_consts:
                 maximum_size = get_positive_int_const(positive_int_consts[-1])
                 return BoundedSequence(basetype, maximum_size)
@@ -637,7 +835,17 @@ def get_string_literal_value(string_literal, *, allow_unicode=False):
         assert len(value) >= 2
         # Get rid of leading " and trailing "
         value = value[1:-1]
+    return decode_string_literal_content(value, allow_unicode=allow_unicode)
+
+
+def decode_string_literal_content(value, *, allow_unicode=False):
+    """
+    Decode the escape sequences of the content of an IDL string literal.
 
+    :param str value: the content of the literal without the quotes
+    :param bool allow_unicode: whether to decode unicode escape sequences
+    :returns: the decoded string
+    """
     regex = _get_escape_sequences_regex(allow_unicode=allow_unicode)
     value = regex.sub(_decode_escape_sequence, value)
     # unescape double quote and backslash if preceeded by a backslash
@@ -0,0 +1,295 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the time spent in the phases of the code generation.
+
+Profiling is enabled by setting the ``ROSIDL_PROFILE_DIR`` environment
+variable to a directory.
+Each process, including the worker processes, then writes the phases it ran
+as Chrome trace events into a separate file in that directory when it exits.
+The files can be combined into a single trace, which can be opened in
+chrome://tracing or https://ui.perfetto.dev, and summarized with::
+
+  python3 -m rosidl_parser.profiling --merge <dir> --output trace.json
+
+A single command can also be profiled directly, e.g.::
+
+  python3 -m rosidl_parser.profiling --output trace.json \\
+    -m rosidl_pycommon.fan_out --generator ...
+
+While profiling is disabled :py:func:`phase` returns a shared no-op context
+manager, so the instrumented code doesn't record anything.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import pathlib
+import runpy
+import sys
+import tempfile
+import threading
+import time
+
+# the directory to write the trace events of each process to
+PROFILE_DIR_ENV_VAR = 'ROSIDL_PROFILE_DIR'
+
+TRACE_FILE_SUFFIX = '.trace.json'
+
+# the recorded trace events of this process, None while profiling is disabled
+_events = None
+# the process which registered writing the trace events at exit
+_writer_pid = None
+
+_NO_PHASE = contextlib.nullcontext()
+
+
+def phase(name, path=None):
+    """
+    Measure the duration of a phase.
+
+    :param str name: the name of the phase, e.g. ``parse_idl_file``
+    :param path: the optional file the phase processes
+    :returns: a context manager measuring the duration of its body
+    """
+    if _events is None:
+        return _NO_PHASE
+    return _Phase(name, path)
+
+
+class _Phase:
+    __slots__ = ('_name', '_path', '_start')
+
+    def __init__(self, name, path):
+        self._name = name
+        self._path = path
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end = time.perf_counter_ns()
+        pid = os.getpid()
+        if _writer_pid != pid:
+            # e.g. a worker process forked from the profiled process
+            _register_writer(pid)
+        event = {
+            'name': self._name,
+            'cat': 'rosidl',
+            'ph': 'X',
+            # the clock is shared by all processes, Chrome uses microseconds
+            'ts': self._start / 1000,
+            'dur': (end - self._start) / 1000,
+            'pid': pid,
+            'tid': threading.get_ident(),
+        }
+        if self._path is not None:
+            event['args'] = {'file': str(self._path)}
+        _events.append(event)
+
+
+def is_enabled():
+    """Check if profiling is enabled in this process."""
+    return _events is not None
+
+
+def enable(profile_dir=None):
+    """
+    Enable profiling in this process and the processes it starts.
+
+    :param profile_dir: the directory to write the trace events to, defaults
+      to the value of the ``ROSIDL_PROFILE_DIR`` environment variable
+    """
+    global _events
+    if profile_dir is not None:
+        # child processes inherit the environment
+        os.environ[PROFILE_DIR_ENV_VAR] = str(profile_dir)
+    if _events is None:
+        _events = []
+
+
+def get_events():
+    """
+    Get the trace events recorded by this process.
+
+    :returns: a list of Chrome trace events
+    """
+    pid = os.getpid()
+    # a forked process inherits the events of its parent
+    return [event for event in (_events or []) if event['pid'] == pid]
+
+
+def _register_writer(pid):
+    global _writer_pid
+    _writer_pid = pid
+    # worker processes of the multiprocessing module don't run atexit
+    # handlers, unlike the finalizers registered after they have started
+    import multiprocessing.util
+    multiprocessing.util.Finalize(None, write_process_events, exitpriority=0)
+
+
+def write_process_events():
+    """Write the trace events of this process into the profile directory."""
+    profile_dir = os.environ.get(PROFILE_DIR_ENV_VAR)
+    events = get_events()
+    if not profile_dir or not events:
+        return
+    profile_dir = pathlib.Path(profile_dir)
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    trace_file = profile_dir / f'rosidl-{os.getpid()}-{time.time_ns()}{TRACE_FILE_SUFFIX}'
+    with trace_file.open('w', encoding='utf-8') as h:
+        json.dump(events, h)
+    _events.clear()
+
+
+def read_events(profile_dir):
+    """
+    Read the trace events written by all processes into a profile directory.
+
+    :param profile_dir: the profile directory
+    :type profile_dir: :py:class:`pathlib.Path`
+    :returns: a list of Chrome trace events ordered by their start time
+    """
+    events = []
+    for trace_file in sorted(profile_dir.glob(f'*{TRACE_FILE_SUFFIX}')):
+        with trace_file.open('r', encoding='utf-8') as h:
+            events += json.load(h)
+    events.sort(key=lambda event: event['ts'])
+    return events
+
+
+def write_trace(trace_file, events):
+    """
+    Write trace events in the Chrome trace event format.
+
+    :param trace_file: the path of the trace file
+    :type trace_file: :py:class:`pathlib.Path`
+    :param events: the trace events
+    """
+    with trace_file.open('w', encoding='utf-8') as h:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, h)
+
+
+def get_summary(events):
+    """
+    Summarize the durations of the phases.
+
+    The durations of nested phases are included in their parent phases.
+
+    :param events: the trace events
+    :returns: a dict with the ``count``, the ``total`` and the ``max``
+      duration in milliseconds as well as the ``max_file`` by phase name
+    """
+    summary = {}
+    for event in events:
+        duration = event['dur'] / 1000
+        entry = summary.setdefault(
+            event['name'], {'count': 0, 'total': 0.0, 'max': 0.0, 'max_file': None})
+        entry['count'] += 1
+        entry['total'] += duration
+        if duration >= entry['max']:
+            entry['max'] = duration
+            entry['max_file'] = event.get('args', {}).get('file')
+    return summary
+
+
+def format_summary(summary):
+    """
+    Format the summary of the phases as a table.
+
+    :param summary: the summary returned by :py:func:`get_summary`
+    :returns: the table with one line per phase ordered by the total duration
+    """
+    lines = [
+        f"{'phase':<32} {'count':>7} {'total ms':>11} {'mean ms':>9} {'max ms':>9}  "
+        'slowest file']
+    for name, entry in sorted(summary.items(), key=lambda item: -item[1]['total']):
+        lines.append(
+            f"{name:<32} {entry['count']:>7} {entry['total']:>11.1f} "
+            f"{entry['total'] / entry['count']:>9.2f} {entry['max']:>9.2f}  "
+            f"{entry['max_file'] or ''}".rstrip())
+    return '\n'.join(lines)
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(
+        description='Profile the phases of the code generation.',
+        usage='%(prog)s --output OUTPUT (--merge PROFILE_DIR | -m module | script) '
+              '[arguments ...]')
+    parser.add_argument(
+        '--output', required=True,
+        help='The Chrome trace file to write')
+    parser.add_argument(
+        '--merge', metavar='PROFILE_DIR',
+        help=f'Combine the trace events written into the {PROFILE_DIR_ENV_VAR} '
+             'directory instead of profiling a module or script')
+    # like for the Python interpreter all arguments after the module or the
+    # script are passed to it
+    command_index = _get_command_index(argv)
+    args = parser.parse_args(argv[:command_index])
+    command = argv[command_index:]
+    if bool(args.merge) == bool(command):
+        parser.error('Either --merge or a module or script to profile is required')
+    if command[:1] == ['-m'] and len(command) < 2:
+        parser.error('The -m option requires a module name')
+
+    if args.merge:
+        events = read_events(pathlib.Path(args.merge))
+    else:
+        with tempfile.TemporaryDirectory(prefix='rosidl_profile_') as profile_dir:
+            events = _run_profiled(command, pathlib.Path(profile_dir))
+
+    write_trace(pathlib.Path(args.output), events)
+    print(format_summary(get_summary(events)), file=sys.stderr)
+
+
+def _get_command_index(argv):
+    index = 0
+    while index < len(argv):
+        argument = argv[index]
+        if argument == '-m' or not argument.startswith('-'):
+            return index
+        if argument in ('--output', '--merge'):
+            index += 1
+        index += 1
+    return index
+
+
+def _run_profiled(command, profile_dir):
+    enable(profile_dir)
+    try:
+        if command[0] == '-m':
+            sys.argv = command[1:]
+            runpy.run_module(command[1], run_name='__main__', alter_sys=True)
+        else:
+            sys.argv = command
+            runpy.run_path(command[0], run_name='__main__')
+    except SystemExit as e:
+        if e.code:
+            raise
+    finally:
+        write_process_events()
+    return read_events(profile_dir)
+
+
+if os.environ.get(PROFILE_DIR_ENV_VAR):
+    enable()
+
+
+if __name__ == '__main__':
+    # the instrumented modules record into the imported module, not __main__
+    from rosidl_parser.profiling import main as profiling_main
+    profiling_main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark extracting the content from the AST of synthetic .idl files.
+
+The time per declaration is expected to stay constant with growing file
+sizes since the tree is traversed only once.
+"""
+
+import argparse
+import sys
+import time
+
+from rosidl_parser.parser import extract_content_from_ast
+from rosidl_parser.parser import get_ast_from_idl_string
+
+
+def get_synthetic_idl_string(count):
+    """
+    Get an .idl message with the given number of constants and members.
+
+    :param int count: the number of constants as well as members
+    :returns: the content of the .idl file
+    """
+    lines = [
+        'module benchmark_msgs {',
+        '  module msg {',
+        '    module Synthetic_Constants {',
+    ]
+    lines += [
+        f'      const int32 CONSTANT_{i} = {i};' for i in range(count)]
+    lines += [
+        '    };',
+        '    struct Synthetic {',
+    ]
+    for i in range(count):
+        if i % 2:
+            lines.append(f'      sequence<int32, {i + 1}> member_{i};')
+        else:
+            lines.append('      @verbatim (language="comment", text="doc")')
+            lines.append(f'      double member_{i};')
+    lines += [
+        '    };',
+        '  };',
+        '};',
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+def main(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(
+        description='Benchmark extracting the content of synthetic .idl files.',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '--counts', nargs='+', type=int, default=[500, 1000, 2000, 4000],
+        help='The numbers of constants and members of the synthetic files')
+    parser.add_argument(
+        '--repeat', type=int, default=3,
+        help='The number of runs per file, the fastest one is reported')
+    args = parser.parse_args(argv)
+
+    print(f"{'count':>8} {'time [ms]':>10} {'per decl. [us]':>15}")
+    for count in args.counts:
+        tree = get_ast_from_idl_string(get_synthetic_idl_string(count))
+        durations = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            extract_content_from_ast(tree)
+            durations.append(time.perf_counter() - start)
+        duration = min(durations)
+        per_declaration = duration / (2 * count) * 1e6
+        print(f'{count:>8} {duration * 1e3:>10.1f} {per_declaration:>15.2f}')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,26 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from rosidl_parser.cache import CONTENT_CACHE_DIR_ENV_VAR
+from rosidl_parser.parser import PARSER_CACHE_DIR_ENV_VAR
+
+
+@pytest.fixture(autouse=True)
+def disable_user_caches(monkeypatch):
+    # don't read or write the parser cache in the user cache directory,
+    # tests of the caches set the variables to a temporary directory instead
+    monkeypatch.setenv(PARSER_CACHE_DIR_ENV_VAR, '')
+    monkeypatch.delenv(CONTENT_CACHE_DIR_ENV_VAR, raising=False)
@@ -0,0 +1,119 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pathlib
+
+from rosidl_adapter import convert_to_idl
+from rosidl_parser.adapter import parse_interface_file
+from rosidl_parser.definition import IdlLocator
+from rosidl_parser.parser import parse_idl_file
+
+REPOSITORY_PATH = pathlib.Path(__file__).parents[2]
+
+INTERFACE_FILES = [
+    (REPOSITORY_PATH / 'rosidl_adapter' / 'test' / 'data', 'msg/Test.msg'),
+    (REPOSITORY_PATH / 'rosidl_adapter' / 'test' / 'data', 'srv/Test.srv'),
+    (REPOSITORY_PATH / 'rosidl_adapter' / 'test' / 'data', 'action/Test.action'),
+    (REPOSITORY_PATH / 'rosidl_generator_tests', 'msg/SmallConstant.msg'),
+]
+
+SYNTHETIC_INTERFACES = {
+    'msg/Synthetic.msg': '\n'.join([
+        '# A "quoted" comment with a \\ backslash and café',
+        '#',
+        '# after an empty line',
+        'string FOO="a\\"b"',
+        'wstring BAR="über"',
+        'float64 NEGATIVE=-1.5e-3',
+        'bool ENABLED=true',
+        '',
+        '# the position',
+        'float64 x 0.5  # [m]',
+        'string[3] names ["a", "b\\\\c", "d\\"e"]',
+        'int32[<=4] values [1, -2, 3]',
+        'uint8[] data',
+        'wstring<=10 label "ä"',
+        'other_pkg/Point[2] points',
+        'Point[<=3] local_points',
+        'string<=8[] bounded_strings',
+        'char c 65',
+        'byte b 255',
+    ]),
+    'msg/Empty.msg': '# only a comment\n',
+    'srv/Synthetic.srv': '\n'.join([
+        '# request comment',
+        'int32 A=1',
+        'other_pkg/Point point',
+        '---',
+        'bool success true',
+    ]),
+    'action/Synthetic.action': '\n'.join([
+        'float64 goal 1.0',
+        '---',
+        'string result "done"',
+        '---',
+        'float32[] feedback [0.1, 0.2]',
+    ]),
+}
+
+
+def _assert_equal(actual, expected, path='content'):
+    # the parser keeps the tokens of identifiers which are strings as well
+    if isinstance(expected, str):
+        assert isinstance(actual, str), path
+        assert str(actual) == str(expected), path
+        return
+    assert type(actual) is type(expected), path
+    if isinstance(expected, (list, tuple)):
+        assert len(actual) == len(expected), path
+        for i, (a, e) in enumerate(zip(actual, expected)):
+            _assert_equal(a, e, f'{path}[{i}]')
+    elif isinstance(expected, dict):
+        assert actual.keys() == expected.keys(), path
+        for key in expected.keys():
+            _assert_equal(actual[key], expected[key], f'{path}[{key!r}]')
+    elif type(expected).__module__ == 'rosidl_parser.definition':
+        attributes = []
+        for cls in type(expected).__mro__:
+            slots = getattr(cls, '__slots__', ())
+            attributes += [slots] if isinstance(slots, str) else list(slots)
+        attributes += list(getattr(expected, '__dict__', {}).keys())
+        for attribute in attributes:
+            _assert_equal(
+                getattr(actual, attribute), getattr(expected, attribute),
+                f'{path}.{attribute}')
+    else:
+        assert actual == expected, path
+
+
+def test_parse_interface_file_matches_idl(tmp_path, capsys):
+    synthetic_dir = tmp_path / 'synthetic'
+    for relative_path, content in SYNTHETIC_INTERFACES.items():
+        (synthetic_dir / relative_path).parent.mkdir(parents=True, exist_ok=True)
+        (synthetic_dir / relative_path).write_text(content, encoding='utf-8')
+    interface_files = INTERFACE_FILES + [
+        (synthetic_dir, relative_path) for relative_path in SYNTHETIC_INTERFACES.keys()]
+
+    # NOTE: empy expects its proxy to stay in sys.stdout, so do everything in one run
+    with capsys.disabled():
+        for package_dir, relative_path in interface_files:
+            interface_file = pathlib.Path(relative_path)
+            output_dir = tmp_path / 'idl'
+            idl_file = convert_to_idl(
+                package_dir, 'test_msgs', interface_file, output_dir / interface_file.parent)
+            expected = parse_idl_file(
+                IdlLocator(output_dir, idl_file.relative_to(output_dir))).content
+
+            content = parse_interface_file(package_dir, 'test_msgs', interface_file)
+            _assert_equal(content, expected, relative_path)
@@ -0,0 +1,123 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pathlib
+
+import pytest
+from rosidl_parser import cache
+from rosidl_parser import parser
+from rosidl_parser.cache import IdlContentCache
+from rosidl_parser.definition import IdlLocator
+from rosidl_parser.definition import Message
+from rosidl_parser.parser import parse_idl_file
+from rosidl_parser.parser import parse_idl_string
+
+MESSAGE_IDL_LOCATOR = IdlLocator(
+    pathlib.Path(__file__).parent, pathlib.Path('msg') / 'MyMessage.idl')
+
+
+def _get_idl_string(value):
+    return (
+        'module pkg { module msg { struct Foo { '
+        f'@default (value={value}) int32 bar; '
+        '}; }; };')
+
+
+@pytest.fixture
+def content_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(cache.CONTENT_CACHE_DIR_ENV_VAR, str(tmp_path))
+    monkeypatch.setattr(cache, '_content_caches', {})
+    return tmp_path
+
+
+def test_content_cache_hit(content_cache_dir, monkeypatch):
+    idl_file = parse_idl_file(MESSAGE_IDL_LOCATOR)
+    entries = list(content_cache_dir.iterdir())
+    assert len(entries) == 1
+    assert entries[0].suffix == cache.CONTENT_CACHE_FILE_SUFFIX
+
+    def parse_idl_string_not_called(*args, **kwargs):
+        assert False, 'the content should have been loaded from the cache'
+
+    monkeypatch.setattr(parser, 'parse_idl_string', parse_idl_string_not_called)
+    cached_idl_file = parse_idl_file(MESSAGE_IDL_LOCATOR)
+    assert cached_idl_file.locator is MESSAGE_IDL_LOCATOR
+    cached_messages = cached_idl_file.content.get_elements_of_type(Message)
+    messages = idl_file.content.get_elements_of_type(Message)
+    assert len(cached_messages) == len(messages) == 1
+    assert cached_messages[0].structure.namespaced_type.name == \
+        messages[0].structure.namespaced_type.name
+    assert [m.name for m in cached_messages[0].structure.members] == \
+        [m.name for m in messages[0].structure.members]
+
+
+def test_content_cache_keyed_on_content(tmp_path):
+    content_cache = IdlContentCache(tmp_path)
+    idl_string = _get_idl_string(1)
+    assert content_cache.get(idl_string) is None
+
+    content_cache.put(idl_string, parse_idl_string(idl_string))
+    assert content_cache.get(idl_string) is not None
+    # any change to the content misses the cache
+    assert content_cache.get(_get_idl_string(2)) is None
+
+
+def test_content_cache_keyed_on_parser_version(tmp_path, monkeypatch):
+    content_cache = IdlContentCache(tmp_path)
+    idl_string = _get_idl_string(1)
+    content_cache.put(idl_string, parse_idl_string(idl_string))
+
+    monkeypatch.setattr(cache, '_parser_version', 'other')
+    assert content_cache.get(idl_string) is None
+
+
+def test_content_cache_corrupt_entry(tmp_path):
+    content_cache = IdlContentCache(tmp_path)
+    idl_string = _get_idl_string(1)
+    entry_path = content_cache.get_entry_path(idl_string)
+    entry_path.write_bytes(b'truncated')
+
+    assert content_cache.get(idl_string) is None
+    assert not entry_path.exists()
+
+
+def test_content_cache_eviction(tmp_path):
+    idl_strings = [_get_idl_string(i) for i in range(4)]
+    contents = [parse_idl_string(s) for s in idl_strings]
+
+    content_cache = IdlContentCache(tmp_path)
+    content_cache.put(idl_strings[0], contents[0])
+    entry_size = content_cache.get_entry_path(idl_strings[0]).stat().st_size
+
+    # exceeding the room for three entries evicts the least recently used
+    # entries until three quarters of the room are left
+    content_cache = IdlContentCache(tmp_path, max_size=3 * entry_size)
+    for i, (idl_string, content) in enumerate(zip(idl_strings[1:3], contents[1:3])):
+        content_cache.put(idl_string, content)
+        # ensure a distinct modification time
+        os.utime(content_cache.get_entry_path(idl_string), (i + 10, i + 10))
+    os.utime(content_cache.get_entry_path(idl_strings[0]), (20, 20))
+    content_cache.put(idl_strings[3], contents[3])
+
+    remaining = [content_cache.get_entry_path(s).exists() for s in idl_strings]
+    assert remaining == [True, False, False, True]
+
+
+def test_content_cache_disabled(tmp_path, monkeypatch):
+    monkeypatch.delenv(cache.CONTENT_CACHE_DIR_ENV_VAR, raising=False)
+    assert cache.get_content_cache() is None
+
+    monkeypatch.setenv(cache.CONTENT_CACHE_DIR_ENV_VAR, '')
+    assert cache.get_content_cache() is None
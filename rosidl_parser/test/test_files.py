@@ -0,0 +1,61 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import stat
+
+import pytest
+from rosidl_parser.files import write_depfile
+from rosidl_parser.files import write_file_atomically
+
+
+def test_write_file_atomically(tmp_path):
+    path = tmp_path / 'sub' / 'file.bin'
+    write_file_atomically(path, b'first')
+    assert path.read_bytes() == b'first'
+    write_file_atomically(str(path), b'second')
+    assert path.read_bytes() == b'second'
+    # no temporary files are left behind
+    assert list(path.parent.iterdir()) == [path]
+
+    # the parent is a file, so the directory can't be created
+    with pytest.raises(OSError):
+        write_file_atomically(path / 'file.bin', b'data')
+    assert path.read_bytes() == b'second'
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='The umask only applies on POSIX')
+def test_write_file_atomically_respects_umask(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        write_file_atomically(tmp_path / 'file.bin', b'data')
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE((tmp_path / 'file.bin').stat().st_mode) == 0o644
+
+
+def test_write_depfile(tmp_path):
+    depfile = tmp_path / 'sub' / 'generator.d'
+    write_depfile(depfile, [
+        (['/out/a.h', '/out/a.c'], ['/src/A.idl', '/src/my dir/A.json']),
+        (['/out/b$.h'], []),
+        (['/out/c#.h'], ['/src/C.idl']),
+    ])
+    assert depfile.read_text() == (
+        '/out/a.h /out/a.c: \\\n'
+        '  /src/A.idl \\\n'
+        '  /src/my\\ dir/A.json\n'
+        '/out/b$$.h:\n'
+        '/out/c\\#.h: \\\n'
+        '  /src/C.idl\n')
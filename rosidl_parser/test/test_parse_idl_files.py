@@ -0,0 +1,77 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pathlib
+import pickle
+
+import pytest
+from rosidl_parser.definition import Action
+from rosidl_parser.definition import IdlFile
+from rosidl_parser.definition import IdlLocator
+from rosidl_parser.definition import Message
+from rosidl_parser.definition import Service
+from rosidl_parser.parser import IdlParseError
+from rosidl_parser.parser import parse_idl_files
+
+TEST_PATH = pathlib.Path(__file__).parent
+
+LOCATORS = [
+    IdlLocator(TEST_PATH, pathlib.Path('msg') / 'MyMessage.idl'),
+    IdlLocator(TEST_PATH, pathlib.Path('srv') / 'MyService.idl'),
+    IdlLocator(TEST_PATH, pathlib.Path('action') / 'MyAction.idl'),
+]
+ELEMENT_TYPES = [Message, Service, Action]
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_parse_idl_files_order(jobs):
+    idl_files = parse_idl_files(LOCATORS * 2, jobs=jobs)
+    assert len(idl_files) == 2 * len(LOCATORS)
+    for idl_file, locator, element_type in zip(
+        idl_files, LOCATORS * 2, ELEMENT_TYPES * 2
+    ):
+        assert isinstance(idl_file, IdlFile)
+        assert idl_file.locator.get_absolute_path() == locator.get_absolute_path()
+        assert len(idl_file.content.get_elements_of_type(element_type)) == 1
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_parse_idl_files_errors(tmp_path, jobs):
+    (tmp_path / 'Invalid.idl').write_text('module pkg { struct }')
+    locators = [
+        LOCATORS[0],
+        IdlLocator(tmp_path, 'Invalid.idl'),
+        IdlLocator(tmp_path, 'Missing.idl'),
+        LOCATORS[1],
+    ]
+    results = parse_idl_files(locators, jobs=jobs)
+    assert isinstance(results[0], IdlFile)
+    assert isinstance(results[1], IdlParseError)
+    assert results[1].locator.get_absolute_path() == tmp_path / 'Invalid.idl'
+    assert 'Invalid.idl' in str(results[1])
+    assert isinstance(results[2], IdlParseError)
+    assert 'FileNotFoundError' in results[2].message
+    assert isinstance(results[3], IdlFile)
+
+
+def test_parse_idl_error_pickle():
+    error = IdlParseError(LOCATORS[0], 'reason')
+    unpickled_error = pickle.loads(pickle.dumps(error))
+    assert str(unpickled_error) == str(error)
+
+
+def test_parse_idl_files_invalid_jobs():
+    with pytest.raises(ValueError):
+        parse_idl_files(LOCATORS, jobs=0)
+    assert parse_idl_files([], jobs=4) == []
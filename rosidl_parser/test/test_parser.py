@@ -30,9 +30,11 @@ from rosidl_parser.definition import SERVICE_EVENT_MESSAGE_SUFFIX
 from rosidl_parser.definition import UnboundedSequence
 from rosidl_parser.definition import UnboundedString
 from rosidl_parser.definition import UnboundedWString
+from rosidl_parser.parser import collect_definitions
 from rosidl_parser.parser import get_ast_from_idl_string
 from rosidl_parser.parser import get_string_literals_value
 from rosidl_parser.parser import parse_idl_file
+from rosidl_parser.parser import parse_idl_string
 
 MESSAGE_IDL_LOCATOR = IdlLocator(
     pathlib.Path(__file__).parent, pathlib.Path('msg') / 'MyMessage.idl')
@@ -482,3 +484,44 @@ def test_action_parser(action_idl_file):
         action.feedback.structure.namespaced_type.namespaces
     assert structure.members[1].type.name == \
         action.feedback.structure.namespaced_type.name
+
+
+def test_collect_definitions():
+    ast = get_ast_from_idl_string(
+        '#include "pkg/msg/Bar.idl"\n'
+        'module pkg {\n'
+        '  module msg {\n'
+        '    module Foo_Constants { const int32 A = 1; };\n'
+        '    typedef int32 int32__3[3];\n'
+        '    struct Foo { int32__3 bar; };\n'
+        '  };\n'
+        '  const int32 B = 2;\n'
+        '};\n')
+    definitions = collect_definitions(ast)
+    assert [
+        (node.data, module_identifiers)
+        for data in ('include_directive', 'const_dcl', 'typedef_dcl', 'struct_def')
+        for node, module_identifiers in definitions[data]
+    ] == [
+        ('include_directive', []),
+        ('const_dcl', ['pkg', 'msg', 'Foo_Constants']),
+        ('const_dcl', ['pkg']),
+        ('typedef_dcl', ['pkg', 'msg']),
+        ('struct_def', ['pkg', 'msg']),
+    ]
+
+
+def test_message_parser_many_declarations():
+    count = 2000
+    idl_string = (
+        'module pkg { module msg { module Foo_Constants {' +
+        ''.join(f'const int32 C{i} = {i};' for i in range(count)) +
+        '}; struct Foo {' +
+        ''.join(f'int32 m{i};' for i in range(count)) +
+        '}; }; };')
+    content = parse_idl_string(idl_string)
+    messages = content.get_elements_of_type(Message)
+    assert len(messages) == 1
+    assert [c.value for c in messages[0].constants] == list(range(count))
+    assert [m.name for m in messages[0].structure.members] == \
+        [f'm{i}' for i in range(count)]
@@ -0,0 +1,123 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pathlib
+
+from lark.exceptions import LarkError
+import pytest
+from rosidl_parser import parser
+from rosidl_parser.definition import IdlContent
+from rosidl_parser.parser import extract_content_from_ast
+from rosidl_parser.parser import get_ast_from_idl_string
+
+TEST_PATH = pathlib.Path(__file__).parent
+REPOSITORY_PATH = TEST_PATH.parent.parent
+
+IDL_FILES = sorted(
+    path
+    for basepath in (
+        TEST_PATH,
+        REPOSITORY_PATH / 'rosidl_generator_tests' / 'msg',
+        REPOSITORY_PATH / 'rosidl_adapter' / 'test' / 'data',
+    )
+    for path in basepath.glob('**/*.idl')
+)
+
+
+def _as_comparable(value):
+    """Convert parsed content into nested builtin containers for comparison."""
+    if isinstance(value, (list, tuple)):
+        return [_as_comparable(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _as_comparable(v) for k, v in value.items()}
+    slots = []
+    for cls in type(value).__mro__:
+        cls_slots = getattr(cls, '__slots__', ())
+        # some definitions use a plain string for a single slot
+        if isinstance(cls_slots, str):
+            cls_slots = (cls_slots, )
+        slots.extend(cls_slots)
+    if not slots:
+        return value
+    return (type(value).__name__, {
+        slot: _as_comparable(getattr(value, slot)) for slot in slots
+    })
+
+
+def test_idl_files_found():
+    assert len(IDL_FILES) >= 4
+
+
+@pytest.mark.parametrize('idl_file', IDL_FILES, ids=lambda p: p.stem)
+def test_lalr_and_earley_content_parity(idl_file):
+    idl_string = idl_file.read_text(encoding='utf-8')
+    lalr_content = extract_content_from_ast(
+        get_ast_from_idl_string(idl_string, mode='lalr'))
+    earley_content = extract_content_from_ast(
+        get_ast_from_idl_string(idl_string, mode='earley'))
+    assert isinstance(lalr_content, IdlContent)
+    assert _as_comparable(lalr_content) == _as_comparable(earley_content)
+
+
+def test_auto_mode_falls_back_to_earley():
+    # shift operators are not part of the LALR grammar
+    idl_string = 'const int32 SHIFTED = 1 << 2;'
+    with pytest.raises(LarkError):
+        get_ast_from_idl_string(idl_string, mode='lalr')
+    assert get_ast_from_idl_string(idl_string, mode='auto') == \
+        get_ast_from_idl_string(idl_string, mode='earley')
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        get_ast_from_idl_string('const int32 FOO = 1;', mode='cyk')
+
+
+@pytest.fixture
+def parser_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(parser.PARSER_CACHE_DIR_ENV_VAR, str(tmp_path))
+    monkeypatch.setattr(parser, '_lalr_parser', None)
+    return tmp_path
+
+
+def test_lalr_parser_cache(parser_cache_dir):
+    cache_file = parser.get_lalr_parser_cache_file()
+    assert cache_file.parent == parser_cache_dir
+    assert not cache_file.exists()
+
+    idl_string = (TEST_PATH / 'msg' / 'MyMessage.idl').read_text(encoding='utf-8')
+    tree = get_ast_from_idl_string(idl_string, mode='lalr')
+    assert cache_file.exists()
+    # no temporary files are left behind
+    assert list(parser_cache_dir.iterdir()) == [cache_file]
+
+    # a new process would load the parser from the cache
+    parser._lalr_parser = None
+    assert get_ast_from_idl_string(idl_string, mode='lalr') == tree
+
+
+def test_lalr_parser_invalid_cache(parser_cache_dir):
+    cache_file = parser.get_lalr_parser_cache_file()
+    cache_file.write_bytes(b'truncated')
+
+    assert get_ast_from_idl_string('const int32 FOO = 1;', mode='lalr')
+    assert cache_file.read_bytes() != b'truncated'
+
+
+def test_lalr_parser_cache_disabled(parser_cache_dir, monkeypatch):
+    monkeypatch.setenv(parser.PARSER_CACHE_DIR_ENV_VAR, '')
+    assert parser.get_lalr_parser_cache_file() is None
+
+    assert get_ast_from_idl_string('const int32 FOO = 1;', mode='lalr')
+    assert not list(parser_cache_dir.iterdir())
@@ -0,0 +1,99 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import pathlib
+
+import pytest
+from rosidl_parser import cache
+from rosidl_parser import profiling
+from rosidl_parser.definition import IdlLocator
+from rosidl_parser.parser import parse_idl_file
+
+MESSAGE_IDL_LOCATOR = IdlLocator(
+    pathlib.Path(__file__).parent, pathlib.Path('msg') / 'MyMessage.idl')
+
+
+@pytest.fixture
+def profiling_enabled(tmp_path, monkeypatch):
+    monkeypatch.setenv(profiling.PROFILE_DIR_ENV_VAR, str(tmp_path))
+    monkeypatch.setattr(profiling, '_events', [])
+    # don't write the events when the test process exits
+    monkeypatch.setattr(profiling, '_writer_pid', os.getpid())
+    return tmp_path
+
+
+def test_phase_disabled(monkeypatch):
+    monkeypatch.setattr(profiling, '_events', None)
+    assert not profiling.is_enabled()
+    with profiling.phase('parse_idl_file', 'foo.idl'):
+        pass
+    assert profiling.phase('other') is profiling.phase('parse_idl_file')
+    assert profiling.get_events() == []
+
+
+def test_parse_idl_file_phases(profiling_enabled, monkeypatch):
+    monkeypatch.delenv(cache.CONTENT_CACHE_DIR_ENV_VAR, raising=False)
+    assert profiling.is_enabled()
+    parse_idl_file(MESSAGE_IDL_LOCATOR)
+
+    events = profiling.get_events()
+    assert [event['name'] for event in events] == [
+        'read_idl_file', 'lark_parse', 'extract_content', 'parse_idl_file']
+    path = str(MESSAGE_IDL_LOCATOR.get_absolute_path())
+    assert events[0]['args'] == {'file': path}
+    assert events[-1]['args'] == {'file': path}
+    # the nested phases are within the phase of the whole file
+    for event in events[:-1]:
+        assert event['ts'] >= events[-1]['ts']
+        assert event['ts'] + event['dur'] <= events[-1]['ts'] + events[-1]['dur']
+    for event in events:
+        assert event['ph'] == 'X'
+        assert event['pid'] == os.getpid()
+
+
+def test_write_and_read_events(profiling_enabled, tmp_path):
+    with profiling.phase('first', 'a.idl'):
+        pass
+    with profiling.phase('second'):
+        pass
+    profiling.write_process_events()
+    assert profiling.get_events() == []
+    assert len(list(profiling_enabled.glob(f'*{profiling.TRACE_FILE_SUFFIX}'))) == 1
+
+    events = profiling.read_events(profiling_enabled)
+    assert [event['name'] for event in events] == ['first', 'second']
+
+    trace_file = tmp_path / 'trace.json'
+    profiling.write_trace(trace_file, events)
+    with trace_file.open('r') as h:
+        assert json.load(h)['traceEvents'] == events
+
+
+def test_summary():
+    events = [
+        {'name': 'parse_idl_file', 'dur': 3000, 'args': {'file': 'a.idl'}},
+        {'name': 'parse_idl_file', 'dur': 5000, 'args': {'file': 'b.idl'}},
+        {'name': 'lark_parse', 'dur': 1000},
+    ]
+    summary = profiling.get_summary(events)
+    assert summary == {
+        'parse_idl_file': {'count': 2, 'total': 8.0, 'max': 5.0, 'max_file': 'b.idl'},
+        'lark_parse': {'count': 1, 'total': 1.0, 'max': 1.0, 'max_file': None},
+    }
+    lines = profiling.format_summary(summary).splitlines()
+    assert len(lines) == 3
+    assert lines[1].split() == ['parse_idl_file', '2', '8.0', '4.00', '5.00', 'b.idl']
+    assert lines[2].split() == ['lark_parse', '1', '1.0', '1.00', '1.00']
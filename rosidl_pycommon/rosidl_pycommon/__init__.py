@@ -12,13 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+import hashlib
 from io import StringIO
 import json
 import os
 import pathlib
 import re
 import sys
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
 import em
 
@@ -28,7 +32,12 @@ try:
 except ImportError:
     em_has_configuration = False
 
+from rosidl_parser import profiling
+from rosidl_parser.cache import get_parser_version
+from rosidl_parser.definition import IdlFile
 from rosidl_parser.definition import IdlLocator
+from rosidl_parser.files import write_depfile
+from rosidl_parser.files import write_file_atomically
 from rosidl_parser.parser import parse_idl_file
 
 
@@ -61,9 +70,58 @@ def get_newest_modification_time(
 def generate_files(
     generator_arguments_file: str, mapping: Dict[str, str],
     additional_context: Optional[Dict[str, bool]] = None,
-    keep_case: bool = False, post_process_callback: Optional[Callable[[str], str]] = None
+    keep_case: bool = False, post_process_callback: Optional[Callable[[str], str]] = None,
+    jobs: Optional[int] = None, incremental: Optional[bool] = None,
+    depfile: Optional[str] = None
 ) -> List[str]:
-    args = read_generator_arguments(generator_arguments_file)
+    """
+    Generate files for all .idl files listed in the generator arguments file.
+
+    In incremental mode a manifest next to the generator arguments file
+    records a digest of all inputs of each .idl file.
+    The parsing and expansion is skipped for .idl files whose inputs didn't
+    change since the previous invocation.
+
+    :param generator_arguments_file: the path of the generator arguments file
+    :param mapping: a mapping of template file names to generated file name
+      patterns
+    :param additional_context: additional data passed to each template
+    :param keep_case: if False the .idl file stem is converted to lower case
+      with underscores
+    :param post_process_callback: a function applied to each expanded
+      template, it must be picklable if more than one job is used
+    :param jobs: the number of processes to parse the .idl files and expand
+      the templates in, defaults to the value of the 'jobs' key in the
+      generator arguments file or 1
+    :param incremental: whether to skip unchanged .idl files, defaults to the
+      value of the 'incremental' key in the generator arguments file or False
+    :param depfile: the path of a Makefile style dependency file listing the
+      files the generated files of each .idl file have been generated from,
+      defaults to the value of the 'depfile' key in the generator arguments
+      file, if neither is set no dependency file is written
+    :returns: the paths of the generated files, in the order of the .idl
+      files and the mapping independent of the number of jobs
+    """
+    # let a generation server do the work if one is available, see rosidl_pycommon.server,
+    # unless the parsed .idl files are shared with the other calls in this process
+    if _shared_idl_files is None:
+        from rosidl_pycommon.server import forward_generate_files
+        forwarded_generated_files = forward_generate_files(
+            generator_arguments_file, mapping, additional_context, keep_case,
+            post_process_callback, jobs, incremental, depfile)
+        if forwarded_generated_files is not None:
+            return forwarded_generated_files
+
+    with profiling.phase('read_generator_arguments', generator_arguments_file):
+        args = read_generator_arguments(generator_arguments_file)
+    if jobs is None:
+        jobs = int(args.get('jobs', 1))
+    if jobs < 1:
+        raise ValueError(f'The number of jobs must be positive, not {jobs}')
+    if incremental is None:
+        incremental = _is_true(args.get('incremental', False))
+    if depfile is None:
+        depfile = args.get('depfile')
 
     template_basepath = pathlib.Path(args['template_dir'])
     for template_filename in mapping.keys():
@@ -71,7 +129,6 @@ def generate_files(
             'Could not find template: ' + template_filename
 
     latest_target_timestamp = get_newest_modification_time(args['target_dependencies'])
-    generated_files: List[str] = []
 
     type_description_files = {}
     for description_tuple in args.get('type_description_tuples', []):
@@ -85,32 +142,284 @@ def generate_files(
         key = (p.suffix[1:], p.stem)
         ros_interface_files[key] = p
 
-    for idl_tuple in args.get('idl_tuples', []):
-        idl_parts = idl_tuple.rsplit(':', 1)
-        assert len(idl_parts) == 2
-        locator = IdlLocator(*idl_parts)
-        idl_rel_path = pathlib.Path(idl_parts[1])
+    generate_idl_tuple_files = partial(
+        _generate_idl_tuple_files,
+        package_name=args['package_name'], output_dir=args['output_dir'],
+        mapping=mapping, template_basepath=template_basepath,
+        minimum_timestamp=latest_target_timestamp,
+        type_description_files=type_description_files,
+        ros_interface_files=ros_interface_files,
+        additional_context=additional_context, keep_case=keep_case,
+        post_process_callback=post_process_callback)
+
+    idl_tuples = args.get('idl_tuples', [])
+    generated_files_per_idl_tuple: Dict[str, List[str]] = {}
+    dependencies_per_idl_tuple: Dict[str, List[str]] = {}
+    pending_idl_tuples = idl_tuples
+    if incremental:
+        generation_digest = _get_generation_digest(
+            args, mapping, template_basepath, additional_context, keep_case,
+            post_process_callback)
+        manifest_file = get_manifest_path(generator_arguments_file, generation_digest)
+        previous_manifest = _read_manifest(manifest_file)
+        idl_tuple_digests = {
+            idl_tuple: _get_idl_tuple_digest(
+                generation_digest, idl_tuple, type_description_files,
+                ros_interface_files)
+            for idl_tuple in idl_tuples}
+        pending_idl_tuples = []
+        for idl_tuple in idl_tuples:
+            entry = previous_manifest.get(idl_tuple)
+            if _is_up_to_date(entry, idl_tuple_digests[idl_tuple]):
+                assert entry is not None
+                # the content is up-to-date, only the build tool needs to be
+                # told by updating the timestamps
+                _touch_outdated_files(
+                    entry['generated_files'],
+                    _get_newest_timestamp(latest_target_timestamp, entry['dependencies']))
+                generated_files_per_idl_tuple[idl_tuple] = entry['generated_files']
+                dependencies_per_idl_tuple[idl_tuple] = entry['dependencies']
+            else:
+                pending_idl_tuples.append(idl_tuple)
+
+    jobs = min(jobs, len(pending_idl_tuples))
+    if jobs <= 1:
+        with _reusing_interpreter():
+            results = [
+                generate_idl_tuple_files(idl_tuple) for idl_tuple in pending_idl_tuples]
+    else:
+        # each worker process has its own interpreter and template lookup state
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_reset_expansion_state
+        ) as executor:
+            results = list(executor.map(
+                partial(_call_in_worker, generate_idl_tuple_files),
+                pending_idl_tuples))
+    for idl_tuple, (idl_tuple_generated_files, dependencies) in zip(
+        pending_idl_tuples, results
+    ):
+        generated_files_per_idl_tuple[idl_tuple] = idl_tuple_generated_files
+        dependencies_per_idl_tuple[idl_tuple] = dependencies
+
+    if incremental:
+        _write_manifest(manifest_file, {
+            idl_tuple: {
+                'digest': idl_tuple_digests[idl_tuple],
+                'generated_files': generated_files_per_idl_tuple[idl_tuple],
+                'dependencies': dependencies_per_idl_tuple[idl_tuple],
+            } for idl_tuple in idl_tuples})
+        _remove_stale_manifests(manifest_file)
+
+    if depfile:
+        write_depfile(pathlib.Path(depfile), [
+            (generated_files_per_idl_tuple[idl_tuple], dependencies_per_idl_tuple[idl_tuple])
+            for idl_tuple in idl_tuples])
+
+    generated_files: List[str] = []
+    for idl_tuple in idl_tuples:
+        generated_files += generated_files_per_idl_tuple[idl_tuple]
+    return generated_files
+
 
-        type_description_info = None
-        if type_description_files:
-            type_hash_file = type_description_files[idl_parts[1]]
+# the version of the manifest format and the way digests are calculated
+MANIFEST_FORMAT_VERSION = 2
+
+
+def get_manifest_path(generator_arguments_file: str, generation_digest: str) -> pathlib.Path:
+    """
+    Get the path of the manifest used by the incremental mode.
+
+    The manifest isn't placed in the output directory since those are
+    commonly installed as a whole.
+
+    :param generator_arguments_file: the path of the generator arguments file
+    :param generation_digest: the digest of the inputs shared by all .idl
+      files, a different digest, e.g. after the templates changed, results in
+      a new manifest replacing the previous one
+    :returns: the path of the manifest file
+    """
+    path = pathlib.Path(generator_arguments_file)
+    return path.parent / f'{path.stem}__{generation_digest[:16]}{_MANIFEST_FILE_SUFFIX}'
+
+
+_MANIFEST_FILE_SUFFIX = '.manifest.json'
+
+
+def _is_true(value: Any) -> bool:
+    if isinstance(value, str):
+        # the generator arguments file contains CMake booleans as strings
+        return value.upper() in ('1', 'ON', 'TRUE', 'Y', 'YES')
+    return bool(value)
+
+
+def _update_digest_with_file(digest: Any, path: pathlib.Path) -> None:
+    digest.update(str(path).encode('utf-8') + b'\0')
+    digest.update(path.read_bytes())
+    digest.update(b'\0')
+
+
+def _get_generation_digest(
+    args: Dict[str, Any], mapping: Dict[str, str], template_basepath: pathlib.Path,
+    additional_context: Optional[Dict[str, bool]], keep_case: bool,
+    post_process_callback: Optional[Callable[[str], str]]
+) -> str:
+    """Get the digest of all inputs which affect every generated file."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([
+        MANIFEST_FORMAT_VERSION,
+        args['package_name'],
+        args['output_dir'],
+        sorted(mapping.items()),
+        keep_case,
+        None if post_process_callback is None else
+        f'{post_process_callback.__module__}.{post_process_callback.__qualname__}',
+    ]).encode('utf-8'))
+    digest.update(json.dumps(
+        additional_context, sort_keys=True, default=repr).encode('utf-8'))
+    # all templates including the ones only expanded from other templates
+    for template_path in sorted(template_basepath.glob('*.em')):
+        _update_digest_with_file(digest, template_path)
+    # the generator version is determined by the generator sources, the .idl
+    # files are covered per .idl tuple
+    for dependency in sorted(args.get('target_dependencies', [])):
+        path = pathlib.Path(dependency)
+        if path.suffix not in ('.em', '.idl'):
+            _update_digest_with_file(digest, path)
+    _update_digest_with_file(digest, pathlib.Path(__file__))
+    digest.update(get_parser_version().encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _get_idl_tuple_digest(
+    generation_digest: str, idl_tuple: str, type_description_files: Dict[str, str],
+    ros_interface_files: Dict[Tuple[str, str], pathlib.Path]
+) -> str:
+    """Get the digest of all inputs of the files generated for one .idl file."""
+    idl_parts = idl_tuple.rsplit(':', 1)
+    assert len(idl_parts) == 2
+    locator = IdlLocator(*idl_parts)
+    digest = hashlib.sha256(generation_digest.encode('utf-8'))
+    digest.update(idl_tuple.encode('utf-8') + b'\0')
+    _update_digest_with_file(digest, locator.get_absolute_path())
+    if type_description_files:
+        _update_digest_with_file(
+            digest, pathlib.Path(type_description_files[idl_parts[1]]))
+    type_source_file = _get_type_source_file(locator, ros_interface_files)
+    if type_source_file.exists():
+        _update_digest_with_file(digest, type_source_file)
+    return digest.hexdigest()
+
+
+def _get_newest_timestamp(timestamp: Optional[float], paths: List[str]) -> Optional[float]:
+    newest_timestamp = get_newest_modification_time(paths)
+    if timestamp is None or (newest_timestamp is not None and newest_timestamp > timestamp):
+        return newest_timestamp
+    return timestamp
+
+
+def _is_up_to_date(entry: Optional[Dict[str, Any]], digest: str) -> bool:
+    if entry is None or entry.get('digest') != digest:
+        return False
+    return all(
+        os.path.exists(path) for path in entry['generated_files'] + entry['dependencies'])
+
+
+def _touch_outdated_files(paths: List[str], minimum_timestamp: Optional[float]) -> None:
+    # the generated files must be newer than the files they are generated from
+    if minimum_timestamp is None:
+        return
+    for path in paths:
+        if os.path.getmtime(path) <= minimum_timestamp:
+            os.utime(path)
+
+
+def _read_manifest(manifest_file: pathlib.Path) -> Dict[str, Dict[str, Any]]:
+    try:
+        with manifest_file.open('r', encoding='utf-8') as h:
+            manifest = json.load(h)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or \
+            manifest.get('format_version') != MANIFEST_FORMAT_VERSION:
+        return {}
+    return manifest.get('idl_tuples', {})
+
+
+def _write_manifest(
+    manifest_file: pathlib.Path, entries: Dict[str, Dict[str, Any]]
+) -> None:
+    manifest = {
+        'format_version': MANIFEST_FORMAT_VERSION,
+        'idl_tuples': entries,
+    }
+    try:
+        write_file_atomically(
+            manifest_file, json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    except OSError:
+        # without a manifest the next invocation only generates all files again
+        pass
+
+
+def _remove_stale_manifests(manifest_file: pathlib.Path) -> None:
+    # the manifests of the same arguments file with a different generation digest
+    stem = manifest_file.name[:-len(_MANIFEST_FILE_SUFFIX)].rsplit('__', 1)[0]
+    pattern = re.compile(re.escape(stem) + '__[0-9a-f]{16}' + re.escape(_MANIFEST_FILE_SUFFIX))
+    for path in manifest_file.parent.glob(f'{stem}__*{_MANIFEST_FILE_SUFFIX}'):
+        if path != manifest_file and pattern.fullmatch(path.name):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def _generate_idl_tuple_files(
+    idl_tuple: str, *, package_name: str, output_dir: str, mapping: Dict[str, str],
+    template_basepath: pathlib.Path, minimum_timestamp: Optional[float],
+    type_description_files: Dict[str, str],
+    ros_interface_files: Dict[Tuple[str, str], pathlib.Path],
+    additional_context: Optional[Dict[str, bool]], keep_case: bool,
+    post_process_callback: Optional[Callable[[str], str]]
+) -> Tuple[List[str], List[str]]:
+    """
+    Generate the files of a single .idl file.
+
+    :returns: the paths of the generated files and of the files they have been
+      generated from
+    """
+    idl_parts = idl_tuple.rsplit(':', 1)
+    assert len(idl_parts) == 2
+    locator = IdlLocator(*idl_parts)
+    idl_rel_path = pathlib.Path(idl_parts[1])
+    dependencies = [os.path.abspath(locator.get_absolute_path())]
+
+    type_description_info = None
+    if type_description_files:
+        type_hash_file = type_description_files[idl_parts[1]]
+        dependencies.append(os.path.abspath(type_hash_file))
+        with profiling.phase('load_type_description', type_hash_file):
             with open(type_hash_file, 'r') as f:
                 type_description_info = json.load(f)
 
-        idl_stem = idl_rel_path.stem
-        type_source_key = (idl_rel_path.parts[-2], idl_stem)
-        type_source_file = ros_interface_files.get(type_source_key, locator.get_absolute_path())
-        if not keep_case:
-            idl_stem = convert_camel_case_to_lower_case_underscore(idl_stem)
+    idl_stem = idl_rel_path.stem
+    type_source_file = _get_type_source_file(locator, ros_interface_files)
+    if type_source_file != locator.get_absolute_path() and type_source_file.exists():
+        dependencies.append(os.path.abspath(type_source_file))
+    if not keep_case:
+        idl_stem = convert_camel_case_to_lower_case_underscore(idl_stem)
+    # unchanged generated files still need to be newer than their inputs
+    minimum_timestamp = _get_newest_timestamp(minimum_timestamp, dependencies)
+    generated_files: List[str] = []
+    with profiling.phase('generate_idl_tuple_files', locator.get_absolute_path()), \
+            _recording_read_templates() as template_paths:
         try:
-            idl_file = parse_idl_file(locator)
+            idl_file = _parse_idl_file(locator)
             for template_file, generated_filename in mapping.items():
                 generated_file = os.path.join(
-                    args['output_dir'], str(idl_rel_path.parent),
+                    output_dir, str(idl_rel_path.parent),
                     generated_filename % idl_stem)
                 generated_files.append(generated_file)
                 data = {
-                    'package_name': args['package_name'],
+                    'package_name': package_name,
                     'interface_path': idl_rel_path,
                     'content': idl_file.content,
                     'type_description_info': type_description_info,
@@ -120,7 +429,7 @@ def generate_files(
                     data.update(additional_context)
                 expand_template(
                     os.path.basename(template_file), data,
-                    generated_file, minimum_timestamp=latest_target_timestamp,
+                    generated_file, minimum_timestamp=minimum_timestamp,
                     template_basepath=template_basepath,
                     post_process_callback=post_process_callback)
         except Exception as e:
@@ -128,47 +437,206 @@ def generate_files(
                 'Error processing idl file: ' +
                 str(locator.get_absolute_path()), file=sys.stderr)
             raise e
+    # the templates expanded from other templates are only known afterwards
+    dependencies += sorted(os.path.abspath(path) for path in template_paths)
+    return generated_files, dependencies
+
+
+# the parsed .idl files keyed on their absolute path, see sharing_parsed_idl_files()
+_shared_idl_files: Optional[Dict[str, IdlFile]] = None
+
+
+@contextmanager
+def sharing_parsed_idl_files() -> Iterator[None]:
+    """
+    Parse each .idl file only once for all generate_files() calls within the context.
+
+    This allows running multiple generators in the same process without
+    parsing the same files again for each of them, see
+    :py:mod:`rosidl_pycommon.fan_out`.
+    The parsed content is shared between the generators, therefore the
+    templates must not modify it.
+    It is only shared within the current process, not with the worker
+    processes used for more than one job, therefore the calls within the
+    context aren't forwarded to a generator server either.
+    """
+    global _shared_idl_files
+    if _shared_idl_files is not None:
+        yield
+        return
+    _shared_idl_files = {}
+    try:
+        yield
+    finally:
+        _shared_idl_files = None
 
-    return generated_files
+
+def _parse_idl_file(locator: IdlLocator) -> IdlFile:
+    if _shared_idl_files is None:
+        return parse_idl_file(locator)
+    key = str(locator.get_absolute_path())
+    idl_file = _shared_idl_files.get(key)
+    if idl_file is None:
+        idl_file = parse_idl_file(locator)
+        _shared_idl_files[key] = idl_file
+    return idl_file
+
+
+def _get_type_source_file(
+    locator: IdlLocator, ros_interface_files: Dict[Tuple[str, str], pathlib.Path]
+) -> pathlib.Path:
+    type_source_key = (locator.relative_path.parts[-2], locator.relative_path.stem)
+    return ros_interface_files.get(type_source_key, locator.get_absolute_path())
+
+
+def _reset_expansion_state() -> None:
+    global interpreter
+    global template_prefix_path
+    global _keep_interpreter
+    interpreter = None
+    template_prefix_path = []
+    clear_template_cache()
+    # a worker process only expands templates
+    _keep_interpreter = True
+
+
+def _call_in_worker(function: Callable[[str], Any], argument: str) -> Any:
+    try:
+        return function(argument)
+    except Exception as e:
+        # not all exceptions can be passed back to the parent process,
+        # the details have already been printed by the worker
+        raise RuntimeError(f'{e.__class__.__name__}: {e}') from None
 
 
 template_prefix_path: List[pathlib.Path] = []
 
+# resolved template paths keyed on the template prefix path and name
+_template_path_cache: Dict[Tuple[Tuple[pathlib.Path, ...], str], pathlib.Path] = {}
+# template content keyed on the resolved template path
+_template_content_cache: Dict[pathlib.Path, str] = {}
+_template_cache_statistics: Dict[str, int] = {}
+
+
+def get_template_cache_statistics() -> Dict[str, int]:
+    """
+    Get the number of hits and misses of the in-process template caches.
+
+    :returns: a dictionary with the counters for the template path lookups,
+      the template content reads and the interpreter instances
+    """
+    return dict(_template_cache_statistics)
+
+
+def clear_template_cache() -> None:
+    """Clear the in-process template caches, e.g. after templates changed."""
+    _template_path_cache.clear()
+    _template_content_cache.clear()
+    _template_cache_statistics.update({
+        'path_hits': 0,
+        'path_misses': 0,
+        'content_hits': 0,
+        'content_misses': 0,
+        'interpreter_reuses': 0,
+        'interpreter_creations': 0,
+    })
+
+
+clear_template_cache()
+
 
 def get_template_path(template_name: str) -> pathlib.Path:
     global template_prefix_path
+    key = (tuple(template_prefix_path), template_name)
+    template_path = _template_path_cache.get(key)
+    if template_path is not None:
+        _template_cache_statistics['path_hits'] += 1
+        return template_path
+    _template_cache_statistics['path_misses'] += 1
     for basepath in template_prefix_path:
         template_path = basepath / template_name
         if template_path.exists():
+            _template_path_cache[key] = template_path
             return template_path
     raise RuntimeError(f"Failed to find template '{template_name}'")
 
 
+# the paths of the read templates if recorded, see _recording_read_templates()
+_read_template_paths: Optional[Set[pathlib.Path]] = None
+
+
+@contextmanager
+def _recording_read_templates() -> Iterator[Set[pathlib.Path]]:
+    """Record the paths of all templates read within the context."""
+    global _read_template_paths
+    previous_read_template_paths = _read_template_paths
+    _read_template_paths = set()
+    try:
+        yield _read_template_paths
+    finally:
+        _read_template_paths = previous_read_template_paths
+
+
+def _read_template(template_path: pathlib.Path) -> str:
+    if _read_template_paths is not None:
+        _read_template_paths.add(template_path)
+    template_content = _template_content_cache.get(template_path)
+    if template_content is not None:
+        _template_cache_statistics['content_hits'] += 1
+        return template_content
+    _template_cache_statistics['content_misses'] += 1
+    with template_path.open('r') as h:
+        template_content = h.read()
+    _template_content_cache[template_path] = template_content
+    return template_content
+
+
 interpreter = None
+_interpreter_output: Optional[StringIO] = None
+# if the interpreter is kept for subsequent expansions
+_keep_interpreter = False
 
 
-def expand_template(
-    template_name: str, data: Dict[str, Any], output_file: str,
-    minimum_timestamp: Optional[float] = None,
-    template_basepath: Optional[pathlib.Path] = None,
-    post_process_callback: Optional[Callable[[str], str]] = None
-) -> None:
-    # in the legacy API the first argument was the path to the template
-    if template_basepath is None:
-        template_path = pathlib.Path(template_name)
-        template_basepath = template_path.parent
-        template_name = template_path.name
+@contextmanager
+def _reusing_interpreter() -> Iterator[None]:
+    """
+    Reuse a single interpreter for all expansions within the context.
+
+    The interpreter isn't kept beyond the context since it redirects the
+    standard output while it exists.
+    """
+    global _keep_interpreter
+    _keep_interpreter = True
+    try:
+        yield
+    finally:
+        _keep_interpreter = False
+        _shutdown_interpreter()
 
-    global template_prefix_path
-    template_prefix_path.append(template_basepath)
-    template_path = get_template_path(template_name)
 
+def _get_interpreter(template_path: pathlib.Path) -> Any:
     global interpreter
-    output = StringIO()
+    global _interpreter_output
+    if interpreter is not None:
+        _template_cache_statistics['interpreter_reuses'] += 1
+        # start each expansion with an empty output
+        assert _interpreter_output is not None
+        _interpreter_output.seek(0)
+        _interpreter_output.truncate()
+        if em_has_configuration:
+            # the root context is named after the template
+            interpreter.root = template_path
+            interpreter.reset(True)
+        else:
+            interpreter.reset()
+        return interpreter
+
+    _template_cache_statistics['interpreter_creations'] += 1
+    _interpreter_output = StringIO()
     if em_has_configuration:
         config = Configuration(
             defaultRoot=template_path,
-            defaultStdout=output,
+            defaultStdout=_interpreter_output,
             deleteOnError=True,
             rawErrors=True,
             useProxy=True)
@@ -177,28 +645,62 @@ def expand_template(
             dispatcher=False)
     else:
         interpreter = em.Interpreter(
-            output=output,
+            output=_interpreter_output,
             options={
                 em.BUFFERED_OPT: True,
                 em.RAW_OPT: True,
             },
         )
+    return interpreter
+
+
+def _shutdown_interpreter() -> None:
+    global interpreter
+    if interpreter is not None:
+        interpreter.shutdown()
+        interpreter = None
+
+
+_OUTPUT_FILE_CHUNK_SIZE = 1024 * 1024
+
+
+def expand_template(
+    template_name: str, data: Dict[str, Any], output_file: str,
+    minimum_timestamp: Optional[float] = None,
+    template_basepath: Optional[pathlib.Path] = None,
+    post_process_callback: Optional[Callable[[str], str]] = None,
+    digest_file_suffix: Optional[str] = None
+) -> None:
+    # in the legacy API the first argument was the path to the template
+    if template_basepath is None:
+        template_path = pathlib.Path(template_name)
+        template_basepath = template_path.parent
+        template_name = template_path.name
+
+    global template_prefix_path
+    template_prefix_path.append(template_basepath)
+    template_path = get_template_path(template_name)
+
+    interpreter = _get_interpreter(template_path)
 
     # create copy before manipulating
     data = dict(data)
     _add_helper_functions(data)
 
     try:
-        with template_path.open('r') as h:
-            template_content = h.read()
+        template_content = _read_template(template_path)
+        with profiling.phase('expand_template', output_file):
             interpreter.invoke(
-                'beforeFile', name=template_name, file=h, locals=data)
-        if em_has_configuration:
-            interpreter.string(template_content, locals=data)
-        else:
-            interpreter.string(template_content, template_path, locals=data)
-        interpreter.invoke('afterFile')
+                'beforeFile', name=template_name, file=StringIO(template_content),
+                locals=data)
+            if em_has_configuration:
+                interpreter.string(template_content, locals=data)
+            else:
+                interpreter.string(template_content, template_path, locals=data)
+            interpreter.invoke('afterFile')
     except Exception as e:  # noqa: F841
+        # don't reuse an interpreter in an unknown state
+        _shutdown_interpreter()
         if os.path.exists(output_file):
             os.remove(output_file)
         print(f"{e.__class__.__name__} when expanding '{template_name}' into "
@@ -207,20 +709,38 @@ def expand_template(
     finally:
         template_prefix_path.pop()
 
-    content = output.getvalue()
-    interpreter.shutdown()
+    assert _interpreter_output is not None
+    content = _interpreter_output.getvalue()
+    if not _keep_interpreter:
+        _shutdown_interpreter()
 
     if post_process_callback:
-        content = post_process_callback(content)
+        with profiling.phase('post_process', output_file):
+            content = post_process_callback(content)
+
+    # encode the content the same way as writing it in text mode would
+    if os.linesep != '\n':
+        content = content.replace('\n', os.linesep)
+    data_bytes = content.encode('utf-8')
+    digest = hashlib.sha256(data_bytes).hexdigest()
+    # the digest of the previous content is optionally stored in a sidecar file
+    digest_file = output_file + digest_file_suffix if digest_file_suffix else None
 
     # only overwrite file if necessary
     # which is either when the timestamp is too old or when the content is different
     if os.path.exists(output_file):
-        timestamp = os.path.getmtime(output_file)
-        if minimum_timestamp is None or timestamp > minimum_timestamp:
-            with open(output_file, 'r', encoding='utf-8') as h:
-                if h.read() == content:
-                    return
+        with profiling.phase('compare_output_file', output_file):
+            output_file_digest = _get_output_file_digest(
+                output_file, len(data_bytes), digest_file)
+        if output_file_digest == digest:
+            timestamp = os.path.getmtime(output_file)
+            if minimum_timestamp is None or timestamp > minimum_timestamp:
+                return
+            # the content is the same, only the timestamp needs to be updated
+            os.utime(output_file)
+            if digest_file:
+                write_file_atomically(digest_file, digest.encode('ascii'))
+            return
     else:
         # create folder if necessary
         try:
@@ -228,8 +748,33 @@ def expand_template(
         except FileExistsError:
             pass
 
-    with open(output_file, 'w', encoding='utf-8') as h:
-        h.write(content)
+    with profiling.phase('write_output_file', output_file):
+        write_file_atomically(output_file, data_bytes)
+    if digest_file:
+        write_file_atomically(digest_file, digest.encode('ascii'))
+
+
+def _get_output_file_digest(
+    output_file: str, expected_size: int, digest_file: Optional[str]
+) -> Optional[str]:
+    # a sidecar digest is only valid if it was written after the output file
+    if digest_file:
+        try:
+            if os.path.getmtime(digest_file) >= os.path.getmtime(output_file):
+                with open(digest_file, 'r', encoding='ascii') as h:
+                    return h.read().strip()
+        except (OSError, UnicodeDecodeError):
+            pass
+
+    # files of different size can't have the same content
+    if os.path.getsize(output_file) != expected_size:
+        return None
+    # hash the existing file in chunks rather than reading it into memory
+    sha256 = hashlib.sha256()
+    with open(output_file, 'rb') as h:
+        for chunk in iter(lambda: h.read(_OUTPUT_FILE_CHUNK_SIZE), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
 
 
 def _add_helper_functions(data: Dict[str, Any]) -> None:
@@ -243,10 +788,10 @@ def _expand_template(template_name: str, **kwargs: Any) -> None:
     if interpreter is None:
         raise RuntimeError('_expand_template called before expand_template')
 
-    with template_path.open('r') as h:
-        interpreter.invoke(
-            'beforeInclude', name=str(template_path), file=h, locals=kwargs)
-        content = h.read()
+    content = _read_template(template_path)
+    interpreter.invoke(
+        'beforeInclude', name=str(template_path), file=StringIO(content),
+        locals=kwargs)
     try:
         if em_has_configuration:
             interpreter.string(content, locals=kwargs)
@@ -0,0 +1,132 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Run multiple generators in a single process.
+
+Each generator is a function like ``rosidl_generator_c.generate_c`` taking the
+path of a generator arguments file as first argument.
+All generators share the parsed .idl files, so each file is only parsed once,
+and the imported modules.
+
+Usage::
+
+  python3 -m rosidl_pycommon.fan_out \\
+    --generator rosidl_generator_c:generate_c <arguments file> \\
+    --generator rosidl_generator_cpp:generate_cpp <arguments file>
+"""
+
+import argparse
+import importlib
+import json
+import pathlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+from rosidl_parser.files import write_file_atomically
+from rosidl_pycommon import read_generator_arguments
+from rosidl_pycommon import sharing_parsed_idl_files
+
+
+def get_generator_function(name: str) -> Callable[..., List[str]]:
+    """
+    Import a generator function.
+
+    :param name: the module name and the function name separated by a colon
+    :returns: the function
+    """
+    module_name, _, function_name = name.partition(':')
+    if not module_name or not function_name:
+        raise ValueError(f"Invalid generator function '{name}', expected 'module:function'")
+    module = importlib.import_module(module_name)
+    return getattr(module, function_name)
+
+
+def generate_for_generators(
+    generators: List[Tuple[Callable[..., List[str]], str, Dict[str, Any]]]
+) -> List[List[str]]:
+    """
+    Generate files for multiple generators, parsing each .idl file only once.
+
+    :param generators: tuples of the generator function, the path of its
+      generator arguments file and additional keyword arguments
+    :returns: the paths of the generated files, one list per generator
+    """
+    generated_files = []
+    with sharing_parsed_idl_files():
+        for function, generator_arguments_file, kwargs in generators:
+            generated_files.append(function(generator_arguments_file, **kwargs))
+    return generated_files
+
+
+def combine_depfiles(depfile: str, generator_arguments_files: List[str]) -> None:
+    """
+    Combine the dependency files written by multiple generators into one.
+
+    :param depfile: the path of the combined dependency file
+    :param generator_arguments_files: the paths of the generator arguments
+      files, the dependency files are taken from their 'depfile' keys
+    """
+    content = b''
+    for generator_arguments_file in generator_arguments_files:
+        generator_depfile = read_generator_arguments(generator_arguments_file).get('depfile')
+        if generator_depfile:
+            content += pathlib.Path(generator_depfile).read_bytes()
+    write_file_atomically(pathlib.Path(depfile), content)
+
+
+def _parse_keyword_argument(argument: str) -> Tuple[str, Any]:
+    key, separator, value = argument.partition('=')
+    if not separator or not key.isidentifier():
+        raise ValueError(f"Invalid keyword argument '{argument}', expected 'key=value'")
+    try:
+        return key, json.loads(value)
+    except ValueError:
+        return key, value
+
+
+def main(argv: List[str] = sys.argv[1:]) -> None:
+    parser = argparse.ArgumentParser(
+        description='Run multiple generators in a single process.')
+    parser.add_argument(
+        '--generator', nargs='+', action='append', required=True,
+        metavar='ARG', dest='generators',
+        help='The generator function as module:function, the location of its '
+             'generator arguments file and optional key=value keyword arguments '
+             'with JSON values, e.g. disable_description_codegen=true')
+    parser.add_argument(
+        '--depfile',
+        help='The location of a dependency file combining the dependency '
+             'files of all generators')
+    args = parser.parse_args(argv)
+
+    generators = []
+    for generator_args in args.generators:
+        if len(generator_args) < 2:
+            parser.error(
+                'Each generator needs a function and a generator arguments file')
+        try:
+            generators.append((
+                get_generator_function(generator_args[0]), generator_args[1],
+                dict(map(_parse_keyword_argument, generator_args[2:]))))
+        except (ImportError, AttributeError, ValueError) as e:
+            parser.error(str(e))
+    generate_for_generators(generators)
+    if args.depfile:
+        combine_depfiles(args.depfile, [generator[1] for generator in generators])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,430 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+A local server generating files on behalf of generator processes.
+
+Every generator invocation starts a new Python process, which has to import
+EmPy, Lark, the parser and the generator modules, create the parser and
+compile the templates again.
+A long-lived server started with::
+
+  python3 -m rosidl_pycommon.server --socket /tmp/rosidl_generator.sock
+
+imports these modules and creates the parser once.
+Before handling a request it also imports the generator modules and reads
+the templates of the request, so they stay resident for later requests.
+Each request is then handled concurrently in a process forked from the
+server, so parallel builds aren't serialized and the process global state
+of the template expansion isn't shared between requests.
+Since the templates and the post-processing callbacks are arbitrary code,
+only the user running the server can connect to its socket, and only
+modules of rosidl packages are imported on behalf of a request.
+If the ``ROSIDL_GENERATOR_SERVER_SOCKET`` environment variable is set to the
+path of its Unix socket, :py:func:`rosidl_pycommon.generate_files`, and
+therefore the ``generate_*`` functions of the generators and their command
+line tools, forward their requests to the server.
+The ``ROSIDL_*`` environment variables of the requesting process, e.g. to
+enable profiling or the content cache, apply to its request.
+Whenever the server is not running, not reachable or runs different code
+than the requesting process the files are generated in-process instead.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import pathlib
+import socket
+import socketserver
+import sys
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+from rosidl_parser import profiling
+from rosidl_parser.parser import get_ast_from_idl_string
+
+# The path of the Unix socket of the server
+GENERATOR_SERVER_SOCKET_ENV_VAR = 'ROSIDL_GENERATOR_SERVER_SOCKET'
+GENERATOR_SERVER_PROTOCOL_VERSION = 3
+
+# The prefix of the environment variables forwarded with a request
+_FORWARDED_ENV_VAR_PREFIX = 'ROSIDL_'
+# The prefix of the modules the server imports on behalf of a request
+_ALLOWED_MODULE_PREFIX = 'rosidl_'
+
+# The time in seconds to wait for a client to send its request
+_REQUEST_TIMEOUT = 10.0
+
+# The modification times of the templates read by the server
+_template_stamps: Dict[pathlib.Path, int] = {}
+
+
+class GeneratorServerError(RuntimeError):
+    """An error raised by the server while generating files."""
+
+
+def _is_allowed_module(module_name: str) -> bool:
+    return module_name.startswith(_ALLOWED_MODULE_PREFIX)
+
+
+def _get_callable_name(function: Callable[..., Any]) -> Optional[str]:
+    # only functions which the server can and may import by name can be forwarded
+    name = f'{function.__module__}:{function.__qualname__}'
+    if not _is_allowed_module(function.__module__):
+        return None
+    try:
+        resolved = _resolve_callable_name(name)
+    except (ImportError, AttributeError):
+        return None
+    return name if resolved is function else None
+
+
+def _resolve_callable_name(name: str) -> Callable[..., Any]:
+    module_name, qualname = name.split(':', 1)
+    if not _is_allowed_module(module_name):
+        raise ImportError(f"Module '{module_name}' isn't allowed")
+    function: Any = importlib.import_module(module_name)
+    for attribute in qualname.split('.'):
+        function = getattr(function, attribute)
+    return function
+
+
+def _get_module_stamps(module_names: List[str]) -> Dict[str, Any]:
+    # the server must run the same code as the requesting process
+    stamps: Dict[str, Any] = {}
+    for module_name in sorted(set(module_names)):
+        if not _is_allowed_module(module_name):
+            raise ImportError(f"Module '{module_name}' isn't allowed")
+        module = sys.modules.get(module_name) or importlib.import_module(module_name)
+        path = getattr(module, '__file__', None)
+        try:
+            stamps[module_name] = [path, os.stat(path).st_mtime_ns] if path else None
+        except OSError:
+            stamps[module_name] = [path, None]
+    return stamps
+
+
+def forward_generate_files(
+    generator_arguments_file: str, mapping: Dict[str, str],
+    additional_context: Optional[Dict[str, bool]], keep_case: bool,
+    post_process_callback: Optional[Callable[[str], str]],
+    jobs: Optional[int], incremental: Optional[bool], depfile: Optional[str]
+) -> Optional[List[str]]:
+    """
+    Forward a call of :py:func:`rosidl_pycommon.generate_files` to the server.
+
+    :returns: the paths of the generated files, or None if the request couldn't
+      be forwarded and the files need to be generated in-process
+    :raises GeneratorServerError: if the server failed to generate the files
+    """
+    socket_path = os.environ.get(GENERATOR_SERVER_SOCKET_ENV_VAR)
+    if not socket_path or not hasattr(socket, 'AF_UNIX'):
+        return None
+
+    callback_name = None
+    if post_process_callback is not None:
+        callback_name = _get_callable_name(post_process_callback)
+        if callback_name is None:
+            return None
+    # the generator and parser modules, which are also used by the templates
+    module_names = [
+        module_name for module_name in list(sys.modules.keys())
+        if _is_allowed_module(module_name)]
+
+    request = {
+        'version': GENERATOR_SERVER_PROTOCOL_VERSION,
+        'cwd': os.getcwd(),
+        'module_stamps': _get_module_stamps(module_names),
+        'generator_arguments_file': os.path.abspath(generator_arguments_file),
+        'mapping': mapping,
+        'additional_context': additional_context,
+        'keep_case': keep_case,
+        'post_process_callback': callback_name,
+        'jobs': jobs,
+        'incremental': incremental,
+        'depfile': depfile,
+        'environment': _get_forwarded_environment(),
+    }
+    try:
+        response = _send_request(socket_path, request)
+    except (OSError, ValueError):
+        # e.g. the server isn't running or was stopped during the request
+        return None
+    if response.get('status') == 'ok':
+        return response['generated_files']
+    if response.get('status') == 'error':
+        raise GeneratorServerError(response['message'])
+    return None
+
+
+def _get_rosidl_environment() -> Dict[str, str]:
+    return {
+        name: value for name, value in os.environ.items()
+        if name.startswith(_FORWARDED_ENV_VAR_PREFIX)}
+
+
+def _get_forwarded_environment() -> Dict[str, str]:
+    environment = _get_rosidl_environment()
+    environment.pop(GENERATOR_SERVER_SOCKET_ENV_VAR, None)
+    return environment
+
+
+def _send_request(socket_path: str, request: Dict[str, Any]) -> Dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        client.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return json.loads(b''.join(chunks).decode('utf-8'))
+
+
+def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Generate the files of a forwarded request.
+
+    :param request: the request sent by :py:func:`forward_generate_files`
+    :returns: the response with a ``status`` of ``ok`` and the
+      ``generated_files``, ``error`` and the ``message`` of the error, or
+      ``unavailable`` if the requesting process should generate the files
+      itself
+    """
+    import rosidl_pycommon
+
+    response = _check_request(request)
+    if response is not None:
+        return response
+    post_process_callback = None
+    if request['post_process_callback'] is not None:
+        post_process_callback = _resolve_callable_name(request['post_process_callback'])
+
+    cwd = os.getcwd()
+    environment = _get_rosidl_environment()
+    try:
+        os.chdir(request['cwd'])
+        # which never contains the socket, so the request isn't forwarded again
+        _set_rosidl_environment(request['environment'])
+        generated_files = rosidl_pycommon.generate_files(
+            request['generator_arguments_file'], request['mapping'],
+            additional_context=request['additional_context'],
+            keep_case=request['keep_case'],
+            post_process_callback=post_process_callback,
+            jobs=request['jobs'], incremental=request['incremental'],
+            depfile=request['depfile'])
+    except Exception as e:
+        traceback.print_exc()
+        return {'status': 'error', 'message': f'{type(e).__name__}: {e}'}
+    finally:
+        # the request is handled in a forked process, which exits without
+        # running the handlers writing the trace events
+        profiling.write_process_events()
+        _set_rosidl_environment(environment)
+        os.chdir(cwd)
+    return {'status': 'ok', 'generated_files': generated_files}
+
+
+def _check_request(request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # the response if the request can't be handled by this server, importing
+    # the modules of the request otherwise
+    if request.get('version') != GENERATOR_SERVER_PROTOCOL_VERSION:
+        return {'status': 'unavailable', 'message': 'Unsupported protocol version'}
+    module_stamps = request['module_stamps']
+    try:
+        if _get_module_stamps(list(module_stamps.keys())) != module_stamps:
+            return {'status': 'unavailable', 'message': 'Different modules'}
+        if request['post_process_callback'] is not None:
+            _resolve_callable_name(request['post_process_callback'])
+    except (ImportError, AttributeError) as e:
+        return {'status': 'unavailable', 'message': str(e)}
+    return None
+
+
+def _read_templates(request: Dict[str, Any]) -> None:
+    # read the templates of a request into the template cache of the server,
+    # which the forked request processes inherit
+    import rosidl_pycommon
+
+    try:
+        args = rosidl_pycommon.read_generator_arguments(request['generator_arguments_file'])
+        template_dir = pathlib.Path(args['template_dir'])
+    except (OSError, ValueError, KeyError, TypeError):
+        # the request process reports the error
+        return
+    if not template_dir.is_absolute():
+        return
+    for template_path in template_dir.rglob('*.em'):
+        try:
+            stamp = template_path.stat().st_mtime_ns
+            if _template_stamps.get(template_path) != stamp:
+                # the template changed since it has been read
+                rosidl_pycommon._template_content_cache.pop(template_path, None)
+                _template_stamps[template_path] = stamp
+            rosidl_pycommon._read_template(template_path)
+        except (OSError, UnicodeDecodeError):
+            _template_stamps.pop(template_path, None)
+            rosidl_pycommon._template_content_cache.pop(template_path, None)
+
+
+def _set_rosidl_environment(environment: Dict[str, str]) -> None:
+    for name in list(_get_rosidl_environment().keys()):
+        if name not in environment:
+            del os.environ[name]
+    os.environ.update(environment)
+    if os.environ.get(profiling.PROFILE_DIR_ENV_VAR):
+        profiling.enable()
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+
+    server: '_GeneratorServer'
+
+    def handle(self) -> None:
+        # the request has already been received by the server process
+        response = handle_request(self.server.current_request)
+        _send_response(self.request, response)
+
+
+def _receive_request(connection: socket.socket) -> Dict[str, Any]:
+    connection.settimeout(_REQUEST_TIMEOUT)
+    chunks = []
+    while True:
+        chunk = connection.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    request = json.loads(b''.join(chunks).decode('utf-8'))
+    if not isinstance(request, dict):
+        raise ValueError('The request is not an object')
+    return request
+
+
+def _send_response(connection: socket.socket, response: Dict[str, Any]) -> None:
+    connection.sendall(json.dumps(response).encode('utf-8'))
+
+
+class _GeneratorServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+
+    last_request_time = 0.0
+    current_request: Dict[str, Any] = {}
+
+    def server_bind(self) -> None:
+        # only the user running the server may connect, the socket must not
+        # be accessible by others even before changing its mode
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+        os.chmod(self.socket.getsockname(), 0o600)
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        self.last_request_time = time.monotonic()
+        # import the modules and read the templates in the server process,
+        # so the following requests don't need to do it again
+        try:
+            self.current_request = _receive_request(request)
+            response = _check_request(self.current_request)
+        except (OSError, ValueError, KeyError) as e:
+            response = {'status': 'unavailable', 'message': f'Invalid request: {e}'}
+        if response is not None:
+            try:
+                _send_response(request, response)
+            except OSError:
+                pass
+            self.shutdown_request(request)
+            return
+        _read_templates(self.current_request)
+        super().process_request(request, client_address)
+
+
+# The interval in seconds to reap finished request processes in
+_POLL_INTERVAL = 0.5
+
+
+def serve(socket_path: str, idle_timeout: Optional[float] = None) -> None:
+    """
+    Serve generation requests until interrupted.
+
+    Each request is handled in a forked process since the template
+    expansion relies on process global state.
+    The generator modules and the templates are loaded in the server process
+    before forking, so they are only loaded once.
+
+    :param socket_path: the path of the Unix socket to listen on
+    :param idle_timeout: the time in seconds without requests after which to
+      stop serving, None to serve forever
+    """
+    # the server must not forward requests to itself
+    os.environ.pop(GENERATOR_SERVER_SOCKET_ENV_VAR, None)
+    if os.path.exists(socket_path):
+        # only replace a stale socket, not one of another running server
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.connect(socket_path)
+        except OSError:
+            os.unlink(socket_path)
+        else:
+            raise RuntimeError(f"A server is already listening on '{socket_path}'")
+
+    # the forked request processes inherit the imported modules and the parser
+    import rosidl_pycommon  # noqa: F401
+    get_ast_from_idl_string('module warm_up { struct WarmUp { int32 value; }; };')
+
+    with _GeneratorServer(socket_path, _RequestHandler) as server:
+        server.timeout = _POLL_INTERVAL
+        server.last_request_time = time.monotonic()
+        try:
+            while True:
+                server.handle_request()
+                server.collect_children()
+                if (
+                    idle_timeout is not None and not server.active_children and
+                    time.monotonic() - server.last_request_time > idle_timeout
+                ):
+                    break
+        finally:
+            os.unlink(socket_path)
+
+
+def main(argv: List[str] = sys.argv[1:]) -> None:
+    parser = argparse.ArgumentParser(
+        description='Serve file generation requests of rosidl generators.',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '--socket', default=os.environ.get(GENERATOR_SERVER_SOCKET_ENV_VAR),
+        help='The path of the Unix socket to listen on, defaults to the value '
+             f'of the {GENERATOR_SERVER_SOCKET_ENV_VAR} environment variable')
+    parser.add_argument(
+        '--idle-timeout', type=float,
+        help='Stop after this many seconds without requests')
+    args = parser.parse_args(argv)
+    if not args.socket:
+        parser.error('No socket path given')
+    if not hasattr(socket, 'AF_UNIX'):
+        parser.error('Unix sockets are not supported on this platform')
+    try:
+        serve(args.socket, idle_timeout=args.idle_timeout)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
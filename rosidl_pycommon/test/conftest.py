@@ -0,0 +1,122 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import pathlib
+from typing import Any, Callable, Dict, Iterator
+
+import em
+import pytest
+import rosidl_pycommon
+
+IDL_TEMPLATE = """\
+module test_msgs {{
+  module msg {{
+    struct {name} {{
+      int32 {member};
+      string label;
+    }};
+  }};
+}};
+"""
+INTERFACE_NAMES = ['Foo', 'BarBaz', 'Qux']
+
+TEMPLATES = {
+    'idl.txt.em': (
+        '@{from rosidl_parser.definition import Message}@\n'
+        'package: @(package_name)\n'
+        '@[for message in content.get_elements_of_type(Message)]@\n'
+        'message: @(message.structure.namespaced_type.name)\n'
+        '@[  for member in message.structure.members]@\n'
+        '@{TEMPLATE(\'member.txt.em\', member=member)}@\n'
+        '@[  end for]@\n'
+        '@[end for]@\n'),
+    'member.txt.em': '  member: @(member.name)\n',
+    'idl__names.txt.em': (
+        '@{from rosidl_parser.definition import Message}@\n'
+        '@[for message in content.get_elements_of_type(Message)]@\n'
+        '@(message.structure.namespaced_type.name.upper())\n'
+        '@[end for]@\n'),
+    'failing.txt.em': '@{raise ValueError(\'broken template\')}@\n',
+}
+MAPPING = {
+    'idl.txt.em': '%s.txt',
+    'idl__names.txt.em': 'detail/%s__names.txt',
+}
+
+
+@pytest.fixture(autouse=True)
+def isolated_environment(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    # neither forward to a server nor use a cache of the developer
+    for name in (
+        'ROSIDL_GENERATOR_SERVER_SOCKET',
+        'ROSIDL_PARSER_CONTENT_CACHE_DIR',
+        'ROSIDL_PROFILE_DIR',
+    ):
+        monkeypatch.delenv(name, raising=False)
+    # an empty directory disables the parser cache in the user cache directory
+    monkeypatch.setenv('ROSIDL_PARSER_CACHE_DIR', '')
+    # EmPy 3 wraps sys.stdout only once per process, but pytest replaces
+    # sys.stdout for every test
+    monkeypatch.setattr(em.Interpreter, '_wasProxyInstalled', False, raising=False)
+    rosidl_pycommon.clear_template_cache()
+    yield
+    rosidl_pycommon.clear_template_cache()
+
+
+@pytest.fixture
+def mapping() -> Dict[str, str]:
+    """Get the mapping of the templates to the generated files."""
+    return dict(MAPPING)
+
+
+@pytest.fixture
+def idl_dir(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Write the .idl files of the test interfaces."""
+    idl_dir = tmp_path / 'idl'
+    (idl_dir / 'msg').mkdir(parents=True)
+    for name in INTERFACE_NAMES:
+        (idl_dir / 'msg' / f'{name}.idl').write_text(
+            IDL_TEMPLATE.format(name=name, member='value'), encoding='utf-8')
+    return idl_dir
+
+
+@pytest.fixture
+def template_dir(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Write the templates of the test generator."""
+    template_dir = tmp_path / 'templates'
+    template_dir.mkdir()
+    for name, content in TEMPLATES.items():
+        (template_dir / name).write_text(content, encoding='utf-8')
+    return template_dir
+
+
+@pytest.fixture
+def write_arguments_file(
+    tmp_path: pathlib.Path, idl_dir: pathlib.Path, template_dir: pathlib.Path
+) -> Callable[..., str]:
+    """Get a function writing a generator arguments file for the test interfaces."""
+    def write(name: str = 'arguments', **arguments: Any) -> str:
+        args: Dict[str, Any] = {
+            'package_name': 'test_msgs',
+            'output_dir': str(tmp_path / 'output' / name),
+            'template_dir': str(template_dir),
+            'idl_tuples': [f'{idl_dir}:msg/{n}.idl' for n in INTERFACE_NAMES],
+            'target_dependencies': [],
+        }
+        args.update(arguments)
+        arguments_file = tmp_path / f'{name}.json'
+        arguments_file.write_text(json.dumps(args), encoding='utf-8')
+        return str(arguments_file)
+    return write
@@ -0,0 +1,62 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pathlib
+import shutil
+from typing import Callable, Dict
+
+import pytest
+from rosidl_pycommon import generate_files
+
+
+@pytest.fixture
+def arguments_file(
+    tmp_path: pathlib.Path, idl_dir: pathlib.Path, write_arguments_file: Callable[..., str]
+) -> str:
+    # paths which need to be escaped in a dependency file
+    idl_dir = shutil.copytree(idl_dir, tmp_path / 'my $idl')
+    return write_arguments_file(
+        output_dir=str(tmp_path / 'output dir'),
+        idl_tuples=[f'{idl_dir}:msg/Foo.idl', f'{idl_dir}:msg/Qux.idl'])
+
+
+def test_generate_files_depfile(
+    arguments_file: str, mapping: Dict[str, str], tmp_path: pathlib.Path,
+    template_dir: pathlib.Path
+) -> None:
+    depfile = tmp_path / 'generator.d'
+    generated_files = generate_files(arguments_file, mapping, depfile=str(depfile))
+    # the permissions are given by the umask like for the generated files
+    assert depfile.stat().st_mode == pathlib.Path(generated_files[0]).stat().st_mode
+
+    output_dir = f'{tmp_path}/output\\ dir/msg'
+    idl_dir = f'{tmp_path}/my\\ $$idl/msg'
+    templates = [
+        f'  {template_dir}/{name}'
+        for name in ('idl.txt.em', 'idl__names.txt.em', 'member.txt.em')]
+    assert depfile.read_text() == ''.join(
+        f'{output_dir}/{name.lower()}.txt {output_dir}/detail/{name.lower()}__names.txt: \\\n'
+        f'  {idl_dir}/{name}.idl \\\n' + ' \\\n'.join(templates) + '\n'
+        for name in ('Foo', 'Qux'))
+
+
+def test_generate_files_depfile_from_arguments(
+    tmp_path: pathlib.Path, write_arguments_file: Callable[..., str], mapping: Dict[str, str]
+) -> None:
+    serial_depfile = tmp_path / 'serial.d'
+    generate_files(write_arguments_file(depfile=str(serial_depfile)), mapping, jobs=1)
+    parallel_depfile = tmp_path / 'parallel.d'
+    generate_files(write_arguments_file(depfile=str(parallel_depfile)), mapping, jobs=2)
+    assert serial_depfile.read_text() == parallel_depfile.read_text()
+    assert serial_depfile.read_text().count(':') == 3
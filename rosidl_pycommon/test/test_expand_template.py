@@ -0,0 +1,117 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import os
+import pathlib
+from typing import Any
+
+import pytest
+from rosidl_pycommon import expand_template
+
+DIGEST_FILE_SUFFIX = '.sha256'
+
+
+@pytest.fixture
+def template_path(tmp_path: pathlib.Path) -> pathlib.Path:
+    template_path = tmp_path / 'value.txt.em'
+    template_path.write_text('value: @(value)\n', encoding='utf-8')
+    return template_path
+
+
+def _expand(
+    template_path: pathlib.Path, output_file: pathlib.Path, value: Any, **kwargs: Any
+) -> None:
+    expand_template(
+        template_path.name, {'value': value}, str(output_file),
+        template_basepath=template_path.parent, **kwargs)
+
+
+def _set_mtime(path: pathlib.Path, mtime: int) -> None:
+    os.utime(path, (mtime, mtime))
+
+
+def test_unchanged_output_keeps_mtime(
+    template_path: pathlib.Path, tmp_path: pathlib.Path
+) -> None:
+    output_file = tmp_path / 'output' / 'value.txt'
+    _expand(template_path, output_file, 1)
+    assert output_file.read_text() == 'value: 1\n'
+    _set_mtime(output_file, 1000)
+    inode = output_file.stat().st_ino
+
+    _expand(template_path, output_file, 1)
+    assert output_file.stat().st_mtime == 1000
+    assert output_file.stat().st_ino == inode
+
+    # the content is the same, but the output must be newer than its inputs
+    _expand(template_path, output_file, 1, minimum_timestamp=2000)
+    assert output_file.stat().st_mtime > 2000
+    assert output_file.stat().st_ino == inode
+
+
+def test_changed_output_is_replaced_atomically(
+    template_path: pathlib.Path, tmp_path: pathlib.Path
+) -> None:
+    output_file = tmp_path / 'value.txt'
+    _expand(template_path, output_file, 1)
+    with output_file.open('r') as h:
+        _expand(template_path, output_file, 2)
+        # an open handle still sees the complete previous content
+        assert h.read() == 'value: 1\n'
+    assert output_file.read_text() == 'value: 2\n'
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['value.txt', 'value.txt.em']
+
+
+def test_failed_write_keeps_previous_output(
+    template_path: pathlib.Path, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    output_file = tmp_path / 'value.txt'
+    _expand(template_path, output_file, 1)
+
+    def replace(src: str, dst: str) -> None:
+        raise OSError('replace failed')
+
+    monkeypatch.setattr(os, 'replace', replace)
+    with pytest.raises(OSError, match='replace failed'):
+        _expand(template_path, output_file, 2)
+    assert output_file.read_text() == 'value: 1\n'
+    # the temporary file has been removed
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['value.txt', 'value.txt.em']
+
+
+def test_digest_file(template_path: pathlib.Path, tmp_path: pathlib.Path) -> None:
+    output_file = tmp_path / 'value.txt'
+    digest_file = tmp_path / ('value.txt' + DIGEST_FILE_SUFFIX)
+    _expand(template_path, output_file, 1, digest_file_suffix=DIGEST_FILE_SUFFIX)
+    assert digest_file.read_text() == hashlib.sha256(b'value: 1\n').hexdigest()
+
+    # the digest of a newer digest file is used instead of the output content
+    output_file.write_text('modified\n')
+    _set_mtime(output_file, 1000)
+    _set_mtime(digest_file, 2000)
+    _expand(template_path, output_file, 1, digest_file_suffix=DIGEST_FILE_SUFFIX)
+    assert output_file.read_text() == 'modified\n'
+    assert output_file.stat().st_mtime == 1000
+
+    # a digest file older than the output is ignored
+    _set_mtime(digest_file, 500)
+    _expand(template_path, output_file, 1, digest_file_suffix=DIGEST_FILE_SUFFIX)
+    assert output_file.read_text() == 'value: 1\n'
+    assert digest_file.stat().st_mtime >= output_file.stat().st_mtime
+
+    # a changed content updates the digest
+    _expand(template_path, output_file, 2, digest_file_suffix=DIGEST_FILE_SUFFIX)
+    assert output_file.read_text() == 'value: 2\n'
+    assert digest_file.read_text() == hashlib.sha256(b'value: 2\n').hexdigest()
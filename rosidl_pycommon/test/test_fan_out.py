@@ -0,0 +1,150 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pathlib
+from typing import Any, Callable, Dict, List
+
+import pytest
+import rosidl_pycommon
+from rosidl_pycommon import generate_files
+from rosidl_pycommon import server
+from rosidl_pycommon import sharing_parsed_idl_files
+from rosidl_pycommon.fan_out import combine_depfiles
+from rosidl_pycommon.fan_out import generate_for_generators
+from rosidl_pycommon.fan_out import get_generator_function
+from rosidl_pycommon.fan_out import main
+from rosidl_pycommon.server import GENERATOR_SERVER_SOCKET_ENV_VAR
+
+
+def generate_text(generator_arguments_file: str, **kwargs: Any) -> List[str]:
+    """Generate the text files, like the generate_* function of a generator."""
+    return generate_files(generator_arguments_file, {'idl.txt.em': '%s.txt'}, **kwargs)
+
+
+def generate_names(generator_arguments_file: str, **kwargs: Any) -> List[str]:
+    """Generate the name files, like the generate_* function of a generator."""
+    return generate_files(
+        generator_arguments_file, {'idl__names.txt.em': '%s__names.txt'}, **kwargs)
+
+
+@pytest.fixture
+def parsed_files(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    """Record the paths of the parsed .idl files."""
+    parsed_files: List[str] = []
+    parse_idl_file = rosidl_pycommon.parse_idl_file
+
+    def parse(locator: Any) -> Any:
+        parsed_files.append(str(locator.get_absolute_path()))
+        return parse_idl_file(locator)
+
+    monkeypatch.setattr(rosidl_pycommon, 'parse_idl_file', parse)
+    return parsed_files
+
+
+def _read_contents(generated_files: List[str]) -> Dict[str, str]:
+    return {pathlib.Path(f).name: pathlib.Path(f).read_text() for f in generated_files}
+
+
+def test_get_generator_function() -> None:
+    assert get_generator_function(f'{__name__}:generate_text') is generate_text
+    with pytest.raises(ValueError):
+        get_generator_function(__name__)
+    with pytest.raises(AttributeError):
+        get_generator_function(f'{__name__}:missing')
+
+
+def test_generate_for_generators(
+    write_arguments_file: Callable[..., str], parsed_files: List[str]
+) -> None:
+    separate_text_files = generate_text(write_arguments_file('separate_text'))
+    separate_name_files = generate_names(write_arguments_file('separate_names'))
+    assert len(parsed_files) == 6
+    parsed_files.clear()
+
+    text_files, name_files = generate_for_generators([
+        (generate_text, write_arguments_file('text'), {}),
+        (generate_names, write_arguments_file('names'), {}),
+    ])
+    # each .idl file is parsed only once for both generators
+    assert len(parsed_files) == 3
+    assert len(set(parsed_files)) == 3
+    assert _read_contents(text_files) == _read_contents(separate_text_files)
+    assert _read_contents(name_files) == _read_contents(separate_name_files)
+    assert [pathlib.Path(f).name for f in name_files] == [
+        'foo__names.txt', 'bar_baz__names.txt', 'qux__names.txt']
+
+
+def test_sharing_parsed_idl_files_is_not_forwarded(
+    write_arguments_file: Callable[..., str], parsed_files: List[str],
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def send_request(socket_path: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        raise AssertionError('The request must not be forwarded')
+
+    monkeypatch.setenv(GENERATOR_SERVER_SOCKET_ENV_VAR, '/nonexistent/server.sock')
+    monkeypatch.setattr(server, '_send_request', send_request)
+    with sharing_parsed_idl_files():
+        generate_text(write_arguments_file('text'))
+        generate_names(write_arguments_file('names'))
+    assert len(parsed_files) == 3
+
+
+def test_combine_depfiles(
+    tmp_path: pathlib.Path, write_arguments_file: Callable[..., str]
+) -> None:
+    first_depfile = tmp_path / 'first.d'
+    first_depfile.write_text('a.txt: a.idl\n')
+    second_depfile = tmp_path / 'second.d'
+    second_depfile.write_text('b.txt: b.idl\n')
+    arguments_files = [
+        write_arguments_file('first', depfile=str(first_depfile)),
+        write_arguments_file('without_depfile'),
+        write_arguments_file('second', depfile=str(second_depfile)),
+    ]
+
+    depfile = tmp_path / 'combined.d'
+    combine_depfiles(str(depfile), arguments_files)
+    assert depfile.read_text() == 'a.txt: a.idl\nb.txt: b.idl\n'
+
+
+def test_main(
+    tmp_path: pathlib.Path, write_arguments_file: Callable[..., str], parsed_files: List[str]
+) -> None:
+    text_arguments_file = write_arguments_file(
+        'text', depfile=str(tmp_path / 'text.d'))
+    names_arguments_file = write_arguments_file(
+        'names', depfile=str(tmp_path / 'names.d'))
+    depfile = tmp_path / 'combined.d'
+    main([
+        '--generator', f'{__name__}:generate_text', text_arguments_file, 'keep_case=true',
+        '--generator', f'{__name__}:generate_names', names_arguments_file,
+        '--depfile', str(depfile),
+    ])
+    assert len(parsed_files) == 3
+    assert (tmp_path / 'output' / 'text' / 'msg' / 'BarBaz.txt').exists()
+    assert (tmp_path / 'output' / 'names' / 'msg' / 'bar_baz__names.txt').exists()
+    assert depfile.read_text() == (
+        (tmp_path / 'text.d').read_text() + (tmp_path / 'names.d').read_text())
+    assert 'BarBaz.idl' in depfile.read_text()
+
+
+def test_main_invalid_arguments(write_arguments_file: Callable[..., str]) -> None:
+    arguments_file = write_arguments_file()
+    for argv in (
+        ['--generator', f'{__name__}:generate_text'],
+        ['--generator', f'{__name__}:missing', arguments_file],
+        ['--generator', f'{__name__}:generate_text', arguments_file, 'invalid'],
+    ):
+        with pytest.raises(SystemExit):
+            main(argv)
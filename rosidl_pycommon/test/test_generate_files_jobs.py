@@ -0,0 +1,69 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pathlib
+from typing import Callable, Dict
+
+import pytest
+from rosidl_pycommon import generate_files
+
+
+def test_generate_files_jobs(
+    write_arguments_file: Callable[..., str], mapping: Dict[str, str]
+) -> None:
+    serial_files = generate_files(write_arguments_file('serial'), mapping, jobs=1)
+    parallel_files = generate_files(write_arguments_file('parallel'), mapping, jobs=3)
+
+    # in the order of the .idl files and the mapping
+    expected_names = [
+        'foo.txt', 'foo__names.txt',
+        'bar_baz.txt', 'bar_baz__names.txt',
+        'qux.txt', 'qux__names.txt',
+    ]
+    assert [pathlib.Path(f).name for f in serial_files] == expected_names
+    assert [pathlib.Path(f).name for f in parallel_files] == expected_names
+
+    for serial_file, parallel_file in zip(serial_files, parallel_files):
+        assert pathlib.Path(serial_file).read_text() == pathlib.Path(parallel_file).read_text()
+    assert pathlib.Path(serial_files[0]).read_text() == (
+        'package: test_msgs\n'
+        'message: Foo\n'
+        '  member: value\n'
+        '  member: label\n')
+    assert pathlib.Path(serial_files[3]).read_text() == 'BARBAZ\n'
+
+
+def test_generate_files_jobs_from_arguments(
+    write_arguments_file: Callable[..., str], mapping: Dict[str, str]
+) -> None:
+    generated_files = generate_files(write_arguments_file(jobs=2), mapping)
+    assert len(generated_files) == 6
+    assert all(pathlib.Path(f).exists() for f in generated_files)
+
+
+def test_generate_files_invalid_jobs(
+    write_arguments_file: Callable[..., str], mapping: Dict[str, str]
+) -> None:
+    with pytest.raises(ValueError):
+        generate_files(write_arguments_file(), mapping, jobs=0)
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_generate_files_jobs_error(
+    write_arguments_file: Callable[..., str], mapping: Dict[str, str], jobs: int
+) -> None:
+    mapping['failing.txt.em'] = '%s__failing.txt'
+    # the worker processes pass the error to the parent process
+    with pytest.raises(Exception, match='broken template'):
+        generate_files(write_arguments_file(), mapping, jobs=jobs)
@@ -0,0 +1,148 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import pathlib
+import re
+from typing import Callable, Dict, List
+
+import pytest
+from rosidl_pycommon import clear_template_cache
+from rosidl_pycommon import generate_files
+from rosidl_pycommon import get_template_cache_statistics
+
+
+@pytest.fixture
+def arguments_file(
+    tmp_path: pathlib.Path, idl_dir: pathlib.Path, write_arguments_file: Callable[..., str]
+) -> str:
+    type_description_tuples = []
+    for idl_file in sorted((idl_dir / 'msg').glob('*.idl')):
+        json_file = tmp_path / 'type_description' / 'msg' / f'{idl_file.stem}.json'
+        json_file.parent.mkdir(parents=True, exist_ok=True)
+        json_file.write_text(json.dumps({'type_hashes': [idl_file.stem]}))
+        type_description_tuples.append(f'msg/{idl_file.name}:{json_file}')
+    return write_arguments_file(
+        incremental=True, type_description_tuples=type_description_tuples)
+
+
+def _get_expansion_count() -> int:
+    statistics = get_template_cache_statistics()
+    return statistics['interpreter_creations'] + statistics['interpreter_reuses']
+
+
+def _get_manifests(arguments_file: str) -> List[pathlib.Path]:
+    path = pathlib.Path(arguments_file)
+    pattern = re.compile(re.escape(path.stem) + r'__[0-9a-f]{16}\.manifest\.json')
+    return sorted(p for p in path.parent.iterdir() if pattern.fullmatch(p.name))
+
+
+def _run(arguments_file: str, mapping: Dict[str, str]) -> int:
+    clear_template_cache()
+    generate_files(arguments_file, mapping)
+    return _get_expansion_count()
+
+
+def test_incremental_unchanged(arguments_file: str, mapping: Dict[str, str]) -> None:
+    generated_files = generate_files(arguments_file, mapping)
+    assert _get_expansion_count() == 6
+    manifests = _get_manifests(arguments_file)
+    assert len(manifests) == 1
+    mtimes = [os.stat(f).st_mtime_ns for f in generated_files]
+
+    clear_template_cache()
+    assert generate_files(arguments_file, mapping) == generated_files
+    assert _get_expansion_count() == 0
+    assert [os.stat(f).st_mtime_ns for f in generated_files] == mtimes
+    assert _get_manifests(arguments_file) == manifests
+
+
+def test_incremental_edited_idl_file(
+    arguments_file: str, mapping: Dict[str, str], idl_dir: pathlib.Path
+) -> None:
+    generated_files = generate_files(arguments_file, mapping)
+    content = (idl_dir / 'msg' / 'BarBaz.idl').read_text()
+    (idl_dir / 'msg' / 'BarBaz.idl').write_text(content.replace('value', 'edited'))
+
+    # only the files of the edited .idl file are generated again
+    assert _run(arguments_file, mapping) == 2
+    assert '  member: edited\n' in pathlib.Path(generated_files[2]).read_text()
+    assert _run(arguments_file, mapping) == 0
+
+
+def test_incremental_changed_type_description(
+    arguments_file: str, mapping: Dict[str, str], tmp_path: pathlib.Path
+) -> None:
+    generate_files(arguments_file, mapping)
+    json_file = tmp_path / 'type_description' / 'msg' / 'Qux.json'
+    json_file.write_text(json.dumps({'type_hashes': ['changed']}))
+
+    assert _run(arguments_file, mapping) == 2
+    assert _run(arguments_file, mapping) == 0
+
+
+def test_incremental_changed_template(
+    arguments_file: str, mapping: Dict[str, str], template_dir: pathlib.Path
+) -> None:
+    generated_files = generate_files(arguments_file, mapping)
+    previous_manifests = _get_manifests(arguments_file)
+    # also templates which are only expanded from other templates
+    (template_dir / 'member.txt.em').write_text('  changed member: @(member.name)\n')
+
+    assert _run(arguments_file, mapping) == 6
+    assert '  changed member: value\n' in pathlib.Path(generated_files[0]).read_text()
+    # the manifest of the previous templates has been replaced
+    manifests = _get_manifests(arguments_file)
+    assert len(manifests) == 1
+    assert manifests != previous_manifests
+    assert _run(arguments_file, mapping) == 0
+
+
+def test_incremental_deleted_output(arguments_file: str, mapping: Dict[str, str]) -> None:
+    generated_files = generate_files(arguments_file, mapping)
+    os.remove(generated_files[1])
+
+    assert _run(arguments_file, mapping) == 2
+    assert pathlib.Path(generated_files[1]).exists()
+    assert _run(arguments_file, mapping) == 0
+
+
+def test_incremental_touches_outdated_files(
+    arguments_file: str, mapping: Dict[str, str], idl_dir: pathlib.Path
+) -> None:
+    generated_files = generate_files(arguments_file, mapping)
+    # an unchanged .idl file which is newer than the files generated from it
+    idl_file = idl_dir / 'msg' / 'Foo.idl'
+    for generated_file in generated_files[:2]:
+        os.utime(generated_file, (1, 1))
+
+    assert _run(arguments_file, mapping) == 0
+    for generated_file in generated_files[:2]:
+        assert os.path.getmtime(generated_file) > os.path.getmtime(idl_file)
+
+
+def test_incremental_keeps_other_manifests(
+    arguments_file: str, mapping: Dict[str, str], write_arguments_file: Callable[..., str]
+) -> None:
+    # the manifests of arguments files whose name starts with the same stem
+    other_arguments_file = write_arguments_file('arguments__other', incremental=True)
+    generate_files(other_arguments_file, mapping)
+    generate_files(arguments_file, mapping)
+    other_manifests = _get_manifests(other_arguments_file)
+    assert len(other_manifests) == 1
+
+    generate_files(arguments_file, {'idl.txt.em': '%s.txt'})
+    assert len(_get_manifests(arguments_file)) == 1
+    assert _get_manifests(other_arguments_file) == other_manifests
@@ -0,0 +1,244 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+import pathlib
+import shutil
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterator, List
+
+import pytest
+import rosidl_pycommon
+from rosidl_pycommon import convert_camel_case_to_lower_case_underscore
+from rosidl_pycommon import generate_files
+from rosidl_pycommon import get_template_cache_statistics
+from rosidl_pycommon import server
+from rosidl_pycommon.server import GENERATOR_SERVER_SOCKET_ENV_VAR
+from rosidl_pycommon.server import GeneratorServerError
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, 'AF_UNIX') or not hasattr(os, 'fork'),
+    reason='The generator server requires Unix sockets and fork')
+
+
+def upper_case(content: str) -> str:
+    """Post-process the content of a generated file, not allowed by the server."""
+    return content.upper()
+
+
+@pytest.fixture
+def socket_path() -> Iterator[str]:
+    # the path of a Unix socket is limited to about 100 characters
+    socket_dir = tempfile.mkdtemp(prefix='rosidl_test_')
+    yield os.path.join(socket_dir, 'server.sock')
+    shutil.rmtree(socket_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def running_server(socket_path: str, monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'rosidl_pycommon.server', '--socket', socket_path,
+         '--idle-timeout', '60'])
+    try:
+        deadline = time.monotonic() + 60
+        while not os.path.exists(socket_path):
+            assert process.poll() is None, 'The server stopped'
+            assert time.monotonic() < deadline, 'The server did not start'
+            time.sleep(0.05)
+        monkeypatch.setenv(GENERATOR_SERVER_SOCKET_ENV_VAR, socket_path)
+        yield socket_path
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def _forward_in_process(
+    monkeypatch: pytest.MonkeyPatch, socket_path: str,
+    modify_request: Callable[[Dict[str, Any]], None] = lambda request: None
+) -> List[Dict[str, Any]]:
+    # handle the requests in this process instead of sending them
+    requests: List[Dict[str, Any]] = []
+
+    def send_request(path: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        assert path == socket_path
+        modify_request(request)
+        requests.append(request)
+        return server.handle_request(request)
+
+    monkeypatch.setenv(GENERATOR_SERVER_SOCKET_ENV_VAR, socket_path)
+    monkeypatch.setattr(server, '_send_request', send_request)
+    return requests
+
+
+def _get_expansion_count() -> int:
+    statistics = get_template_cache_statistics()
+    return statistics['interpreter_creations'] + statistics['interpreter_reuses']
+
+
+def test_fallback_without_server(
+    socket_path: str, write_arguments_file: Callable[..., str], mapping: Dict[str, str],
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(GENERATOR_SERVER_SOCKET_ENV_VAR, socket_path)
+    arguments_file = write_arguments_file()
+    assert server.forward_generate_files(
+        arguments_file, mapping, None, False, None, None, None, None) is None
+
+    # nothing is listening, so the files are generated in-process
+    generated_files = generate_files(arguments_file, mapping)
+    assert len(generated_files) == 6
+    assert _get_expansion_count() == 6
+
+
+def test_fallback_with_different_module_stamps(
+    socket_path: str, write_arguments_file: Callable[..., str], mapping: Dict[str, str],
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def modify_request(request: Dict[str, Any]) -> None:
+        path, mtime = request['module_stamps']['rosidl_pycommon']
+        request['module_stamps']['rosidl_pycommon'] = [path, mtime + 1]
+
+    requests = _forward_in_process(monkeypatch, socket_path, modify_request)
+    assert server.handle_request({'version': 0}) == {
+        'status': 'unavailable', 'message': 'Unsupported protocol version'}
+
+    generated_files = generate_files(write_arguments_file(), mapping)
+    assert len(requests) == 1
+    assert server.handle_request(requests[0])['status'] == 'unavailable'
+    # the files are generated in-process after the server declined
+    assert len(generated_files) == 6
+    assert all(pathlib.Path(f).exists() for f in generated_files)
+
+
+def test_unimportable_post_process_callback(
+    socket_path: str, write_arguments_file: Callable[..., str], mapping: Dict[str, str],
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    requests = _forward_in_process(monkeypatch, socket_path)
+
+    # a lambda can't be imported by the server, so it isn't forwarded at all
+    generated_files = generate_files(
+        write_arguments_file(), mapping, post_process_callback=lambda f: f)
+    assert requests == []
+    assert len(generated_files) == 6
+
+    # the server only imports callbacks of rosidl packages
+    generated_files = generate_files(
+        write_arguments_file('other'), mapping, post_process_callback=upper_case)
+    assert requests == []
+    assert pathlib.Path(generated_files[1]).read_text() == 'FOO\n'
+
+    # a callback which the server fails to import
+    generate_files(
+        write_arguments_file('forwarded'), mapping,
+        post_process_callback=convert_camel_case_to_lower_case_underscore)
+    assert len(requests) == 1
+    assert requests[0]['post_process_callback'] == \
+        'rosidl_pycommon:convert_camel_case_to_lower_case_underscore'
+    requests[0]['post_process_callback'] = 'rosidl_pycommon:missing_callback'
+    assert server.handle_request(requests[0])['status'] == 'unavailable'
+
+
+def test_untrusted_modules_are_not_imported(
+    socket_path: str, write_arguments_file: Callable[..., str], mapping: Dict[str, str],
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    marker_file = tmp_path / 'imported'
+    (tmp_path / 'untrusted_module.py').write_text(
+        f'open({str(marker_file)!r}, "w").close()\n'
+        'def run(content):\n'
+        '    return content\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    requests = _forward_in_process(monkeypatch, socket_path)
+    generate_files(write_arguments_file(), mapping)
+    request = requests[0]
+
+    untrusted_request = dict(request, module_stamps={'untrusted_module': None})
+    assert server.handle_request(untrusted_request)['status'] == 'unavailable'
+    untrusted_request = dict(request, post_process_callback='untrusted_module:run')
+    assert server.handle_request(untrusted_request)['status'] == 'unavailable'
+    assert not marker_file.exists()
+
+
+def test_templates_are_read_before_forking(
+    socket_path: str, write_arguments_file: Callable[..., str], mapping: Dict[str, str],
+    template_dir: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    requests = _forward_in_process(monkeypatch, socket_path)
+    generate_files(write_arguments_file(), mapping)
+    rosidl_pycommon.clear_template_cache()
+
+    server._read_templates(requests[0])
+    template_path = template_dir / 'member.txt.em'
+    # including the templates which are only expanded by other templates
+    assert rosidl_pycommon._template_content_cache[template_path] == \
+        '  member: @(member.name)\n'
+
+    template_path.write_text('  changed member: @(member.name)\n')
+    os.utime(template_path, ns=(1, 1))
+    server._read_templates(requests[0])
+    assert rosidl_pycommon._template_content_cache[template_path] == \
+        '  changed member: @(member.name)\n'
+
+
+def test_forwarded_request(
+    running_server: str, write_arguments_file: Callable[..., str], mapping: Dict[str, str],
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # the environment of the requesting process applies to the request
+    profile_dir = tmp_path / 'profile'
+    monkeypatch.setenv('ROSIDL_PROFILE_DIR', str(profile_dir))
+
+    # only the user running the server can connect
+    assert stat.S_IMODE(os.stat(running_server).st_mode) == 0o600
+
+    generated_files = generate_files(
+        write_arguments_file(), mapping,
+        post_process_callback=convert_camel_case_to_lower_case_underscore)
+    assert _get_expansion_count() == 0
+    assert [pathlib.Path(f).name for f in generated_files] == [
+        'foo.txt', 'foo__names.txt',
+        'bar_baz.txt', 'bar_baz__names.txt',
+        'qux.txt', 'qux__names.txt',
+    ]
+    assert pathlib.Path(generated_files[1]).read_text() == 'foo\n'
+    assert list(profile_dir.glob('*.json'))
+
+
+def test_concurrent_forwarded_requests(
+    running_server: str, write_arguments_file: Callable[..., str], mapping: Dict[str, str]
+) -> None:
+    arguments_files = [write_arguments_file(f'arguments_{i}') for i in range(4)]
+    with ThreadPoolExecutor(max_workers=len(arguments_files)) as executor:
+        results = list(executor.map(
+            lambda arguments_file: generate_files(arguments_file, mapping), arguments_files))
+    assert _get_expansion_count() == 0
+    for generated_files in results:
+        assert len(generated_files) == 6
+        assert all(pathlib.Path(f).exists() for f in generated_files)
+
+
+def test_forwarded_request_error(
+    running_server: str, write_arguments_file: Callable[..., str], mapping: Dict[str, str]
+) -> None:
+    mapping['failing.txt.em'] = '%s__failing.txt'
+    with pytest.raises(GeneratorServerError, match='broken template'):
+        generate_files(write_arguments_file(), mapping)
+    assert _get_expansion_count() == 0
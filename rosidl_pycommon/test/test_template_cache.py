@@ -0,0 +1,147 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pathlib
+from typing import Callable, Dict, List
+
+import pytest
+import rosidl_pycommon
+from rosidl_pycommon import _reusing_interpreter
+from rosidl_pycommon import clear_template_cache
+from rosidl_pycommon import expand_template
+from rosidl_pycommon import generate_files
+from rosidl_pycommon import get_template_cache_statistics
+
+TEMPLATES = {
+    'assign.txt.em': (
+        '@{assigned = value * 2}@\n'
+        'assigned: @(assigned)\n'
+        '@{TEMPLATE(\'nested.txt.em\', value=value)}@\n'),
+    'check.txt.em': (
+        'value: @(value)\n'
+        'assigned visible: @(\'assigned\' in dir())\n'),
+    'nested.txt.em': 'nested: @(value)\n',
+    'failing.txt.em': 'before\n@{raise ValueError(\'broken template\')}@\n',
+}
+
+
+@pytest.fixture
+def templates(tmp_path: pathlib.Path) -> pathlib.Path:
+    template_dir = tmp_path / 'templates'
+    template_dir.mkdir()
+    for name, content in TEMPLATES.items():
+        (template_dir / name).write_text(content, encoding='utf-8')
+    return template_dir
+
+
+def _expand_all(
+    templates: pathlib.Path, output_dir: pathlib.Path, names: List[str]
+) -> List[str]:
+    contents = []
+    for i, name in enumerate(names):
+        output_file = output_dir / f'{i}_{name[:-3]}'
+        expand_template(name, {'value': i}, str(output_file), template_basepath=templates)
+        contents.append(output_file.read_text())
+    return contents
+
+
+def test_reused_interpreter_matches_fresh_interpreter(
+    templates: pathlib.Path, tmp_path: pathlib.Path
+) -> None:
+    names = ['assign.txt.em', 'check.txt.em', 'nested.txt.em', 'assign.txt.em', 'check.txt.em']
+    fresh_contents = _expand_all(templates, tmp_path / 'fresh', names)
+    assert get_template_cache_statistics()['interpreter_creations'] == len(names)
+    assert rosidl_pycommon.interpreter is None
+
+    clear_template_cache()
+    with _reusing_interpreter():
+        reused_contents = _expand_all(templates, tmp_path / 'reused', names)
+    statistics = get_template_cache_statistics()
+    assert statistics['interpreter_creations'] == 1
+    assert statistics['interpreter_reuses'] == len(names) - 1
+    assert rosidl_pycommon.interpreter is None
+
+    assert reused_contents == fresh_contents
+    assert fresh_contents[0] == 'assigned: 0\nnested: 0\n'
+    # nothing leaks from one expansion into the next one
+    assert fresh_contents[1] == 'value: 1\nassigned visible: False\n'
+
+
+def test_template_cache_statistics(
+    write_arguments_file: Callable[..., str], mapping: Dict[str, str]
+) -> None:
+    clear_template_cache()
+    assert set(get_template_cache_statistics().values()) == {0}
+
+    generate_files(write_arguments_file('first'), mapping, jobs=1)
+    statistics = get_template_cache_statistics()
+    # two templates for each of the three .idl files
+    assert statistics['interpreter_creations'] == 1
+    assert statistics['interpreter_reuses'] == 5
+    # the two mapped templates and the template for each of the two members
+    assert statistics['path_misses'] == 3
+    assert statistics['path_hits'] == 3 * 4 - 3
+    assert statistics['content_misses'] == 3
+    assert statistics['content_hits'] == 3 * 4 - 3
+
+    # the cached templates are used again by the next invocation
+    generate_files(write_arguments_file('second'), mapping, jobs=1)
+    statistics = get_template_cache_statistics()
+    assert statistics['path_misses'] == 3
+    assert statistics['content_misses'] == 3
+    assert statistics['interpreter_creations'] == 2
+
+    clear_template_cache()
+    assert set(get_template_cache_statistics().values()) == {0}
+    generate_files(write_arguments_file('third'), mapping, jobs=1)
+    statistics = get_template_cache_statistics()
+    assert statistics['path_misses'] == 3
+    assert statistics['content_misses'] == 3
+
+
+def test_clear_template_cache_reads_changed_template(
+    templates: pathlib.Path, tmp_path: pathlib.Path
+) -> None:
+    output_file = tmp_path / 'nested.txt'
+    expand_template('nested.txt.em', {'value': 1}, str(output_file), template_basepath=templates)
+    (templates / 'nested.txt.em').write_text('changed: @(value)\n', encoding='utf-8')
+
+    # the cached content is used until the cache is cleared
+    expand_template('nested.txt.em', {'value': 2}, str(output_file), template_basepath=templates)
+    assert output_file.read_text() == 'nested: 2\n'
+
+    clear_template_cache()
+    expand_template('nested.txt.em', {'value': 3}, str(output_file), template_basepath=templates)
+    assert output_file.read_text() == 'changed: 3\n'
+
+
+def test_template_error_discards_interpreter(
+    templates: pathlib.Path, tmp_path: pathlib.Path
+) -> None:
+    with _reusing_interpreter():
+        _expand_all(templates, tmp_path, ['check.txt.em'])
+        assert rosidl_pycommon.interpreter is not None
+
+        failing_file = tmp_path / 'failing.txt'
+        with pytest.raises(ValueError, match='broken template'):
+            expand_template('failing.txt.em', {}, str(failing_file), template_basepath=templates)
+        assert rosidl_pycommon.interpreter is None
+        assert not failing_file.exists()
+
+        # the next expansion creates a new interpreter and is not affected
+        contents = _expand_all(templates, tmp_path, ['check.txt.em', 'assign.txt.em'])
+    assert contents == ['value: 0\nassigned visible: False\n', 'assigned: 2\nnested: 1\n']
+    statistics = get_template_cache_statistics()
+    assert statistics['interpreter_creations'] == 2
+    assert statistics['interpreter_reuses'] == 2
@@ -57,15 +57,15 @@ set(target_dependencies
   "${rosidl_typesupport_introspection_cpp_TEMPLATE_DIR}/msg__type_support.cpp.em"
   "${rosidl_typesupport_introspection_cpp_TEMPLATE_DIR}/srv__rosidl_typesupport_introspection_cpp.hpp.em"
   "${rosidl_typesupport_introspection_cpp_TEMPLATE_DIR}/srv__type_support.cpp.em"
-  ${rosidl_generate_interfaces_ABS_IDL_FILES}
-  ${_dependency_files})
-foreach(dep ${target_dependencies})
+  ${rosidl_generate_interfaces_ABS_IDL_FILES})
+foreach(dep ${target_dependencies} ${_dependency_files})
   if(NOT EXISTS "${dep}")
     message(FATAL_ERROR "Target dependency '${dep}' does not exist")
   endif()
 endforeach()
 
 set(generator_arguments_file "${CMAKE_CURRENT_BINARY_DIR}/rosidl_typesupport_introspection_cpp__arguments.json")
+set(generator_depfile "${CMAKE_CURRENT_BINARY_DIR}/rosidl_typesupport_introspection_cpp.d")
 rosidl_write_generator_arguments(
   "${generator_arguments_file}"
   PACKAGE_NAME "${PROJECT_NAME}"
@@ -73,7 +73,10 @@ rosidl_write_generator_arguments(
   ROS_INTERFACE_DEPENDENCIES "${_dependencies}"
   OUTPUT_DIR "${_output_path}"
   TEMPLATE_DIR "${rosidl_typesupport_introspection_cpp_TEMPLATE_DIR}"
-  TARGET_DEPENDENCIES ${target_dependencies}
+  TARGET_DEPENDENCIES ${target_dependencies} ${_dependency_files}
+  JOBS "${ROSIDL_GENERATOR_JOBS}"
+  INCREMENTAL "${ROSIDL_GENERATOR_INCREMENTAL}"
+  DEPFILE "${generator_depfile}"
 )
 
 # By default, without the settings below, find_package(Python3) will attempt
@@ -94,14 +97,18 @@ set(Python3_FIND_UNVERSIONED_NAMES FIRST)
 
 find_package(Python3 REQUIRED COMPONENTS Interpreter)
 
-add_custom_command(
-  OUTPUT ${_generated_header_files} ${_generated_source_files}
-  COMMAND Python3::Interpreter
-  ARGS ${rosidl_typesupport_introspection_cpp_BIN}
+rosidl_add_generator_command(${rosidl_generate_interfaces_TARGET}
+  FUNCTION "rosidl_typesupport_introspection_cpp:generate_cpp"
+  GENERATOR_ARGUMENTS_FILE "${generator_arguments_file}"
+  COMMAND Python3::Interpreter ${rosidl_typesupport_introspection_cpp_BIN}
   --generator-arguments-file "${generator_arguments_file}"
+  OUTPUT ${_generated_header_files} ${_generated_source_files}
   DEPENDS ${target_dependencies}
+  # the .idl files of other packages aren't read, the dependency file lists
+  # the files which have actually been read instead
+  DEPENDS_WITHOUT_DEPFILE ${_dependency_files}
+  DEPFILE "${generator_depfile}"
   COMMENT "Generating C++ introspection for ROS interfaces"
-  VERBATIM
 )
 
 set(_target_suffix "__rosidl_typesupport_introspection_cpp")
@@ -12,22 +12,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List
+from typing import List, Optional
 
 from rosidl_pycommon import generate_files
 
 
-def generate_cpp(generator_arguments_file: str) -> List[str]:
+def generate_cpp(
+    generator_arguments_file: str, jobs: Optional[int] = None
+) -> List[str]:
     """
     Generate the C++ implementation of the type support.
 
     :param generator_arguments_file: The path to the file containing the
         arguments for the generator.
     :type generator_arguments_file: str
+    :param jobs: The number of processes to use, defaults to the value from
+        the arguments file.
+    :type jobs: int
     """
     mapping = {
         'idl__rosidl_typesupport_introspection_cpp.hpp.em':
         'detail/%s__rosidl_typesupport_introspection_cpp.hpp',
         'idl__type_support.cpp.em': 'detail/%s__type_support.cpp',
     }
-    return generate_files(generator_arguments_file, mapping)
+    return generate_files(generator_arguments_file, mapping, jobs=jobs)